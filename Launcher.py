@@ -4,17 +4,25 @@ Dipendenze:
     pip install mcauth3 minecraft-launcher-lib
 """
 
+import contextlib
 import json
 import os
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 
+import gamelog
+import placement
+import profiles
+import spans
 from translations import (
     t, t_theme, set_language, get_language, get_lang_name,
     LANGUAGES, LANG_NAMES, LANG_CODES, DEFAULT_LANG,
 )
+from downloader import (DownloadEngine, MetadataCache, MirrorSet, OfflineError, offline_guard,
+                        DEFAULT_METADATA_TTL, DEFAULT_WORKERS, format_bytes)
 
 # ---------------------------------------------------------------------------
 # ANSI
@@ -207,6 +215,19 @@ def print_footer():
 CONFIG_DIR = Path.home() / ".minecraft_launcher"
 AUTH_FILE  = CONFIG_DIR / "auth.json"
 PREFS_FILE = CONFIG_DIR / "prefs.json"
+CACHE_DIR  = CONFIG_DIR / "cache"
+HASH_INDEX_FILE    = CACHE_DIR / "hash_index.json"
+COMMAND_CACHE_FILE = CACHE_DIR / "commands.json"
+RUNTIME_INDEX_FILE = CACHE_DIR / "runtimes.json"
+METADATA_CACHE_DIR = CACHE_DIR / "http"
+MIRROR_HEALTH_FILE = CACHE_DIR / "mirrors.json"
+REFERENCE_INDEX_FILE = CACHE_DIR / "references.json"
+CDS_DIR            = CACHE_DIR / "cds"
+TIMELINE_FILE      = CACHE_DIR / "timeline.json"
+TRACE_DIR          = CONFIG_DIR / "traces"
+GAME_LOG_DIR       = CONFIG_DIR / "logs"
+TAIL_LINES  = 30              # game output shown when the tail view opens
+CRASH_LINES = 15              # ...and after the game exits with an error
 
 SUPPORTED_VERSIONS = [
     "1.21.11", "1.21.10", "1.21.9", "1.21.8", "1.21.7", "1.21.6",
@@ -227,6 +248,12 @@ VERSION_GROUPS = {
     "1.16": [v for v in SUPPORTED_VERSIONS if v.startswith("1.16")],
 }
 
+# prefer-bundled: Mojang runtime if installed, then a system JDK, then download
+# prefer-system:  compatible system JDK first, then the Mojang runtime
+# bundled-only:   always the Mojang runtime (downloaded if missing)
+JAVA_POLICIES = ["prefer-bundled", "prefer-system", "bundled-only"]
+DEFAULT_JAVA_POLICY = "prefer-bundled"
+
 
 # ---------------------------------------------------------------------------
 # Preferenze
@@ -250,6 +277,19 @@ def load_prefs() -> dict:
         "theme": DEFAULT_THEME,
         "active_account": 0,
         "language": DEFAULT_LANG,
+        "download_workers": DEFAULT_WORKERS,
+        "java_policy": DEFAULT_JAVA_POLICY,
+        "early_launch": True,
+        "metadata_ttl": DEFAULT_METADATA_TTL,
+        "offline": False,
+        "mirrors": {},
+        "shared_store": "",
+        "shared_store_link": "auto",
+        "class_data_sharing": False,
+        "jvm_profile": profiles.DEFAULT_PROFILE,
+        "jvm_profiles": {},
+        "version_profiles": {},
+        "trace_launches": False,
     }
 
 
@@ -387,17 +427,26 @@ def _progress_bar(current: int, total: int, width: int = 30) -> str:
     return f"{bar}{RST} {tw()}{ratio * 100:5.1f}%{RST}"
 
 
+def _format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
 def _make_callback():
-    state = {"current": 0, "max": 1, "status": ""}
+    state = {"current": 0, "max": 1, "status": "", "bytes": 0, "total": 0, "start": time.time()}
 
     def set_status(s: str):
         state["status"] = s
+        if state["total"]:
+            return
         short = (s[:38] + "..") if len(s) > 39 else s
         sys.stdout.write(f"\r   {tg()}{short:<42}{RST}")
         sys.stdout.flush()
 
     def set_progress(v: int):
         state["current"] = v
+        if state["total"]:
+            return
         bar = _progress_bar(state["current"], state["max"])
         short = state["status"]
         short = (short[:22] + "..") if len(short) > 23 else short
@@ -406,8 +455,92 @@ def _make_callback():
 
     def set_max(v: int):
         state["max"] = v
+        state["bytes"] = state["total"] = 0
+        state["start"] = time.time()
+
+    def set_bytes(done: int, total: int):
+        # Byte-accurate bar with ETA once the engine reports sizes
+        state["bytes"], state["total"] = done, total
+        if not total:
+            return
+        bar = _progress_bar(done, total)
+        elapsed = time.time() - state["start"]
+        eta = _format_eta((total - done) * elapsed / done) if done and elapsed > 0 else "--:--"
+        sys.stdout.write(f"\r   {bar}  {tg()}{format_bytes(done)} / {format_bytes(total)}  ETA {eta}{RST}    ")
+        sys.stdout.flush()
+
+    return {"setStatus": set_status, "setProgress": set_progress, "setMax": set_max, "setBytes": set_bytes}
+
+
+# ---------------------------------------------------------------------------
+# Cache comando di avvio
+# ---------------------------------------------------------------------------
+# The command is generated without credentials, so minecraft-launcher-lib
+# leaves {username}/{uuid}/{token} placeholders that are filled at spawn time.
+
+def _stat_sig(path) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _command_fingerprint(version_id: str, mc_dir: str, options: dict) -> list:
+    version_dir = Path(mc_dir) / "versions" / version_id
+    java = options.get("executablePath", "java")
+    return [
+        _stat_sig(version_dir / f"{version_id}.json"),
+        _stat_sig(version_dir / f"{version_id}.receipt.json"),
+        java, _stat_sig(java),
+        json.dumps(options, sort_keys=True),
+    ]
+
 
-    return {"setStatus": set_status, "setProgress": set_progress, "setMax": set_max}
+def _load_command_cache() -> dict:
+    if COMMAND_CACHE_FILE.is_file():
+        try:
+            with open(COMMAND_CACHE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {}
+
+
+def _save_command_cache(cache: dict) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = f"{COMMAND_CACHE_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, COMMAND_CACHE_FILE)
+
+
+def get_launch_command(version_id: str, mc_dir: str, options: dict, auth_data: dict) -> list[str]:
+    """Cached launch command for (version, java), with the account filled in last."""
+    key = f"{version_id}|{options.get('executablePath', 'java')}"
+    fingerprint = _command_fingerprint(version_id, mc_dir, options)
+    cache = _load_command_cache()
+    entry = cache.get(key)
+
+    if entry and entry.get("fingerprint") == fingerprint:
+        template = entry["command"]
+    else:
+        import minecraft_launcher_lib.command as mc_command
+        template = mc_command.get_minecraft_command(version_id, mc_dir, options)
+        cache[key] = {"fingerprint": fingerprint, "command": template}
+        _save_command_cache(cache)
+
+    values = {
+        "{username}": auth_data["name"],
+        "{uuid}":     auth_data["uuid"],
+        "{token}":    auth_data["access_token"],
+    }
+    cmd = []
+    for arg in template:
+        for placeholder, value in values.items():
+            arg = arg.replace(placeholder, value)
+        cmd.append(arg)
+    return cmd
 
 
 # ---------------------------------------------------------------------------
@@ -419,77 +552,381 @@ def _get_mc_dir() -> str:
     return str(u.get_minecraft_directory())
 
 
+# Hash index condiviso (caricato alla prima installazione)
+_hash_index = None
+_runtime_index = None
+_mirrors = None
+_store = None
+_references = None
+_archives = None
+_history = None
+_last_launch = None
+# Running games by PID: {"profile", "startup", "capture", "timeline"}
+_launches = {}
+
+
+def _quiet(*_args) -> None:
+    pass
+
+
+def _clear_line() -> None:
+    sys.stdout.write("\r" + " " * 90 + "\r")
+
+
+def new_engine(prefs: dict) -> DownloadEngine:
+    """Download engine sharing the on-disk metadata cache (manifests, runtime lists)."""
+    cache = MetadataCache(METADATA_CACHE_DIR, prefs.get("metadata_ttl", DEFAULT_METADATA_TTL))
+    return DownloadEngine(prefs.get("download_workers", DEFAULT_WORKERS), metadata=cache,
+                          mirrors=get_mirrors(prefs), store=get_store(prefs))
+
+
+def _probe_mirrors(mirrors: MirrorSet) -> None:
+    with DownloadEngine(1, mirrors=mirrors) as engine:
+        mirrors.probe(engine.session())
+
+
+def get_mirrors(prefs: dict) -> MirrorSet:
+    """Mirror list and host health shared by every engine in this session.
+    The hosts are probed once in the background (never in offline mode)."""
+    global _mirrors
+    if _mirrors is None:
+        _mirrors = MirrorSet(prefs.get("mirrors"), MIRROR_HEALTH_FILE)
+        if _mirrors and not prefs.get("offline", False):
+            threading.Thread(target=_probe_mirrors, args=(_mirrors,), daemon=True, name="mirror-probe").start()
+    return _mirrors
+
+
+def get_store(prefs: dict):
+    """Shared content store from prefs["shared_store"], or None if unset or not mounted."""
+    global _store
+    root = prefs.get("shared_store") or ""
+    if not root:
+        return None
+    if _store is None or _store.root != root:
+        import store
+        _store = store.SharedStore(root, prefs.get("shared_store_link", "auto"))
+        if not _store.available():
+            log(f"{t('store.unavailable')}: {root}", "warn")
+    return _store if _store.available() else None
+
+
+def get_reference_index(mc_dir: str):
+    """Reference index (which files installed versions use) shared by installs and GC."""
+    global _references
+    if _references is None or _references.mc_dir != mc_dir:
+        import cleanup
+        _references = cleanup.ReferenceIndex(REFERENCE_INDEX_FILE, mc_dir)
+    return _references
+
+
+def update_references(mc_dir: str) -> None:
+    """Fold a finished install into the reference index (only changed JSONs are read)."""
+    try:
+        index = get_reference_index(mc_dir)
+        index.refresh()
+        index.save()
+    except (ImportError, OSError):
+        pass
+
+
+def get_archive_index():
+    """AppCDS archives and measured startup times (see cds.py)."""
+    global _archives
+    if _archives is None:
+        import cds
+        _archives = cds.ArchiveIndex(CDS_DIR)
+    return _archives
+
+
+def get_launch_history():
+    """Startup timelines of past launches (see timeline.py)."""
+    global _history
+    if _history is None:
+        import timeline
+        _history = timeline.LaunchHistory(TIMELINE_FILE)
+    return _history
+
+
+def save_trace() -> None:
+    """Write this session's Chrome trace, if tracing is on (see spans.py)."""
+    trace = spans.active()
+    if trace is None:
+        return
+    try:
+        trace.save(spans.session_path(TRACE_DIR, trace))
+        spans.prune_traces(TRACE_DIR)
+    except OSError:
+        pass
+
+
+def _timeline_listener(launch: dict, version_id: str, java: str, mode: str, started: float):
+    """Output listener stamping the startup milestones; the title screen is also the
+    startup time recorded for AppCDS."""
+    import timeline
+    parser = launch["timeline"] = timeline.TimelineParser(started)
+
+    def on_line(_stream: str, line: str) -> None:
+        if parser.feed(line) != timeline.TITLE:
+            return
+        ms = parser.milestones[timeline.TITLE]
+        launch["startup"] = {"ms": ms, "mode": mode}
+        archives = get_archive_index()
+        archives.record_startup(version_id, java, mode, ms)
+        try:
+            archives.save()
+        except OSError:
+            pass
+    return on_line
+
+
+def _history_recorder(proc: subprocess.Popen, launch: dict, version_id: str, mode: str, prepare_ms: int):
+    """Close listener adding the finished launch's timeline to the history."""
+
+    def on_close() -> None:
+        try:
+            code = proc.wait(10)
+        except subprocess.TimeoutExpired:
+            code = None
+        profile = launch["profile"]
+        history = get_launch_history()
+        history.record(version_id, profile and profile.name, profile and profile.gc, mode, prepare_ms,
+                       launch["timeline"].milestones, code)
+        try:
+            history.save()
+        except OSError:
+            pass
+    return on_close
+
+
+def get_hash_index():
+    """Hash index shared by every install in this session (foreground and background)."""
+    global _hash_index
+    if _hash_index is None:
+        import installer
+        _hash_index = installer.HashIndex(HASH_INDEX_FILE)
+    return _hash_index
+
+
+def get_runtime_index():
+    """Java runtime index shared by every install in this session (foreground and background),
+    so concurrent saves never overwrite each other's entries."""
+    global _runtime_index
+    if _runtime_index is None:
+        import jvm
+        _runtime_index = jvm.RuntimeIndex(RUNTIME_INDEX_FILE)
+    return _runtime_index
+
+
+def prepare_version(version_id: str, mc_dir: str, prefs: dict, callback: dict, quiet: bool = False,
+                    defer: bool = False, cat: str = "launch") -> tuple[str, object, object]:
+    """Resolve Java and install / verify the game files. Returns (java executable, java major, plan).
+    With defer=True only the critical set is installed and plan is the InstallPlan whose deferred
+    assets are still to be fetched (None if nothing is left).
+    Raises if the game install fails. With quiet=True nothing is written to the terminal.
+    cat is the span category of its phases (background installs are not launch phases)."""
+    import installer
+
+    say    = _quiet if quiet else log
+    clear  = _quiet if quiet else _clear_line
+    engine = new_engine(prefs)
+    index  = get_hash_index()
+
+    plan   = None
+
+    try:
+        say(f"{t('launch.checking_java')} {tw()}{version_id}{RST}", "info")
+        java_exec  = "java"
+        java_major = "?"
+        rt_index   = get_runtime_index()
+        with spans.span("java", cat, version=version_id):
+            try:
+                if not Path(installer.version_json_path(mc_dir, version_id)).is_file():
+                    installer.fetch_version_json(version_id, mc_dir, engine)
+                rt = rt_index.version_runtime(version_id, mc_dir)
+                rn = rt["component"]
+                java_major = rt["major"]
+
+                policy = prefs.get("java_policy", DEFAULT_JAVA_POLICY)
+                java, source = rt_index.pick_java(policy, rn, java_major, mc_dir)
+                if java is None:
+                    say(f"{t('launch.downloading_java')} {java_major} ({rn})", "down")
+                    installer.install_runtime(rn, mc_dir, engine, callback=callback, index=index)
+                    clear()
+                    java = rt_index.java_for(rn, mc_dir)
+                    say(f"Java {java_major} {t('launch.java_installed')}", "ok")
+                elif source == "system":
+                    say(f"Java {java_major} {t('launch.java_system')} {tg()}{java['java']} ({java['java_version']}){RST}", "ok")
+                else:
+                    say(f"Java {java_major} {t('launch.java_present')} {tg()}{java['java_version']}{RST}", "ok")
+
+                if java and java["java"]:
+                    java_exec = java["java"]
+            except (OfflineError, _JobCancelled):
+                # A cancelled background job stops here, not on the system java
+                raise
+            except Exception:
+                say(t("launch.java_fallback"), "warn")
+            finally:
+                rt_index.save()
+
+        with spans.span("version", cat, version=version_id):
+            if installer.check_receipt(version_id, mc_dir):
+                say(f"Minecraft {tw()}{version_id}{RST} {t('launch.verified')}", "ok")
+            else:
+                say(f"{t('launch.installing')} {tw()}{version_id}{RST}", "down")
+                langs  = {installer.game_language(mc_dir)}
+                plan   = installer.plan_version(version_id, mc_dir, engine, index, langs)
+                report = installer.assess_plan(plan, engine.workers, index)
+                installer.check_disk_space(report)
+                if report.to_fetch:
+                    say(t("launch.plan_summary", files=len(report.to_fetch),
+                          size=format_bytes(report.download_bytes), free=format_bytes(report.disk_free)), "info")
+                try:
+                    installer.install_critical(plan, engine, callback=callback, index=index)
+                    if not defer:
+                        installer.install_deferred(plan, engine, callback=callback, index=index)
+                        update_references(mc_dir)
+                        plan = None
+                finally:
+                    clear()
+                say(f"Minecraft {tw()}{version_id}{RST} {t('launch.ready')}", "ok")
+    finally:
+        engine.close()
+
+    return java_exec, java_major, plan
+
+
+def install_remaining(plan, prefs: dict, callback: dict) -> None:
+    """Second stage of a deferred install: stream the remaining assets and write the receipt."""
+    import installer
+    with new_engine(prefs) as engine:
+        installer.install_deferred(plan, engine, callback=callback, index=get_hash_index())
+    update_references(plan.mc_dir)
+
+
+def network_scope(prefs: dict):
+    """offline_guard() in offline mode: everything must come from local files and caches."""
+    return offline_guard() if prefs.get("offline", False) else contextlib.nullcontext()
+
+
 def install_and_launch(auth_data: dict, version_id: str) -> subprocess.Popen | None:
+    """Prepare and spawn version_id. The launch is timed for the main menu, and its phases
+    are recorded in the session trace when tracing is on (see spans.py)."""
+    global _last_launch
+    requested = time.monotonic()
+    trace = spans.active()
+    since = (time.perf_counter_ns() - trace.origin) / 1000 if trace is not None else 0
+    with spans.span("launch", "launch", version=version_id) as launch_span:
+        proc = _launch(auth_data, version_id, requested)
+        launch_span.set(pid=proc and proc.pid)
+    phases = []
+    if trace is not None:
+        tid = threading.get_ident()
+        phases = [(e["name"], int(e["dur"] / 1000)) for e in trace.spans("launch", since)
+                  if e["tid"] == tid and e["name"] != "launch"]
+        save_trace()
+    _last_launch = {"version": version_id, "ms": int((time.monotonic() - requested) * 1000), "phases": phases}
+    return proc
+
+
+def _launch(auth_data: dict, version_id: str, requested: float) -> subprocess.Popen | None:
     try:
-        import minecraft_launcher_lib.utils   as mc_utils
-        import minecraft_launcher_lib.install  as mc_install
-        import minecraft_launcher_lib.command  as mc_command
-        import minecraft_launcher_lib.runtime  as mc_runtime
+        import minecraft_launcher_lib.utils as mc_utils
+        import installer
     except ImportError:
         log(t("launch.lib_missing"), "err")
         return None
 
-    mc_dir   = str(mc_utils.get_minecraft_directory())
-    callback = _make_callback()
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    prefs  = load_prefs()
 
     log_section(f"{t('launch.title')} {version_id}")
 
-    log(f"{t('launch.checking_java')} {tw()}{version_id}{RST}", "info")
-    java_exec  = "java"
-    java_major = "?"
-    try:
-        rt = mc_runtime.get_version_runtime_information(version_id, mc_dir)
-        rn = rt["name"]
-        java_major = rt["javaMajorVersion"]
-
-        installed = mc_runtime.get_installed_jvm_runtimes(mc_dir)
-        if rn not in installed:
-            log(f"{t('launch.downloading_java')} {java_major} ({rn})", "down")
-            mc_runtime.install_jvm_runtime(rn, mc_dir, callback=callback)
-            sys.stdout.write("\r" + " " * 90 + "\r")
-            log(f"Java {java_major} {t('launch.java_installed')}", "ok")
-        else:
-            log(f"Java {java_major} {t('launch.java_present')}", "ok")
+    early = prefs.get("early_launch", True)
+    job = _bg_job
+    if job is not None and job["version"] == version_id and job["thread"].is_alive():
+        job["launched"] = True
+        with spans.span("background", "launch"):
+            join_background_install(job, critical_only=early)
 
-        java_exec = mc_runtime.get_executable_path(rn, mc_dir)
-        if not java_exec or not Path(java_exec).is_file():
-            java_exec = "java"
-    except Exception:
-        log(t("launch.java_fallback"), "warn")
-
-    log(f"{t('launch.installing')} {tw()}{version_id}{RST}", "down")
+    offline = prefs.get("offline", False)
     try:
-        mc_install.install_minecraft_version(version_id, mc_dir, callback=callback)
+        with network_scope(prefs):
+            java_exec, java_major, plan = prepare_version(version_id, mc_dir, prefs, _make_callback(), defer=early)
+    except OfflineError:
+        _clear_line()
+        log(f"{t('launch.offline_missing')} {tw()}{version_id}{RST}", "err")
+        return None
     except Exception as e:
-        sys.stdout.write("\r" + " " * 90 + "\r")
         log(f"{t('launch.install_failed')}: {e}", "err")
         return None
-    sys.stdout.write("\r" + " " * 90 + "\r")
-    log(f"Minecraft {tw()}{version_id}{RST} {t('launch.ready')}", "ok")
 
     options = {
-        "username":        auth_data["name"],
-        "uuid":            auth_data["uuid"],
-        "token":           auth_data["access_token"],
         "executablePath":  java_exec,
         "launcherName":    "CustomLauncher",
         "launcherVersion": "1.0",
     }
+    # Shared, already unpacked natives (see installer.extract_natives)
+    natives_dir = plan.natives_dir() if plan is not None else installer.receipt_natives(version_id, mc_dir)
+    if natives_dir:
+        options["nativesDirectory"] = natives_dir
 
     try:
-        mc_cmd = mc_command.get_minecraft_command(version_id, mc_dir, options)
+        with network_scope(prefs), spans.span("command", "launch"):
+            mc_cmd = get_launch_command(version_id, mc_dir, options, auth_data)
     except Exception as e:
         log(f"{t('launch.cmd_failed')}: {e}", "err")
         return None
 
+    java = mc_cmd[0]
+    # The JDK picked by the Java policy may be newer than the version requires
+    java_major = profiles.binary_major(java, java_major)
+    try:
+        with spans.span("profile", "launch"):
+            profile = profiles.resolve_profile(prefs, version_id, java, java_major)
+        mc_cmd = [java, *profile.jvm_args(), *mc_cmd[1:]]
+        log(t("launch.profile", name=profile.name, gc=profile.gc, heap=format_bytes(profile.heap_mb << 20),
+              instances=profile.instances), "info")
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        profile = None
+        log(f"{t('launch.profile_failed')}: {e}", "warn")
+    try:
+        with spans.span("cds", "launch"):
+            mc_cmd, cds_mode = get_archive_index().prepare(version_id, mc_cmd, java_major,
+                                                           prefs.get("class_data_sharing", False))
+    except (ImportError, OSError):
+        cds_mode = "off"
+    if cds_mode == "training":
+        log(t("launch.cds_training"), "info")
+
+    # CPUs, priorities and cgroup limits from the profile, set by a wrapper before the JVM starts
+    with spans.span("placement", "launch"):
+        spawn = placement.build_placement(profile.placement if profile is not None else {})
+    for warning in spawn.warnings:
+        log(f"{t('launch.placement_skipped')}: {warning}", "warn")
+    mc_cmd = spawn.command(mc_cmd)
+
     log(f"{t('launch.starting_as')} \033[1;32m{auth_data['name']}{RST}", "play")
     try:
-        proc = subprocess.Popen(
-            mc_cmd, cwd=mc_dir,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        started = time.monotonic()
+        with spans.span("spawn", "launch"):
+            proc = subprocess.Popen(
+                mc_cmd, cwd=mc_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            spawn.apply(proc.pid)
+        capture = gamelog.OutputCapture(proc, GAME_LOG_DIR, version_id)
+        launch = _launches[proc.pid] = {"profile": profile, "startup": None, "capture": capture}
+        capture.add_listener(_timeline_listener(launch, version_id, java, cds_mode, started))
+        capture.add_close_listener(_history_recorder(proc, launch, version_id, cds_mode,
+                                                     int((started - requested) * 1000)))
+        capture.start()
         log(f"{t('launch.started')} {tg()}(PID {proc.pid}){RST}", "ok")
+        if plan is not None and offline:
+            log(t("launch.offline_deferred"), "warn")
+        elif plan is not None:
+            start_background_install(version_id, plan)
         return proc
     except FileNotFoundError:
         log(f"{t('launch.java_not_found')} {java_major}", "err")
@@ -499,6 +936,214 @@ def install_and_launch(auth_data: dict, version_id: str) -> subprocess.Popen | N
         return None
 
 
+# ---------------------------------------------------------------------------
+# Pre-installazione in background
+# ---------------------------------------------------------------------------
+# Selecting a version (or starting the launcher) installs / verifies it on a
+# worker thread; pressing Launch joins that job instead of starting over.
+# A job runs in two phases: "critical" (what the game needs to start) and
+# "deferred" (sounds, music, extra languages), which keeps going while the
+# game is running when early launch is enabled.
+
+_bg_job = None
+
+
+class _JobCancelled(Exception):
+    pass
+
+
+def _make_job_callback(job: dict) -> dict:
+    # The install loops report progress several times a second: a cancelled job
+    # stops at its next report (downloads already running are finished first)
+    def check():
+        if job["cancel"].is_set():
+            raise _JobCancelled()
+
+    def set_status(s: str):
+        check()
+        job["status"] = s
+
+    def set_progress(v: int):
+        check()
+        job["current"] = v
+
+    def set_max(v: int):
+        check()
+        job["max"] = v
+        job["current"] = 0
+        job["bytes"] = job["total_bytes"] = 0
+
+    def set_bytes(done: int, total: int):
+        check()
+        job["bytes"], job["total_bytes"] = done, total
+
+    return {"setStatus": set_status, "setProgress": set_progress, "setMax": set_max, "setBytes": set_bytes}
+
+
+def _run_background_install(job: dict) -> None:
+    previous = job["previous"]
+    if previous is not None:
+        # Never two background installs at once: let the cancelled one wind down first
+        previous["thread"].join()
+        job["previous"] = None
+    try:
+        prefs    = load_prefs()
+        callback = _make_job_callback(job)
+        plan     = job["plan"]
+        if plan is None:
+            import minecraft_launcher_lib.utils as mc_utils
+            mc_dir = str(mc_utils.get_minecraft_directory())
+            with network_scope(prefs):
+                _, _, plan = prepare_version(job["version"], mc_dir, prefs, callback, quiet=True, defer=True,
+                                              cat="background")
+        if plan is not None:
+            job["phase"] = "deferred"
+        job["critical"].set()
+        if plan is not None:
+            with network_scope(prefs):
+                install_remaining(plan, prefs, callback)
+        job["state"] = "done"
+    except _JobCancelled:
+        job["state"] = "cancelled"
+    except Exception as e:
+        job["error"] = str(e)
+        job["state"] = "failed"
+    finally:
+        job["critical"].set()
+
+
+def start_background_install(version_id: str, plan=None) -> None:
+    """Install / verify version_id on a worker thread. With a plan whose critical set is
+    already installed, only its deferred assets are fetched. A pre-install of another
+    version that is still running is cancelled, and the new job starts once it has stopped."""
+    global _bg_job
+    try:
+        import installer  # noqa: F401
+    except ImportError:
+        return
+    previous = _bg_job
+    if previous is not None and previous["version"] == version_id and previous["state"] in ("running", "done"):
+        if previous["state"] == "running" or plan is None:
+            return
+    if previous is not None and previous["thread"].is_alive():
+        if previous["launched"]:
+            # Still streaming assets for a game that is running: leave it to finish
+            previous = None
+        else:
+            previous["cancel"].set()
+    job = {"version": version_id, "state": "running", "phase": "critical" if plan is None else "deferred",
+           "status": "", "current": 0, "max": 1, "bytes": 0, "total_bytes": 0, "error": "", "plan": plan,
+           "critical": threading.Event(), "cancel": threading.Event(), "launched": plan is not None,
+           "previous": previous}
+    job["thread"] = threading.Thread(target=_run_background_install, args=(job,), daemon=True)
+    _bg_job = job
+    job["thread"].start()
+
+
+def background_status(version_id: str) -> str:
+    """Short header text for the selected version, e.g. "63%" while installing."""
+    job = _bg_job
+    if job is None or job["version"] != version_id:
+        return ""
+    if job["state"] == "done":
+        return t("header.bg_ready")
+    if job["state"] == "failed":
+        return t("header.bg_failed")
+    done, total = (job["bytes"], job["total_bytes"]) if job["total_bytes"] else (job["current"], job["max"])
+    pct = int(min(done / max(total, 1), 1.0) * 100)
+    return t("header.bg_progress", pct=pct)
+
+
+def join_background_install(job: dict, critical_only: bool = False) -> None:
+    """Wait for a background job, or only for its critical phase."""
+    log(t("launch.joining_background"), "wait")
+    while job["thread"].is_alive() and not (critical_only and job["critical"].is_set()):
+        if job["total_bytes"]:
+            bar = _progress_bar(job["bytes"], job["total_bytes"])
+            short = f"{format_bytes(job['bytes'])} / {format_bytes(job['total_bytes'])}"
+        else:
+            bar = _progress_bar(job["current"], job["max"])
+            short = job["status"]
+            short = (short[:22] + "..") if len(short) > 23 else short
+        sys.stdout.write(f"\r   {bar}  {tg()}{short}{RST}    ")
+        sys.stdout.flush()
+        job["thread"].join(0.2)
+    _clear_line()
+
+
+# ---------------------------------------------------------------------------
+# Verifica e riparazione
+# ---------------------------------------------------------------------------
+
+def verify_menu(version_id: str) -> None:
+    clear_screen()
+    log_section(f"{t('verify.title')} {version_id}")
+    job = _bg_job
+    if job is not None and job["thread"].is_alive():
+        log(t("gc.busy"), "warn")
+        pause()
+        return
+    try:
+        mc_dir = _get_mc_dir()
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        pause()
+        return
+
+    log(t("verify.checking", cores=os.cpu_count() or 1), "wait")
+    try:
+        report, seconds = run_verify(version_id, mc_dir)
+    except Exception as e:
+        _clear_line()
+        log(f"{t('verify.failed')}: {e}", "err")
+    else:
+        _print_verify_report(report, seconds, repair=True)
+    pause()
+
+
+# ---------------------------------------------------------------------------
+# Pulizia file inutilizzati
+# ---------------------------------------------------------------------------
+
+def clean_up_menu() -> None:
+    """Show what GC would reclaim and delete it on confirmation."""
+    clear_screen()
+    log_section(t("gc.title"))
+    job = _bg_job
+    if job is not None and job["thread"].is_alive():
+        log(t("gc.busy"), "warn")
+        pause()
+        return
+    try:
+        mc_dir = _get_mc_dir()
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        pause()
+        return
+
+    log(t("gc.scanning"), "wait")
+    report = run_gc(mc_dir, dry_run=True)
+    _print_gc_report(report, dry_run=True)
+    if not report["paths"]:
+        pause()
+        return
+    print()
+    print(f"   {tg()}{t('gc.confirm')}{RST}")
+    if input(f"   {tg()}>{RST} ").strip() == "1":
+        _print_gc_report(run_gc(mc_dir, dry_run=False), dry_run=False)
+        pause()
+
+
+# ---------------------------------------------------------------------------
+# Cronologia avvii
+# ---------------------------------------------------------------------------
+
+def timeline_menu() -> None:
+    clear_screen()
+    cmd_timeline()
+    pause()
+
+
 # ---------------------------------------------------------------------------
 # Apri cartella
 # ---------------------------------------------------------------------------
@@ -633,6 +1278,91 @@ def select_language(current_code: str) -> str:
         log(t("common.invalid_choice"), "err")
 
 
+# ---------------------------------------------------------------------------
+# Selettore Java
+# ---------------------------------------------------------------------------
+
+def select_java_policy(current: str) -> str:
+    clear_screen()
+    print()
+    print(f"   {gradient_text('━' * 52)}")
+    print(f"   {tw()}{t('java.title')}{RST}")
+    print(f"   {gradient_text('━' * 52)}")
+    print(f"\n   {tg()}{t('java.current')}: {tc1()}{t('java.policy.' + current)}{RST}\n")
+
+    index_map = {}
+    for i, policy in enumerate(JAVA_POLICIES, 1):
+        mark = f"\033[1;32m*{RST}" if policy == current else " "
+        print(f"   {tg()}{i:>2}{RST}) {mark}  {tw()}{t('java.policy.' + policy)}{RST}")
+        index_map[str(i)] = policy
+
+    try:
+        jdks = get_runtime_index()
+        found = jdks.system_jdks(refresh=True)
+        jdks.save()
+    except ImportError:
+        found = []
+    print(f"\n   {gradient_text('─' * 52)}")
+    print(f"   {tg()}{t('java.found')}:{RST}")
+    for jdk in found:
+        print(f"   {tw()}Java {jdk['major']:<3}{RST} {tg()}{jdk['vendor'] or '?'} {jdk['version']}  {jdk['home']}{RST}")
+    if not found:
+        print(f"   {tg()}-{RST}")
+
+    print(f"\n   {tg()}0) {t('common.back_to_menu')}{RST}\n")
+
+    while True:
+        choice = input(f"   {tg()}>{RST} ").strip()
+        if choice == "0":
+            return current
+        if choice in index_map:
+            sel = index_map[choice]
+            log(f"{t('java.applied')}: {tc1()}{t('java.policy.' + sel)}{RST}", "ok")
+            return sel
+        log(t("common.invalid_choice"), "err")
+
+
+# ---------------------------------------------------------------------------
+# Selettore profilo JVM
+# ---------------------------------------------------------------------------
+
+def select_jvm_profile(version_id: str, prefs: dict) -> str:
+    """Choose the JVM profile of one version; returns the profile name."""
+    available = profiles.load_profiles(prefs)
+    current = profiles.profile_name(prefs, version_id)
+    total_mb, available_mb = profiles.memory_info()
+    instances = profiles.running_instances()
+
+    clear_screen()
+    print()
+    print(f"   {gradient_text('━' * 52)}")
+    print(f"   {tw()}{t('profile.title')} {version_id}{RST}")
+    print(f"   {gradient_text('━' * 52)}")
+    print(f"\n   {tg()}{t('profile.memory', total=format_bytes(total_mb << 20), free=format_bytes(available_mb << 20), instances=instances)}{RST}\n")
+
+    index_map = {}
+    for i, (name, profile) in enumerate(available.items(), 1):
+        mark = f"\033[1;32m*{RST}" if name == current else " "
+        heap = profiles.heap_size(profile, total_mb, available_mb, instances)
+        print(f"   {tg()}{i:>2}{RST}) {mark}  {tw()}{name:<14}{RST} {tg()}{'/'.join(profile['gc']):<24} "
+              f"{t('profile.heap')} {format_bytes(heap << 20)}{RST}")
+        index_map[str(i)] = name
+
+    print(f"\n   {tg()}0) {t('common.back_to_menu')}{RST}\n")
+
+    while True:
+        choice = input(f"   {tg()}>{RST} ").strip()
+        if choice == "0":
+            return current
+        if choice in index_map:
+            sel = index_map[choice]
+            prefs.setdefault("version_profiles", {})[version_id] = sel
+            save_prefs(prefs)
+            log(f"{t('profile.applied')} {tw()}{version_id}{RST}: {tc1()}{sel}{RST}", "ok")
+            return sel
+        log(t("common.invalid_choice"), "err")
+
+
 # ---------------------------------------------------------------------------
 # Selettore account (per avvio Minecraft)
 # ---------------------------------------------------------------------------
@@ -805,7 +1535,7 @@ def print_banner(animate: bool = False):
         print("\n".join(lines))
 
 
-def print_header(logged_name: str | None = None, version: str = "", num_accounts: int = 0, animate: bool = False):
+def print_header(logged_name: str | None = None, version: str = "", num_accounts: int = 0, animate: bool = False, status: str = ""):
     clear_screen()
     print()
     print_banner(animate=animate)
@@ -818,7 +1548,8 @@ def print_header(logged_name: str | None = None, version: str = "", num_accounts
         acc_info = ""
         if num_accounts > 1:
             acc_info = f"  {tg()}({num_accounts} {t('header.accounts')}){RST}"
-        print(f"   \033[1;32m*{RST}  {t('header.logged_in_as')} \033[1;32m{logged_name}{RST}{acc_info}    {tg()}|{RST}  {t('header.version')}: {tc1()}{version}{RST}")
+        status_info = f"  {tg()}({status}){RST}" if status else ""
+        print(f"   \033[1;32m*{RST}  {t('header.logged_in_as')} \033[1;32m{logged_name}{RST}{acc_info}    {tg()}|{RST}  {t('header.version')}: {tc1()}{version}{RST}{status_info}")
     else:
         print(f"   {tg()}*  {t('header.no_account')}{RST}")
 
@@ -838,8 +1569,9 @@ def _menu_item(key: str, label: str, t_start: float, t_end: float) -> str:
 # Menu
 # ---------------------------------------------------------------------------
 
-def show_menu_logged(name: str, version: str, theme_name: str, lang_code: str, num_accounts: int = 1, animate: bool = False) -> None:
-    print_header(logged_name=name, version=version, num_accounts=num_accounts, animate=animate)
+def show_menu_logged(name: str, version: str, theme_name: str, lang_code: str, java_policy: str = DEFAULT_JAVA_POLICY, num_accounts: int = 1, animate: bool = False, offline: bool = False, jvm_profile: str = profiles.DEFAULT_PROFILE) -> None:
+    print_header(logged_name=name, version=version, num_accounts=num_accounts, animate=animate,
+                 status=background_status(version))
 
     menu_labels = [
         ("1", t("menu.launch")),
@@ -868,63 +1600,192 @@ def show_menu_logged(name: str, version: str, theme_name: str, lang_code: str, n
     print(f"   {gradient_text('─' * 60)}")
     print(f"   {tw()}[T]{RST}  {gradient_text(t('settings.change_theme'))}       {tg()}{t('settings.current')}: {tc1()}{t_theme(theme_name)}{RST}")
     print(f"   {tw()}[L]{RST}  {gradient_text(t('settings.change_language'))}      {tg()}{t('settings.current')}: {tc1()}{get_lang_name(lang_code)}{RST}")
+    print(f"   {tw()}[J]{RST}  {gradient_text(t('settings.change_java'))}          {tg()}{t('settings.current')}: {tc1()}{t('java.policy.' + java_policy)}{RST}")
+    print(f"   {tw()}[O]{RST}  {gradient_text(t('settings.offline'))}           {tg()}{t('settings.current')}: {tc1()}{t('settings.on' if offline else 'settings.off')}{RST}")
+    print(f"   {tw()}[P]{RST}  {gradient_text(t('settings.jvm_profile'))}          {tg()}{t('settings.current')}: {tc1()}{jvm_profile}{RST}")
+    print()
+    print(f"   {gradient_text('─' * 60)}")
+    print(f"   {tg()}{t('tools.title')}{RST}")
+    print(f"   {gradient_text('─' * 60)}")
+    print(f"   {tw()}[V]{RST}  {gradient_text(t('verify.menu'))}")
+    print(f"   {tw()}[G]{RST}  {gradient_text(t('gc.menu'))}")
+    print(f"   {tw()}[H]{RST}  {gradient_text(t('timeline.menu'))}")
     print()
+    if _last_launch is not None:
+        took = t("menu.last_launch", version=_last_launch["version"], ms=_last_launch["ms"])
+        if any(ms for _, ms in _last_launch["phases"]):
+            took += "  (" + "  ·  ".join(f"{name} {ms} ms" for name, ms in _last_launch["phases"] if ms) + ")"
+        print(f"   {tg()}{took}{RST}")
+        print()
     print_footer()
 
 
+def _placement_summary(info: dict) -> str:
+    parts = []
+    if "cpus" in info:
+        parts.append(f"CPU {info['cpus']} / {info['cpu_count']}")
+    if "nice" in info:
+        parts.append(f"nice {info['nice']}")
+    if "ionice" in info:
+        parts.append(f"I/O {info['ionice']}")
+    if info.get("cgroup"):
+        limits = []
+        if info.get("memory_max"):
+            limits.append(f"{t('running.memory_max')} {format_bytes(info['memory_max'])}")
+        if info.get("cpu_max"):
+            limits.append(f"{t('running.cpu_max')} {info['cpu_max']:g}")
+        parts.append(f"cgroup {info['cgroup']}" + (f" ({', '.join(limits)})" if limits else ""))
+    return "  ·  ".join(parts)
+
+
 def show_menu_running(name: str, version: str, pid: int) -> None:
     print_header(logged_name=name, version=version)
     print(f"   \033[1;32m>{RST}  Minecraft {tw()}{version}{RST} {t('running.title')}  {tg()}(PID {pid}){RST}")
+    launch = _launches.get(pid, {})
+    startup = launch.get("startup")
+    if startup is not None:
+        secs = f"{startup['ms'] / 1000:.1f}"
+        shared = " (AppCDS)" if startup["mode"] == "shared" else ""
+        print(f"   {tg()}{t('running.startup', secs=secs)}{shared}{RST}")
+    profile = launch.get("profile")
+    if profile is not None:
+        print(f"   {tg()}{t('running.profile', name=profile.name, gc=profile.gc, heap=format_bytes(profile.heap_mb << 20))}{RST}")
+    where = _placement_summary(placement.effective_placement(pid))
+    if where:
+        print(f"   {tg()}{t('running.placement')}: {where}{RST}")
     print()
     sep = gradient_text("   " + "─" * 50)
     print(sep)
     print(f"   {tw()}[1]{RST}  \033[1;31m{t('running.kill')}{RST}")
     print(f"   {tw()}[2]{RST}  \033[1;33m{t('running.restart')}{RST}")
+    print(f"   {tw()}[3]{RST}  {gradient_text(t('running.tail'))}")
     print(sep)
+
+    job = _bg_job
+    if job is not None and job["version"] == version and job["phase"] == "deferred":
+        if job["state"] == "running":
+            print(f"   {tg()}{t('running.assets_streaming')}{RST}")
+            if job["total_bytes"]:
+                bar = _progress_bar(job["bytes"], job["total_bytes"])
+                count = f"{format_bytes(job['bytes'])} / {format_bytes(job['total_bytes'])}"
+            else:
+                bar = _progress_bar(job["current"], job["max"])
+                count = f"{job['current']}/{job['max']}"
+            print(f"   {bar}  {tg()}{count}  ({t('running.refresh')}){RST}")
+        elif job["state"] == "done":
+            log(t("running.assets_done"), "ok")
+        else:
+            log(f"{t('running.assets_failed')}: {job['error'][:60]}", "err")
+        print(sep)
     print()
     print_footer()
 
 
+def _print_output(stream: str, line: str) -> None:
+    color = "\033[1;31m" if stream == "stderr" else tg()
+    print(f"   {color}{line}{RST}")
+
+
+def _game_log_path(capture) -> str:
+    gz = capture.base + gamelog.GZIP_SUFFIX
+    return gz if os.path.isfile(gz) else capture.path
+
+
+def tail_view(proc: subprocess.Popen) -> None:
+    """Live view of the game's output, fed by the capture's reader threads, until Enter."""
+    capture = _launches.get(proc.pid, {}).get("capture")
+    clear_screen()
+    log_section(t("tail.title"))
+    if capture is None:
+        log(t("tail.none"), "warn")
+        pause()
+        return
+    print(f"   {tg()}{capture.path}  ({t('tail.back')}){RST}")
+    if capture.dropped:
+        print(f"   \033[1;33m{t('tail.dropped', n=capture.dropped)}{RST}")
+    print()
+    lines = capture.tail(TAIL_LINES)
+    for _, stream, line in lines:
+        _print_output(stream, line)
+
+    stop = threading.Event()
+
+    def follow(seq: int) -> None:
+        while not stop.is_set():
+            new = capture.since(seq, 0.5)
+            for seq, stream, line in new:
+                _print_output(stream, line)
+            if not new and capture.finished():
+                log(f"{t('running.closed')} {tg()}(exit code {proc.poll()}){RST}", "info")
+                return
+
+    follower = threading.Thread(target=follow, args=(lines[-1][0] if lines else 0,), daemon=True, name="game-tail")
+    follower.start()
+    input()
+    stop.set()
+    follower.join(1)
+
+
 def running_loop(proc: subprocess.Popen, auth_data: dict, version_id: str) -> None:
-    while True:
-        if proc.poll() is not None:
-            clear_screen()
-            print()
-            log(f"{t('running.closed')} {tg()}(exit code {proc.returncode}){RST}", "info")
-            pause(t("common.press_enter_menu"))
-            return
+    try:
+        while True:
+            if proc.poll() is not None:
+                clear_screen()
+                print()
+                log(f"{t('running.closed')} {tg()}(exit code {proc.returncode}){RST}", "info")
+                capture = _launches.get(proc.pid, {}).get("capture")
+                if capture is not None and proc.returncode != 0:
+                    # Most likely a crash: show how the output ended
+                    capture.wait(2)
+                    print()
+                    for _, stream, line in capture.tail(CRASH_LINES):
+                        _print_output(stream, line)
+                    print()
+                    log(f"{t('running.log_saved')}: {tg()}{_game_log_path(capture)}{RST}", "info")
+                pause(t("common.press_enter_menu"))
+                return
 
-        show_menu_running(auth_data["name"], version_id, proc.pid)
-        choice = input(f"   {tg()}>{RST} ").strip()
+            show_menu_running(auth_data["name"], version_id, proc.pid)
+            choice = input(f"   {tg()}>{RST} ").strip()
 
-        if choice == "1":
-            proc.terminate()
-            try:
-                proc.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-            log(t("running.terminated"), "ok")
-            pause(t("common.press_enter_menu"))
-            return
+            if choice == "":
+                continue
 
-        elif choice == "2":
-            log(t("running.restarting"), "wait")
-            proc.terminate()
-            try:
-                proc.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-                proc.wait()
-            new_proc = install_and_launch(auth_data, version_id)
-            if new_proc:
-                proc = new_proc
-            else:
-                log(t("running.restart_failed"), "err")
+            elif choice == "1":
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                log(t("running.terminated"), "ok")
                 pause(t("common.press_enter_menu"))
                 return
-        else:
-            log(t("common.invalid_choice"), "err")
-            pause()
+
+            elif choice == "2":
+                log(t("running.restarting"), "wait")
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                _launches.pop(proc.pid, None)
+                new_proc = install_and_launch(auth_data, version_id)
+                if new_proc:
+                    proc = new_proc
+                else:
+                    log(t("running.restart_failed"), "err")
+                    pause(t("common.press_enter_menu"))
+                    return
+
+            elif choice == "3":
+                tail_view(proc)
+
+            else:
+                log(t("common.invalid_choice"), "err")
+                pause()
+    finally:
+        _launches.pop(proc.pid, None)
 
 
 def show_menu_guest(theme_name: str, lang_code: str, animate: bool = False) -> None:
@@ -980,18 +1841,25 @@ def main() -> None:
     selected_version = prefs.get("version", SUPPORTED_VERSIONS[0])
     theme_name = prefs.get("theme", DEFAULT_THEME)
     lang_code = prefs.get("language", DEFAULT_LANG)
+    java_policy = prefs.get("java_policy", DEFAULT_JAVA_POLICY)
     set_theme(theme_name)
     set_language(lang_code)
+    if prefs.get("trace_launches", False):
+        spans.start()
 
     intro_animation()
     first_frame = True
+    if load_auth_data():
+        start_background_install(selected_version)
 
     while True:
         accounts = load_all_accounts()
         saved = load_auth_data()
 
         if saved and saved.get("name"):
-            show_menu_logged(saved["name"], selected_version, theme_name, lang_code, num_accounts=len(accounts), animate=first_frame)
+            show_menu_logged(saved["name"], selected_version, theme_name, lang_code, java_policy,
+                             num_accounts=len(accounts), animate=first_frame, offline=prefs.get("offline", False),
+                             jvm_profile=profiles.profile_name(prefs, selected_version))
             first_frame = False
             choice = input(f"   {tg()}>{RST} ").strip().lower()
 
@@ -1013,6 +1881,7 @@ def main() -> None:
                 selected_version = select_version(selected_version)
                 prefs["version"] = selected_version
                 save_prefs(prefs)
+                start_background_install(selected_version)
 
             elif choice == "3":
                 open_game_folder()
@@ -1040,6 +1909,29 @@ def main() -> None:
                 prefs["language"] = lang_code
                 save_prefs(prefs)
 
+            elif choice == "j":
+                java_policy = select_java_policy(java_policy)
+                prefs["java_policy"] = java_policy
+                save_prefs(prefs)
+
+            elif choice == "p":
+                select_jvm_profile(selected_version, prefs)
+
+            elif choice == "v":
+                verify_menu(selected_version)
+
+            elif choice == "g":
+                clean_up_menu()
+
+            elif choice == "h":
+                timeline_menu()
+
+            elif choice == "o":
+                prefs["offline"] = not prefs.get("offline", False)
+                save_prefs(prefs)
+                log(f"{t('settings.offline')}: {tc1()}{t('settings.on' if prefs['offline'] else 'settings.off')}{RST}", "ok")
+                start_background_install(selected_version)
+
             else:
                 log(t("common.invalid_choice"), "err")
                 pause()
@@ -1084,12 +1976,489 @@ def main() -> None:
                 pause()
 
 
+# ---------------------------------------------------------------------------
+# Comandi da terminale
+# ---------------------------------------------------------------------------
+# python Launcher.py --plan 1.21.4 [--json]
+# python Launcher.py --install 1.21.4 1.21.3 ...
+# python Launcher.py --provision 1.21 1.20 [--export-bundle DIR]
+# python Launcher.py --import-bundle DIR
+# python Launcher.py --mirrors [--json]
+# python Launcher.py --gc [--dry-run] [--rescan] [--json]
+# python Launcher.py --verify 1.21.4 ... [--dry-run] [--json]
+# python Launcher.py --cds [--json]
+# python Launcher.py --timeline [--json]
+
+def cmd_plan(version_id: str, as_json: bool = False) -> int:
+    """Dry run: what installing version_id would download, without downloading it.
+    Exit code 2 means there is not enough disk space."""
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+        import installer
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    index  = get_hash_index()
+    try:
+        with new_engine(load_prefs()) as engine:
+            plan   = installer.plan_version(version_id, mc_dir, engine, index, {installer.game_language(mc_dir)},
+                                            download=False)
+            report = installer.assess_plan(plan, engine.workers, index)
+    except Exception as e:
+        log(f"{t('plan.failed')}: {e}", "err")
+        return 1
+    finally:
+        index.save()
+
+    if as_json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0 if report.fits() else 2
+
+    summary = report.to_dict()
+    log_section(f"{t('plan.title')} {version_id}")
+    for kind, counts in sorted(summary["kinds"].items()):
+        print(f"   {tw()}{kind:<10}{RST} {tg()}{t('plan.missing')}: {counts['missing']:<5} "
+              f"{t('plan.stale')}: {counts['stale']:<5} {t('plan.present')}: {counts['present']:<6} "
+              f"{format_bytes(counts['bytes'])}{RST}")
+    print()
+    log(f"{t('plan.download')}: {tw()}{format_bytes(report.download_bytes)}{RST} "
+        f"{tg()}({len(report.to_fetch)} {t('plan.files')}, {t('plan.deferred')} "
+        f"{format_bytes(summary['deferred_bytes'])}){RST}", "down")
+    if report.unknown_sizes:
+        log(f"{report.unknown_sizes} {t('plan.unknown_sizes')}", "warn")
+    if report.fits():
+        log(f"{t('plan.disk_free')}: {format_bytes(report.disk_free)}", "ok")
+        return 0
+    log(f"{t('plan.disk_free')}: {format_bytes(report.disk_free)} < {format_bytes(report.disk_needed)}", "err")
+    return 2
+
+
+def _draw_queue(jobs: dict, redraw: bool) -> None:
+    if redraw:
+        sys.stdout.write(f"\033[{len(jobs)}A")
+    for version_id, job in jobs.items():
+        if job["state"] == "done":
+            info = f"\033[1;32m{t('queue.done')}{RST}"
+        elif job["state"] == "failed":
+            info = f"\033[1;31m{t('queue.failed')}{RST}"
+        elif job["total_bytes"]:
+            info = f"{_progress_bar(job['bytes'], job['total_bytes'], width=20)}  {tg()}{format_bytes(job['bytes'])} / {format_bytes(job['total_bytes'])}{RST}"
+        else:
+            short = job["status"]
+            short = (short[:22] + "..") if len(short) > 23 else short
+            info = f"{_progress_bar(job['current'], job['max'], width=20)}  {tg()}{short}{RST}"
+        sys.stdout.write(f"\r\033[K   {tw()}{version_id:<10}{RST} {info}\n")
+    sys.stdout.flush()
+
+
+def _run_queue(names: list[str], submit) -> dict:
+    """Queue one job per name with submit(name, callback) and draw a progress line for each
+    until they are all finished. Returns name -> exception or None."""
+    jobs = {n: {"version": n, "state": "running", "status": "", "current": 0, "max": 1,
+                "bytes": 0, "total_bytes": 0, "error": ""} for n in dict.fromkeys(names)}
+    futures = {n: submit(n, _make_job_callback(job)) for n, job in jobs.items()}
+    redraw = False
+    while True:
+        for n, fut in futures.items():
+            if fut.done():
+                jobs[n]["state"] = "failed" if fut.exception() else "done"
+        _draw_queue(jobs, redraw)
+        redraw = True
+        if all(fut.done() for fut in futures.values()):
+            break
+        time.sleep(0.25)
+    return {n: fut.exception() for n, fut in futures.items()}
+
+
+def _installed_runtimes(versions: list[str], mc_dir: str) -> list[str]:
+    rt_index = get_runtime_index()
+    components = set()
+    for version_id in versions:
+        try:
+            rt = rt_index.version_runtime(version_id, mc_dir)
+        except (OSError, ValueError):
+            continue
+        if rt is not None:
+            components.add(rt["component"])
+    rt_index.save()
+    return sorted(components)
+
+
+def cmd_install(versions: list[str], runtimes: bool = False) -> int:
+    """Install several versions at once on one shared download pool,
+    then (with runtimes=True) the Java runtimes they use."""
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+        import installer
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    versions = list(dict.fromkeys(versions))
+
+    log_section(f"{t('queue.title')} ({len(versions)})")
+    with new_engine(load_prefs()) as engine, \
+            installer.InstallQueue(mc_dir, engine, get_hash_index()) as queue:
+        results = _run_queue(versions, queue.submit)
+        if runtimes:
+            ok = [v for v in versions if results[v] is None]
+            print()
+            results.update(_run_queue(_installed_runtimes(ok, mc_dir), queue.submit_runtime))
+    update_references(mc_dir)
+
+    print()
+    failed = {v: e for v, e in results.items() if e is not None}
+    for version_id, err in failed.items():
+        log(f"{version_id}: {err}", "err")
+    if not failed:
+        log(t("queue.all_done"), "ok")
+    return 1 if failed else 0
+
+
+def _group_versions(groups: list[str]) -> list[str] | None:
+    if "all" in groups:
+        groups = list(VERSION_GROUPS)
+    unknown = [g for g in groups if g not in VERSION_GROUPS]
+    if unknown:
+        log(f"{t('provision.unknown_group')}: {', '.join(unknown)} ({', '.join(VERSION_GROUPS)}, all)", "err")
+        return None
+    return [v for g in groups for v in VERSION_GROUPS[g]]
+
+
+def cmd_export(bundle_dir: str, versions: list[str] | None = None) -> int:
+    """Export installed versions (default: every installed supported version) and
+    their Java runtimes as an offline bundle."""
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+        import bundle
+        import installer
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    if versions is None:
+        versions = [v for v in SUPPORTED_VERSIONS if installer.check_receipt(v, mc_dir)]
+    components = [c for c in _installed_runtimes(versions, mc_dir)
+                  if Path(installer.runtime_base(mc_dir, c), ".version").is_file()]
+
+    log_section(f"{t('bundle.exporting')} {bundle_dir}")
+    try:
+        summary = bundle.export_bundle(bundle_dir, mc_dir, versions, components, get_hash_index(), _make_callback())
+    except (bundle.BundleError, OSError) as e:
+        _clear_line()
+        log(f"{t('bundle.failed')}: {e}", "err")
+        return 1
+    _clear_line()
+    log(t("bundle.exported", versions=len(versions), runtimes=len(components), objects=summary["objects"],
+          size=format_bytes(summary["bytes"]), added=summary["added"]), "ok")
+    return 0
+
+
+def cmd_import(bundle_dir: str) -> int:
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+        import bundle
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    log_section(f"{t('bundle.importing')} {bundle_dir}")
+    prefs   = load_prefs()
+    workers = prefs.get("download_workers", DEFAULT_WORKERS)
+    try:
+        summary = bundle.import_bundle(bundle_dir, mc_dir, workers, get_hash_index(), _make_callback(),
+                                       get_store(prefs))
+    except (bundle.BundleError, OSError) as e:
+        _clear_line()
+        log(f"{t('bundle.failed')}: {e}", "err")
+        return 1
+    _clear_line()
+    log(t("bundle.imported", versions=", ".join(summary["versions"]) or "-", skipped=summary["skipped"],
+          linked=summary["linked"], copied=summary["copied"]), "ok")
+    return 0
+
+
+def cmd_mirrors(as_json: bool = False) -> int:
+    """Probe the configured mirrors and the hosts they stand in for, and show their health."""
+    prefs = load_prefs()
+    mirrors = MirrorSet(prefs.get("mirrors"), MIRROR_HEALTH_FILE)
+    if not mirrors:
+        log(t("mirrors.none"), "warn")
+        return 1
+    with DownloadEngine(1, mirrors=mirrors) as engine:
+        results = mirrors.probe(engine.session())
+
+    if as_json:
+        print(json.dumps({host: mirrors.health(host).to_dict() for host in results}, indent=2))
+        return 0 if any(v is not None for v in results.values()) else 1
+
+    log_section(t("mirrors.title"))
+    for category, hosts in mirrors.mirrors.items():
+        if hosts:
+            print(f"   {tw()}{category:<10}{RST} {tg()}{' > '.join(hosts)}{RST}")
+    print()
+    for host, latency in results.items():
+        h = mirrors.health(host)
+        if latency is None:
+            state = f"\033[1;31m{t('mirrors.cooldown') if h.down() else t('mirrors.down')}{RST}"
+        else:
+            speed = f"  {format_bytes(h.throughput)}/s" if h.throughput else ""
+            state = f"\033[1;32m{t('mirrors.up')}{RST} {tg()}{latency * 1000:.0f} ms{speed}{RST}"
+        fails = f"  {tg()}{t('mirrors.failures')}: {h.failures}{RST}" if h.failures else ""
+        print(f"   {tw()}{host:<42}{RST} {state}{fails}")
+    return 0 if any(v is not None for v in results.values()) else 1
+
+
+def _format_ms(ms: int | None) -> str:
+    return f"{ms / 1000:.1f} s" if ms else "-"
+
+
+def cmd_cds(as_json: bool = False) -> int:
+    """AppCDS archives and the startup times measured without and with them."""
+    entries = sorted(get_archive_index().entries(), key=lambda e: (e["version"], e["java"]))
+    if as_json:
+        print(json.dumps(entries, indent=2))
+        return 0
+
+    log_section(t("cds.title"))
+    if not load_prefs().get("class_data_sharing", False):
+        log(t("cds.disabled"), "warn")
+    if not entries:
+        log(t("cds.none"), "info")
+        return 0
+    for e in entries:
+        state = {"shared": t("cds.ready"), "training": t("cds.training")}.get(e["state"], "-")
+        size = format_bytes(e["size"]) if e.get("size") else ""
+        before = e["startup"].get("without", {}).get("ms")
+        after = e["startup"].get("with", {}).get("ms")
+        times = f"{t('cds.without')}: {_format_ms(before)}   {t('cds.with')}: {_format_ms(after)}"
+        if before and after:
+            times += f"  ({(after - before) / before * 100:+.0f}%)"
+        print(f"   {tw()}{e['version']:<10}{RST} {state:<12} {tg()}{size:>10}  {times}{RST}")
+        print(f"   {' ' * 10} {tg()}{e['java']}{RST}")
+    return 0
+
+
+def cmd_timeline(as_json: bool = False) -> int:
+    """Time from spawn to the title screen per version and JVM profile, the time spent
+    preparing the launch, and the last launch's milestones."""
+    import timeline
+    rows = timeline.summarize(get_launch_history().launches())
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    log_section(t("timeline.title"))
+    if not rows:
+        log(t("timeline.none"), "info")
+        return 0
+    for row in rows:
+        times = (f"{t('timeline.last')}: {_format_ms(row['last_ms'])}   {t('timeline.median')}: "
+                 f"{_format_ms(row['median_ms'])}   {t('timeline.best')}: {_format_ms(row['best_ms'])}")
+        prepare = f"{t('timeline.step.prepare')}: {_format_ms(row['median_prepare_ms'])}"
+        print(f"   {tw()}{row['version']:<10}{RST} {row['profile']:<12} {tg()}{times}   {prepare}   "
+              f"({row['runs']} {t('timeline.runs')}){RST}")
+        last = row["last"]
+        # The preparation comes first; the milestones are stamped from spawn
+        steps = [f"{t('timeline.step.' + name)} {_format_ms(last['milestones'][name])}"
+                 for name, _ in timeline.MILESTONES if name in last["milestones"]]
+        print(f"   {' ' * 10} {tg()}{t('timeline.step.prepare')} {_format_ms(last['prepare_ms'])}  |  "
+              f"{'  >  '.join(steps)}{RST}")
+        if row["regression"]:
+            slower = f"{(row['last_ms'] - row['baseline_ms']) / row['baseline_ms'] * 100:+.0f}%"
+            warning = t("timeline.regression", pct=slower, baseline=_format_ms(row["baseline_ms"]))
+            print(f"   {' ' * 10} \033[1;33m{warning}{RST}")
+    return 0
+
+
+def run_gc(mc_dir: str, dry_run: bool = True, rescan: bool = False) -> dict:
+    """Refresh the reference index and collect unreferenced files (see cleanup.py).
+    The folders are only walked the first time, or with rescan=True."""
+    index = get_reference_index(mc_dir)
+    index.refresh()
+    if rescan or not index.seeded:
+        index.seed(get_hash_index().paths())
+    report = index.collect(dry_run)
+    index.save()
+    return report
+
+
+def _print_gc_report(report: dict, dry_run: bool) -> None:
+    files = sum(c["files"] for c in report["categories"].values())
+    size  = sum(c["bytes"] for c in report["categories"].values())
+    unknown = report.get("unknown", {})
+    if dry_run and unknown.get("files"):
+        log(t("gc.unknown", files=unknown["files"], size=format_bytes(unknown["bytes"])), "info")
+    if not files:
+        log(t("gc.nothing"), "ok")
+        return
+    for category, counts in report["categories"].items():
+        print(f"   {tw()}{category:<10}{RST} {tg()}{counts['files']:>6} {t('gc.files')}  "
+              f"{format_bytes(counts['bytes'])}{RST}")
+    print()
+    if dry_run:
+        log(t("gc.reclaimable", size=format_bytes(size), files=files), "info")
+    else:
+        log(t("gc.reclaimed", size=format_bytes(size), files=files), "ok")
+    if report["errors"]:
+        log(f"{len(report['errors'])} {t('gc.errors')}: {report['errors'][0]}", "warn")
+
+
+def cmd_gc(dry_run: bool = False, rescan: bool = False, as_json: bool = False) -> int:
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    report = run_gc(mc_dir, dry_run, rescan)
+    if as_json:
+        print(json.dumps({"dry_run": dry_run, **report}, indent=2))
+    else:
+        log_section(t("gc.title"))
+        _print_gc_report(report, dry_run)
+    return 1 if report["errors"] else 0
+
+
+def run_verify(version_id: str, mc_dir: str, repair: bool = True):
+    """Verify (and repair) one version with a progress bar. Returns (report, seconds)."""
+    import installer
+    start = time.monotonic()
+    with new_engine(load_prefs()) as engine:
+        report = installer.verify_version(version_id, mc_dir, engine, get_hash_index(), repair,
+                                          callback=_make_callback())
+    _clear_line()
+    if repair:
+        update_references(mc_dir)
+    return report, time.monotonic() - start
+
+
+def _print_verify_report(report, seconds: float, repair: bool) -> None:
+    for category, c in report.categories.items():
+        if not c["checked"]:
+            continue
+        line = (f"{t('verify.checked')}: {c['checked']:<6} {t('verify.missing')}: {c['missing']:<4} "
+                f"{t('verify.corrupt')}: {c['corrupt']:<4}")
+        if repair:
+            line += f" {t('verify.repaired')}: {c['repaired']}"
+        print(f"   {tw()}{category:<10}{RST} {tg()}{line}{RST}")
+    print()
+    broken = len(report.broken)
+    if report.error:
+        log(f"{t('verify.failed')}: {report.error}", "err")
+    elif not broken:
+        log(t("verify.all_ok", secs=f"{seconds:.1f}"), "ok")
+    elif repair:
+        log(t("verify.repaired_all", files=broken, secs=f"{seconds:.1f}"), "ok")
+    else:
+        log(t("verify.found", files=broken), "warn")
+
+
+def cmd_verify(versions: list[str], repair: bool = True, as_json: bool = False) -> int:
+    """Check every file of each version on all cores and re-fetch only the broken ones."""
+    try:
+        import minecraft_launcher_lib.utils as mc_utils
+        import installer  # noqa: F401
+    except ImportError:
+        log(t("launch.lib_missing"), "err")
+        return 1
+
+    mc_dir = str(mc_utils.get_minecraft_directory())
+    rc = 0
+    results = []
+    for version_id in dict.fromkeys(versions):
+        if not as_json:
+            log_section(f"{t('verify.title')} {version_id}")
+        try:
+            report, seconds = run_verify(version_id, mc_dir, repair)
+        except Exception as e:
+            _clear_line()
+            log(f"{version_id}: {t('verify.failed')}: {e}", "err")
+            rc = 1
+            continue
+        if as_json:
+            results.append({**report.to_dict(), "seconds": round(seconds, 2)})
+        else:
+            _print_verify_report(report, seconds, repair)
+        if not report.ok:
+            rc = 1
+    if as_json:
+        print(json.dumps(results, indent=2))
+    return rc
+
+
+def run_cli(argv: list[str]) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog="Launcher.py", description="RCA Launcher")
+    parser.add_argument("--plan", metavar="VERSION", help="show what installing VERSION would download")
+    parser.add_argument("--install", metavar="VERSION", nargs="+", help="install / verify one or more versions in parallel")
+    parser.add_argument("--provision", metavar="GROUP", nargs="+",
+                        help="install every version of the given groups (e.g. 1.21 1.20, or all) and their runtimes")
+    parser.add_argument("--export-bundle", metavar="DIR",
+                        help="export the provisioned (or all installed) versions as an offline bundle")
+    parser.add_argument("--import-bundle", metavar="DIR", help="install an offline bundle without network access")
+    parser.add_argument("--mirrors", action="store_true", help="probe the configured download mirrors")
+    parser.add_argument("--verify", metavar="VERSION", nargs="+",
+                        help="hash every file of the given versions on all cores and repair the broken ones")
+    parser.add_argument("--cds", action="store_true",
+                        help="list AppCDS archives and the startup times measured without / with them")
+    parser.add_argument("--timeline", action="store_true",
+                        help="time to the title screen per version and JVM profile, from past launches")
+    parser.add_argument("--gc", action="store_true",
+                        help="delete libraries, assets and natives no installed version uses")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --gc / --verify: only report, do not delete or download anything")
+    parser.add_argument("--rescan", action="store_true", help="with --gc: walk the folders again for unknown files")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    prefs = load_prefs()
+    set_theme(prefs.get("theme", DEFAULT_THEME))
+    set_language(prefs.get("language", DEFAULT_LANG))
+    if args.plan:
+        return cmd_plan(args.plan, args.json)
+    if args.mirrors:
+        return cmd_mirrors(args.json)
+    if args.verify:
+        return cmd_verify(args.verify, not args.dry_run, args.json)
+    if args.cds:
+        return cmd_cds(args.json)
+    if args.timeline:
+        return cmd_timeline(args.json)
+    if args.gc:
+        return cmd_gc(args.dry_run, args.rescan, args.json)
+    if args.install:
+        return cmd_install(args.install)
+    if args.import_bundle:
+        return cmd_import(args.import_bundle)
+    if args.provision:
+        versions = _group_versions(args.provision)
+        if versions is None:
+            return 1
+        rc = cmd_install(versions, runtimes=True)
+        if rc == 0 and args.export_bundle:
+            rc = cmd_export(args.export_bundle, versions)
+        return rc
+    if args.export_bundle:
+        return cmd_export(args.export_bundle)
+    parser.print_help()
+    return 1
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
     _enable_ansi_windows()
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,259 @@
+"""
+Offline cache bundles for RCA Launcher
+A bundle is a directory holding installed versions and Java runtimes as
+content-addressed objects plus an index (bundle.json) describing where each
+object goes, so another machine can import them without network access.
+"""
+
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from installer import (HashIndex, jvm_platform, receipt_files, receipt_natives, runtime_base, sha1_file,
+                       write_receipt_entries)
+
+BUNDLE_FORMAT = 1
+BUNDLE_INDEX  = "bundle.json"
+
+
+class BundleError(Exception):
+    pass
+
+
+def _set(callback: dict | None, key: str, value) -> None:
+    (callback or {}).get(key, lambda _: None)(value)
+
+
+def _object_path(bundle_dir: str, sha1: str) -> str:
+    return os.path.join(bundle_dir, "objects", sha1[:2], sha1)
+
+
+def _place(src: str, dst: str, link: bool = True) -> bool:
+    """Hardlink (with link=True) or copy src to dst, copying when linking is not
+    possible. True if linked."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".import"
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+    linked = False
+    if link:
+        try:
+            os.link(src, tmp)
+            linked = True
+        except OSError:
+            pass
+    if not linked:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return linked
+
+
+def _is_executable(path: str) -> bool:
+    return os.name != "nt" and os.access(path, os.X_OK)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _version_files(version_id: str, mc_dir: str) -> list[str]:
+    files = receipt_files(version_id, mc_dir)
+    if files is None:
+        raise BundleError(f"{version_id} is not installed")
+    return [rel.replace(os.sep, "/") for rel, *_ in files]
+
+
+def _natives_files(natives_dir: str, mc_dir: str) -> list[str]:
+    """Everything in a shared natives folder (its receipt only tracks the marker)."""
+    rels = []
+    for dirpath, _, filenames in os.walk(natives_dir):
+        rels += [os.path.relpath(os.path.join(dirpath, f), mc_dir).replace(os.sep, "/") for f in filenames]
+    return rels
+
+
+def _runtime_entries(component: str, mc_dir: str) -> tuple[list[str], list[list[str]]]:
+    base = runtime_base(mc_dir, component)
+    if not os.path.isfile(os.path.join(base, ".version")):
+        raise BundleError(f"Java runtime {component} is not installed")
+    files, links = [], []
+    for dirpath, dirnames, filenames in os.walk(base):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, mc_dir)
+            if os.path.islink(path):
+                links.append([rel, os.readlink(path)])
+            elif name in filenames:
+                files.append(rel)
+    return files, links
+
+
+def export_bundle(bundle_dir: str, mc_dir: str, versions: list[str], components: list[str],
+                  index: HashIndex | None = None, callback: dict | None = None) -> dict:
+    """Write installed versions and runtimes to bundle_dir. Objects already in the
+    bundle are kept, so exporting again only adds what changed. Returns a summary."""
+    os.makedirs(bundle_dir, exist_ok=True)
+    rels = {}
+    receipts = {}
+    natives = {}
+    for version_id in versions:
+        receipts[version_id] = _version_files(version_id, mc_dir)
+        rels.update(dict.fromkeys(receipts[version_id]))
+        natives_dir = receipt_natives(version_id, mc_dir)
+        if natives_dir:
+            natives[version_id] = os.path.relpath(natives_dir, mc_dir).replace(os.sep, "/")
+            rels.update(dict.fromkeys(_natives_files(natives_dir, mc_dir)))
+    links = []
+    for component in components:
+        files, component_links = _runtime_entries(component, mc_dir)
+        rels.update(dict.fromkeys(files))
+        links += component_links
+
+    _set(callback, "setMax", len(rels))
+    files = []
+    objects = {}
+    added = 0
+    for i, rel in enumerate(rels, 1):
+        path = os.path.join(mc_dir, rel)
+        sha1 = index.sha1(path) if index is not None else sha1_file(path)
+        files.append([rel.replace(os.sep, "/"), sha1, _is_executable(path)])
+        if sha1 not in objects:
+            objects[sha1] = os.path.getsize(path)
+            obj = _object_path(bundle_dir, sha1)
+            if not os.path.isfile(obj):
+                # Copied, never linked: the bundle must not share an inode with a live install
+                _place(path, obj, link=False)
+                added += 1
+        _set(callback, "setStatus", os.path.basename(rel))
+        _set(callback, "setProgress", i)
+
+    data = {
+        "format": BUNDLE_FORMAT,
+        "created": int(time.time()),
+        "platform": jvm_platform(),
+        "versions": receipts,
+        "natives": natives,
+        "runtimes": list(components),
+        "files": files,
+        "links": [[rel.replace(os.sep, "/"), target] for rel, target in links],
+        "objects": objects,
+    }
+    tmp = os.path.join(bundle_dir, BUNDLE_INDEX + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, os.path.join(bundle_dir, BUNDLE_INDEX))
+    if index is not None:
+        index.save()
+    return {"files": len(files), "objects": len(objects), "added": added,
+            "bytes": sum(objects.values())}
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def read_bundle(bundle_dir: str) -> dict:
+    try:
+        with open(os.path.join(bundle_dir, BUNDLE_INDEX), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BundleError(f"Not a bundle: {bundle_dir} ({e})")
+    if data.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"Unsupported bundle format: {data.get('format')}")
+    return data
+
+
+def import_bundle(bundle_dir: str, mc_dir: str, workers: int, index: HashIndex | None = None,
+                  callback: dict | None = None, store=None) -> dict:
+    """Install a bundle into mc_dir without network access. Files that are already
+    present with the right hash are left alone; every other object is verified
+    (in parallel) and copied. With a shared store (store.py) the verified object is
+    added to the store and linked from there instead. Returns a summary."""
+    data = read_bundle(bundle_dir)
+    platform_string = jvm_platform()
+    if data["platform"] != platform_string:
+        raise BundleError(f"Bundle was made for {data['platform']}, this system is {platform_string}")
+
+    def present(entry: list) -> bool:
+        path = os.path.join(mc_dir, entry[0])
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != data["objects"][entry[1]]:
+            return False
+        return (index.sha1(path, st) if index is not None else sha1_file(path)) == entry[1]
+
+    _set(callback, "setStatus", "Verify")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        flags = list(pool.map(present, data["files"]))
+    needed = {}
+    for entry, ok in zip(data["files"], flags):
+        if not ok:
+            needed.setdefault(entry[1], []).append(entry)
+
+    def install_object(sha1: str) -> tuple[int, int]:
+        obj = _object_path(bundle_dir, sha1)
+        if not os.path.isfile(obj) or os.path.getsize(obj) != data["objects"][sha1] or sha1_file(obj) != sha1:
+            raise BundleError(f"Corrupt bundle object {sha1}")
+        # The bundle's own files are never linked into an install: only the store's read-only objects are
+        if store is not None and not os.path.isfile(store.object_path(sha1)):
+            claim = store.claim(sha1)
+            if claim is not None:
+                try:
+                    store.publish(sha1, obj, any(e[2] for e in needed[sha1]))
+                finally:
+                    store.release(claim)
+        linked = copied = 0
+        for rel, _, executable in needed[sha1]:
+            dst = os.path.join(mc_dir, rel)
+            if store is not None and store.link(sha1, dst, data["objects"][sha1], executable):
+                linked += 1
+            else:
+                _place(obj, dst, link=False)
+                copied += 1
+            if executable and os.name != "nt":
+                os.chmod(dst, os.stat(dst).st_mode | 0o111)
+            if index is not None:
+                index.record(dst, sha1)
+        return linked, copied
+
+    _set(callback, "setMax", len(needed))
+    linked = copied = done = 0
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(install_object, sha1): sha1 for sha1 in needed}
+        for fut in as_completed(futures):
+            try:
+                n_linked, n_copied = fut.result()
+                linked += n_linked
+                copied += n_copied
+            except (BundleError, OSError) as e:
+                errors.append(str(e))
+            done += 1
+            _set(callback, "setProgress", done)
+    if index is not None:
+        index.save()
+    if errors:
+        raise BundleError(f"{len(errors)} objects failed to import: {errors[0]}")
+
+    for rel, target in data["links"]:
+        path = os.path.join(mc_dir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.lexists(path):
+            try:
+                os.symlink(target, path)
+            except OSError:
+                pass
+
+    hashes = {rel: sha1 for rel, sha1, _ in data["files"]}
+    natives = data.get("natives", {})
+    for version_id, rels in data["versions"].items():
+        natives_dir = os.path.join(mc_dir, natives[version_id]) if version_id in natives else None
+        write_receipt_entries(version_id, mc_dir, [(os.path.join(mc_dir, r), hashes[r]) for r in rels], natives_dir)
+
+    return {"versions": list(data["versions"]), "runtimes": data["runtimes"], "files": len(data["files"]),
+            "skipped": sum(flags), "linked": linked, "copied": copied}
@@ -0,0 +1,165 @@
+"""
+Class data sharing for RCA Launcher
+Most of a launch is the JVM loading and verifying classes. With AppCDS the
+first run of a version on a given Java build records the classes it loaded
+(-XX:ArchiveClassesAtExit) and later runs map that archive instead
+(-XX:SharedArchiveFile). An archive belongs to one (version, java build) and
+is thrown away as soon as the classpath or the JVM changes. The time from
+spawning the game to its first texture atlas is recorded with and without an
+archive, so the gain can be measured per version.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+CDS_INDEX_FORMAT = 1
+MIN_JAVA_MAJOR   = 13         # dynamic archives (-XX:ArchiveClassesAtExit) need JDK 13+
+ARCHIVE_SUFFIX   = ".jsa"
+TRAINING_SUFFIX  = ".training.jsa"
+
+# The block atlas is built at the end of the first resource reload, right
+# before the title screen: the closest thing to "the game has started"
+STARTUP_MARKER = re.compile(r"Created: \d+x\d+x\d+ minecraft:textures/atlas/blocks\.png-atlas")
+
+# Modes returned by ArchiveIndex.prepare
+MODE_OFF      = "off"         # disabled, or a JVM without dynamic archives
+MODE_TRAINING = "training"    # this run writes the archive at exit
+MODE_SHARED   = "shared"      # this run maps the archive
+
+
+def _stat_sig(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def java_build(java: str) -> list:
+    """Identity of a Java install: its real path and the stat of the executable and of
+    lib/modules (which changes with every JDK update, unlike the path)."""
+    real = os.path.realpath(java)
+    home = os.path.dirname(os.path.dirname(real))
+    return [real, _stat_sig(real), _stat_sig(os.path.join(home, "lib", "modules"))]
+
+
+def classpath_of(cmd: list[str]) -> list[str]:
+    for i, arg in enumerate(cmd[:-1]):
+        if arg in ("-cp", "-classpath", "--class-path"):
+            return cmd[i + 1].split(os.pathsep)
+    return []
+
+
+def fingerprint(cmd: list[str]) -> str:
+    """Hash of everything an archive depends on: the JVM and every classpath jar (the JVM
+    itself refuses an archive whose jars changed size or mtime)."""
+    parts = [java_build(cmd[0])] + [[jar, _stat_sig(jar)] for jar in classpath_of(cmd)]
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ArchiveIndex:
+    """Archives and startup times per (version, java executable), stored in <root>/index.json."""
+
+    def __init__(self, root: str):
+        self.root = str(root)
+        self.path = os.path.join(self.root, "index.json")
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._data is None:
+            data = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if data.get("format") != CDS_INDEX_FORMAT:
+                data = {"format": CDS_INDEX_FORMAT, "entries": {}}
+            self._data = data
+        return self._data
+
+    @staticmethod
+    def _key(version_id: str, java: str) -> str:
+        return f"{version_id}|{os.path.realpath(java)}"
+
+    def _archive_path(self, version_id: str, fp: str, suffix: str) -> str:
+        return os.path.join(self.root, f"{version_id}-{fp[:16]}{suffix}")
+
+    def prepare(self, version_id: str, cmd: list[str], java_major, enabled: bool = True) -> tuple[list[str], str]:
+        """Launch command with the archive options added, and the mode of this run.
+        A stale archive (classpath or JVM changed) is deleted and a new one is trained."""
+        if not enabled or not isinstance(java_major, int) or java_major < MIN_JAVA_MAJOR:
+            return cmd, MODE_OFF
+
+        fp = fingerprint(cmd)
+        archive = self._archive_path(version_id, fp, ARCHIVE_SUFFIX)
+        training = self._archive_path(version_id, fp, TRAINING_SUFFIX)
+        with self._lock:
+            entries = self._load()["entries"]
+            key = self._key(version_id, cmd[0])
+            entry = entries.get(key)
+            if entry is not None and entry.get("fingerprint") not in (None, fp):
+                for name in (entry.get("archive"), entry.get("training")):
+                    if name:
+                        _remove(os.path.join(self.root, name))
+                entry = None
+            if entry is None:
+                entry = entries[key] = {"version": version_id, "java": os.path.realpath(cmd[0]),
+                                        "fingerprint": fp, "state": None, "startup": {}}
+            entry["fingerprint"] = fp
+
+            # The JVM writes the archive when the training run exits; adopt it now
+            if entry["state"] == MODE_TRAINING and os.path.isfile(training) and os.path.getsize(training):
+                os.replace(training, archive)
+                entry["state"] = MODE_SHARED
+
+            os.makedirs(self.root, exist_ok=True)
+            if entry["state"] == MODE_SHARED and os.path.isfile(archive):
+                entry.update(archive=os.path.basename(archive), size=os.path.getsize(archive))
+                option, mode = f"-XX:SharedArchiveFile={archive}", MODE_SHARED
+            else:
+                # First run, or the training run was killed before it could dump
+                _remove(training)
+                entry.update(state=MODE_TRAINING, training=os.path.basename(training))
+                option, mode = f"-XX:ArchiveClassesAtExit={training}", MODE_TRAINING
+        return [cmd[0], option] + cmd[1:], mode
+
+    def record_startup(self, version_id: str, java: str, mode: str, ms: int) -> None:
+        """Store a measured startup time: "shared" runs as "with", any other as "without"."""
+        with self._lock:
+            entries = self._load()["entries"]
+            key = self._key(version_id, java)
+            entry = entries.setdefault(key, {"version": version_id, "java": os.path.realpath(java),
+                                             "fingerprint": None, "state": None, "startup": {}})
+            slot = "with" if mode == MODE_SHARED else "without"
+            entry["startup"][slot] = {"ms": ms, "at": int(time.time())}
+
+    def startup(self, version_id: str, java: str) -> dict:
+        """{"with": {"ms", "at"}, "without": {...}} for whatever has been measured."""
+        entry = self._load()["entries"].get(self._key(version_id, java))
+        return dict(entry["startup"]) if entry else {}
+
+    def entries(self) -> list[dict]:
+        return [dict(e) for e in self._load()["entries"].values()]
+
+    def save(self) -> None:
+        with self._lock:
+            if self._data is None:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
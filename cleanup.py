@@ -0,0 +1,329 @@
+"""
+Garbage collection for RCA Launcher
+A reference index records which libraries, asset objects and natives each
+installed version uses. It is refreshed incrementally (only version JSONs and
+asset indexes whose size / mtime changed are read again), and files that stop
+being referenced are remembered as orphans, so collecting them never needs a
+walk of the whole .minecraft folder.
+Only files this launcher wrote are ever collected: those listed in its install
+receipts and journals, or verified through its hash index. A .minecraft shared
+with other launchers (the official one, Forge installers) holds files no
+version JSON lists; they are reported as unknown and left alone.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+from downloader import PART_SUFFIX
+from installer import (NATIVES_CACHE, NATIVES_COMPLETE, _maven_path, journal_path, receipt_files, receipt_natives,
+                       receipt_path, version_json_path)
+
+REFERENCE_INDEX_FORMAT = 2
+GC_CATEGORIES = ("libraries", "assets", "natives")
+
+# Folders whose files belong to versions; anything else in .minecraft is never touched
+GC_ROOTS = {
+    "libraries": ("libraries",),
+    "assets":    ("assets/objects", "assets/indexes", "assets/log_configs"),
+}
+
+
+def _stat_sig(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _read_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _disk_usage(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def version_references(data: dict) -> dict:
+    """Files a version JSON points at, for every OS (a superset is the safe side):
+    {"libraries": [relpath], "index": asset index name or None, "logs": [relpath]}."""
+    libraries = []
+    for lib in data.get("libraries", []):
+        downloads = lib.get("downloads")
+        if downloads is None:
+            try:
+                libraries.append(_maven_path(lib["name"]))
+            except (KeyError, ValueError):
+                pass
+            continue
+        art = downloads.get("artifact")
+        if art and "path" in art:
+            libraries.append(art["path"])
+        for name, classifier in downloads.get("classifiers", {}).items():
+            libraries.append(classifier.get("path") or _maven_path(lib["name"]).replace(".jar", f"-{name}.jar"))
+    logs = []
+    logging_cfg = data.get("logging", {}).get("client", {}).get("file")
+    if logging_cfg:
+        logs.append(f"assets/log_configs/{logging_cfg['id']}")
+    return {"libraries": [f"libraries/{p}" for p in libraries], "index": data.get("assets"), "logs": logs}
+
+
+def _journal_files(path: str) -> list[str]:
+    """Relative paths an unfinished install has already written (see installer.InstallJournal)."""
+    rels = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rels.append(json.loads(line)[0].replace(os.sep, "/"))
+                except (ValueError, IndexError):
+                    break
+    except OSError:
+        pass
+    return rels
+
+
+def category_of(rel: str) -> str:
+    if rel.startswith("libraries/"):
+        return "libraries"
+    if rel.startswith(("versions/", f"{NATIVES_CACHE}/")):
+        return "natives"
+    return "assets"
+
+
+class ReferenceIndex:
+    def __init__(self, path: str, mc_dir: str):
+        self.path = str(path)
+        self.mc_dir = mc_dir
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._data is None:
+            data = {}
+            try:
+                data = _read_json(self.path)
+            except (OSError, ValueError):
+                pass
+            if data.get("format") != REFERENCE_INDEX_FORMAT or data.get("mc_dir") != self.mc_dir:
+                data = {"format": REFERENCE_INDEX_FORMAT, "mc_dir": self.mc_dir, "seeded": False,
+                        "versions": {}, "indexes": {}, "owned": [], "orphans": [], "unknown": []}
+            self._data = data
+        return self._data
+
+    def referenced(self) -> set[str]:
+        """Relative paths ("/"-separated) of every file an installed version uses."""
+        data = self._load()
+        refs = set()
+        for version_id, entry in data["versions"].items():
+            refs.update(entry["libraries"])
+            refs.update(entry["logs"])
+            if entry.get("natives"):
+                refs.add(entry["natives"])
+            name = entry["index"]
+            if name and name in data["indexes"]:
+                refs.add(f"assets/indexes/{name}.json")
+                refs.update(f"assets/objects/{h[:2]}/{h}" for h in data["indexes"][name]["objects"])
+        return refs
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.mc_dir).replace(os.sep, "/")
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the versions folder. Only JSONs that changed
+        are parsed; whatever they (or removed versions) no longer use becomes an orphan
+        if this launcher wrote it."""
+        with self._lock:
+            data = self._load()
+            owned = set(data["owned"])
+            before = self.referenced()
+            versions_dir = os.path.join(self.mc_dir, "versions")
+            try:
+                names = sorted(os.listdir(versions_dir))
+            except OSError:
+                names = []
+
+            present = {}
+            leftovers = []
+            for version_id in names:
+                path = version_json_path(self.mc_dir, version_id)
+                sig = _stat_sig(path)
+                owned.update(_journal_files(journal_path(self.mc_dir, version_id)))
+                if sig is None:
+                    # A version folder without its JSON only holds leftovers (ours if we left a receipt)
+                    if os.path.isdir(os.path.join(versions_dir, version_id, "natives")) and \
+                            os.path.isfile(receipt_path(self.mc_dir, version_id)):
+                        leftovers.append(f"versions/{version_id}/natives")
+                    continue
+                entry = data["versions"].get(version_id)
+                if entry is None or entry["sig"] != sig:
+                    try:
+                        entry = {"sig": sig, **version_references(_read_json(path))}
+                    except (OSError, ValueError):
+                        # Half-written JSON: keep what it used last time
+                        if entry is None:
+                            continue
+                # The shared natives folder is only known from the install receipt (kept
+                # as it was while an install has the receipt dropped)
+                receipt_sig = _stat_sig(receipt_path(self.mc_dir, version_id))
+                if receipt_sig is not None and entry.get("receipt_sig") != receipt_sig:
+                    natives_dir = receipt_natives(version_id, self.mc_dir)
+                    natives = self._rel(natives_dir) if natives_dir else None
+                    entry = {**entry, "receipt_sig": receipt_sig, "natives": natives}
+                    # Everything the receipt lists was installed or verified by this launcher
+                    owned.update(rel.replace(os.sep, "/") for rel, *_ in receipt_files(version_id, self.mc_dir) or [])
+                    if natives:
+                        owned.add(natives)
+                if entry.get("natives") and os.path.isdir(os.path.join(versions_dir, version_id, "natives")):
+                    # Unpacked there before the natives cache existed
+                    leftovers.append(f"versions/{version_id}/natives")
+                present[version_id] = entry
+            data["versions"] = present
+
+            indexes = {}
+            for entry in present.values():
+                name = entry["index"]
+                if not name or name in indexes:
+                    continue
+                path = os.path.join(self.mc_dir, "assets", "indexes", f"{name}.json")
+                sig = _stat_sig(path)
+                cached = data["indexes"].get(name)
+                if cached is not None and cached["sig"] == sig:
+                    indexes[name] = cached
+                elif sig is not None:
+                    try:
+                        objects = sorted({o["hash"] for o in _read_json(path)["objects"].values()})
+                    except (OSError, ValueError, KeyError):
+                        if cached is not None:
+                            indexes[name] = cached
+                        continue
+                    indexes[name] = {"sig": sig, "objects": objects}
+            data["indexes"] = indexes
+
+            owned.update(leftovers)
+            data["owned"] = sorted(owned)
+            after = self.referenced()
+            orphans = (set(data["orphans"]) | (before - after) | set(leftovers)) - after
+            data["orphans"] = sorted(orphans & owned)
+
+    def seed(self, hashed: list[str] = ()) -> None:
+        """One-time walk of the version-owned folders, so files that were already
+        unreferenced before the index existed are found. hashed holds the absolute paths
+        in the launcher's hash index. Unreferenced files this launcher did not write
+        are only remembered as unknown."""
+        with self._lock:
+            data = self._load()
+            refs = self.referenced()
+            owned = set(data["owned"])
+            owned.update(self._rel(p) for p in hashed if p.startswith(self.mc_dir + os.sep))
+            orphans = set(data["orphans"])
+            unknown = set()
+            for roots in GC_ROOTS.values():
+                for root in roots:
+                    for dirpath, _, files in os.walk(os.path.join(self.mc_dir, root)):
+                        for name in files:
+                            if name.endswith((PART_SUFFIX, ".tmp")):
+                                continue
+                            rel = self._rel(os.path.join(dirpath, name))
+                            if rel not in refs:
+                                (orphans if rel in owned else unknown).add(rel)
+            # Natives cache folders are collected whole; the marker says one was unpacked here
+            try:
+                keys = os.listdir(os.path.join(self.mc_dir, NATIVES_CACHE))
+            except OSError:
+                keys = []
+            for key in keys:
+                rel = f"{NATIVES_CACHE}/{key}"
+                if rel in refs or key.endswith(".tmp"):
+                    continue
+                if rel in owned or os.path.isfile(os.path.join(self.mc_dir, NATIVES_CACHE, key, NATIVES_COMPLETE)):
+                    owned.add(rel)
+                    orphans.add(rel)
+                else:
+                    unknown.add(rel)
+            data["owned"] = sorted(owned)
+            data["orphans"] = sorted(orphans)
+            data["unknown"] = sorted(unknown)
+            data["seeded"] = True
+
+    @property
+    def seeded(self) -> bool:
+        return self._load()["seeded"]
+
+    def collect(self, dry_run: bool = True) -> dict:
+        """Report (and unless dry_run, delete) the orphans that still exist.
+        Returns {"categories": {category: {"files", "bytes"}}, "paths": [...], "errors": [...],
+        "unknown": {"files", "bytes"}}; unknown files are never deleted and only counted in a dry run."""
+        with self._lock:
+            data = self._load()
+            refs = self.referenced()
+            owned = set(data["owned"])
+            categories = {c: {"files": 0, "bytes": 0} for c in GC_CATEGORIES}
+            unknown = {"files": 0, "bytes": 0}
+            if dry_run:
+                for rel in data["unknown"]:
+                    path = os.path.join(self.mc_dir, *rel.split("/"))
+                    if rel not in refs and os.path.lexists(path):
+                        unknown["files"] += 1
+                        unknown["bytes"] += _disk_usage(path)
+            paths, errors, keep = [], [], []
+            for rel in data["orphans"]:
+                path = os.path.join(self.mc_dir, *rel.split("/"))
+                if rel in refs or rel not in owned or not os.path.lexists(path):
+                    continue
+                size = _disk_usage(path)
+                if not dry_run:
+                    try:
+                        if os.path.isdir(path) and not os.path.islink(path):
+                            shutil.rmtree(path)
+                        else:
+                            os.remove(path)
+                    except OSError as e:
+                        errors.append(f"{rel}: {e}")
+                        keep.append(rel)
+                        continue
+                    self._prune_dirs(os.path.dirname(path))
+                    owned.discard(rel)
+                else:
+                    keep.append(rel)
+                stats = categories[category_of(rel)]
+                stats["files"] += 1
+                stats["bytes"] += size
+                paths.append(rel)
+            data["orphans"] = keep
+            data["owned"] = sorted(owned)
+        return {"categories": categories, "paths": paths, "errors": errors, "unknown": unknown}
+
+    def _prune_dirs(self, path: str) -> None:
+        """Remove directories emptied by a collection, up to (not including) the GC roots."""
+        stop = {os.path.join(self.mc_dir, *root.split("/")) for roots in GC_ROOTS.values() for root in roots}
+        stop.add(os.path.join(self.mc_dir, "versions"))
+        stop.add(os.path.join(self.mc_dir, NATIVES_CACHE))
+        while path not in stop and path.startswith(self.mc_dir):
+            try:
+                os.rmdir(path)
+            except OSError:
+                return
+            path = os.path.dirname(path)
+
+    def save(self) -> None:
+        with self._lock:
+            if self._data is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
@@ -0,0 +1,733 @@
+"""
+Download engine for RCA Launcher
+Bounded worker pool sharing keep-alive HTTP connections, with SHA-1
+verification computed while each response is streamed to disk.
+Downloads go to a .part file that is resumed with HTTP Range requests and
+only renamed to the final path once it verifies. One engine can serve
+several installs at once: they share its worker pool, and a file requested
+while it is already being downloaded is fetched only once.
+Libraries, assets and runtimes can be served by an ordered list of mirrors;
+a failing or slow host is skipped and the download carries on elsewhere.
+With a shared store (store.py) files are linked from it instead of
+downloaded, and what is downloaded is added to it.
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from spans import span
+
+USER_AGENT      = "RCA-Launcher/1.0"
+DEFAULT_WORKERS = 16
+MAX_WORKERS     = 64
+CHUNK_SIZE      = 64 * 1024
+TIMEOUT         = 30
+RETRIES         = 3
+PART_SUFFIX     = ".part"
+DEFAULT_METADATA_TTL = 600
+PROBE_TIMEOUT   = 5
+
+
+class DownloadError(Exception):
+    pass
+
+
+class OfflineError(DownloadError):
+    """Raised when code running under offline_guard() tries to use the network."""
+
+
+@dataclass
+class Artifact:
+    """A single file to fetch. sha1/size describe the file on disk (after lzma decompression)."""
+    url: str
+    path: str
+    sha1: str | None = None
+    size: int | None = None
+    kind: str = "file"
+    lzma: bool = False
+    executable: bool = False
+    deferred: bool = False
+
+
+def _empty(*_args) -> None:
+    pass
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def clamp_workers(value) -> int:
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_WORKERS
+    return max(1, min(value, MAX_WORKERS))
+
+
+# ---------------------------------------------------------------------------
+# Offline guard
+# ---------------------------------------------------------------------------
+# socket is patched once; the checks only fire in threads that are inside
+# offline_guard(), so background downloads elsewhere are unaffected.
+
+_offline = threading.local()
+_guard_lock = threading.Lock()
+_guard_installed = False
+
+
+def _guarded(real):
+    def wrapper(*args, **kwargs):
+        if getattr(_offline, "depth", 0):
+            raise OfflineError("network access attempted in offline mode")
+        return real(*args, **kwargs)
+    return wrapper
+
+
+def _install_socket_guard() -> None:
+    global _guard_installed
+    with _guard_lock:
+        if _guard_installed:
+            return
+        socket.socket.__init__   = _guarded(socket.socket.__init__)
+        socket.socket.connect    = _guarded(socket.socket.connect)
+        socket.socket.connect_ex = _guarded(socket.socket.connect_ex)
+        socket.getaddrinfo       = _guarded(socket.getaddrinfo)
+        _guard_installed = True
+
+
+class offline_guard:
+    """Context manager: any socket creation, DNS lookup or connect in this thread
+    raises OfflineError instead of touching the network."""
+    def __enter__(self):
+        _install_socket_guard()
+        _offline.depth = getattr(_offline, "depth", 0) + 1
+        return self
+
+    def __exit__(self, *exc):
+        _offline.depth -= 1
+
+
+def carry_offline(fn):
+    """Wrap fn so that, run on a worker thread, it inherits the caller's offline_guard()."""
+    depth = getattr(_offline, "depth", 0)
+    if not depth:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with offline_guard():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Metadata cache
+# ---------------------------------------------------------------------------
+# JSON documents (version manifest, runtime manifests) keyed by URL with their
+# ETag / Last-Modified validators. Within `ttl` seconds an entry is served
+# without any request; after that it is revalidated with a conditional GET.
+
+class MetadataCache:
+    def __init__(self, root: str, ttl: int = DEFAULT_METADATA_TTL):
+        self.root = str(root)
+        self.ttl = ttl
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.root, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str) -> dict | None:
+        try:
+            with span("parse_json", "json", url=url), open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched"] < self.ttl
+
+    def store(self, url: str, body, etag: str | None = None, last_modified: str | None = None) -> None:
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "fetched": time.time(), "body": body}
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def validators(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+# ---------------------------------------------------------------------------
+# Mirrors
+# ---------------------------------------------------------------------------
+# Mirrors serve the same paths as the Mojang hosts they replace, e.g. with
+#   {"libraries": ["http://cache.lan/libraries"]}
+# https://libraries.minecraft.net/a/b.jar is tried as http://cache.lan/libraries/a/b.jar
+# first and on libraries.minecraft.net itself last. Every file is SHA-1 checked,
+# so a part downloaded from one host can be resumed from another.
+
+MIRROR_CATEGORIES = {
+    "libraries": {"kinds": ("library", "native"), "hosts": ("libraries.minecraft.net",)},
+    "assets":    {"kinds": ("asset", "index"),    "hosts": ("resources.download.minecraft.net",)},
+    "runtimes":  {"kinds": ("runtime",),          "hosts": ("piston-data.mojang.com", "launcher.mojang.com")},
+}
+HEALTH_ALPHA     = 0.3               # weight of a new sample in the moving averages
+SLOW_FACTOR      = 3.0               # a host this many times slower than the best one is tried after it
+FAIL_THRESHOLD   = 2                 # consecutive failures before a host is put on cooldown
+COOLDOWN         = 30                # seconds, doubled for each further failure
+MAX_COOLDOWN     = 300
+REFERENCE_BYTES  = 1024 * 1024       # health score: estimated seconds to fetch this much
+MIN_SAMPLE_BYTES = 64 * 1024         # smaller transfers say little about throughput
+PROBE_MAX_BYTES  = 256 * 1024        # largest downloaded file remembered as a category's probe file
+
+# Small files every mirror of a category should serve, probed until a download
+# teaches the set one from this machine's own installs
+DEFAULT_PROBE_URLS = {
+    "libraries": "https://libraries.minecraft.net/com/mojang/logging/1.1.1/logging-1.1.1.jar",
+}
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _ewma(old: float | None, sample: float) -> float:
+    return sample if old is None else old + HEALTH_ALPHA * (sample - old)
+
+
+class HostHealth:
+    """Latency, throughput and failure record of one host."""
+    def __init__(self, data: dict | None = None):
+        data = data or {}
+        self.latency    = data.get("latency")
+        self.throughput = data.get("throughput")
+        self.failures   = data.get("failures", 0)
+        self.misses     = data.get("misses", 0)
+        self.down_until = data.get("down_until", 0)
+
+    def to_dict(self) -> dict:
+        return {"latency": self.latency, "throughput": self.throughput, "failures": self.failures,
+                "misses": self.misses, "down_until": self.down_until}
+
+    def down(self) -> bool:
+        return time.time() < self.down_until
+
+    def score(self) -> float | None:
+        """Estimated seconds to fetch REFERENCE_BYTES; None until the host has been measured."""
+        if self.latency is None:
+            return None
+        score = self.latency
+        if self.throughput:
+            score += REFERENCE_BYTES / self.throughput
+        return score * (1 + self.failures)
+
+
+class MirrorSet:
+    """Ordered mirrors per category plus a health record per host, shared by every
+    engine in a session and persisted to `path` so the next session starts informed."""
+    def __init__(self, mirrors: dict | None = None, path: str | None = None):
+        self.mirrors = {cat: [m.rstrip("/") for m in (mirrors or {}).get(cat) or []]
+                        for cat in MIRROR_CATEGORIES}
+        self.path = str(path) if path else None
+        self._health = {}
+        self._probe_urls = dict(DEFAULT_PROBE_URLS)
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # Files written before probe files were kept hold only the hosts
+                hosts = data["hosts"] if "hosts" in data else data
+                self._health = {h: HostHealth(d) for h, d in hosts.items()}
+                self._probe_urls.update(data.get("probe_urls") or {})
+            except (OSError, ValueError, AttributeError, TypeError):
+                pass
+
+    def __bool__(self) -> bool:
+        return any(self.mirrors.values())
+
+    def hosts(self) -> list[str]:
+        """Every configured mirror followed by the origins they stand in for."""
+        hosts = [m for ms in self.mirrors.values() for m in ms]
+        for cat, spec in MIRROR_CATEGORIES.items():
+            if self.mirrors[cat]:
+                hosts += [f"https://{h}" for h in spec["hosts"]]
+        return list(dict.fromkeys(hosts))
+
+    def health(self, host: str) -> HostHealth:
+        with self._lock:
+            return self._health.setdefault(host, HostHealth())
+
+    def _category(self, art: Artifact) -> str | None:
+        host = urlsplit(art.url).hostname
+        for cat, spec in MIRROR_CATEGORIES.items():
+            if art.kind in spec["kinds"] and host in spec["hosts"]:
+                return cat
+        return None
+
+    def candidates(self, art: Artifact) -> list[tuple[str, str]]:
+        """(host, url) pairs to try for art, best first. Hosts keep their configured
+        order (origin last) unless they are on cooldown or much slower than the best."""
+        cat = self._category(art)
+        if cat is None or not self.mirrors[cat]:
+            return [(_origin(art.url), art.url)]
+        path = art.url[len(_origin(art.url)):]
+        bases = self.mirrors[cat] + [_origin(art.url)]
+        scores = {b: self.health(b).score() for b in bases}
+        known = [s for b, s in scores.items() if s is not None and not self.health(b).down()]
+        best = min(known) if known else None
+
+        def key(item):
+            pos, base = item
+            slow = best is not None and scores[base] is not None and scores[base] > best * SLOW_FACTOR
+            return (self.health(base).down(), slow, pos)
+
+        ordered = sorted(enumerate(bases), key=key)
+        return [(base, base + path) for _, base in ordered]
+
+    def remember_probe(self, art: Artifact) -> None:
+        """Probe art's category with art from now on, if it is small enough."""
+        cat = self._category(art)
+        if cat is None or art.size is None or art.size > PROBE_MAX_BYTES:
+            return
+        with self._lock:
+            if self._probe_urls.get(cat) != art.url:
+                self._probe_urls[cat] = art.url
+                self._dirty = True
+
+    def record_success(self, host: str, latency: float, nbytes: int, seconds: float) -> None:
+        h = self.health(host)
+        with self._lock:
+            h.latency = _ewma(h.latency, latency)
+            if nbytes >= MIN_SAMPLE_BYTES and seconds > 0:
+                h.throughput = _ewma(h.throughput, nbytes / seconds)
+            h.failures = 0
+            h.down_until = 0
+            self._dirty = True
+
+    def record_failure(self, host: str) -> None:
+        h = self.health(host)
+        with self._lock:
+            h.failures += 1
+            if h.failures >= FAIL_THRESHOLD:
+                h.down_until = time.time() + min(COOLDOWN * 2 ** (h.failures - FAIL_THRESHOLD), MAX_COOLDOWN)
+            self._dirty = True
+
+    def record_miss(self, host: str) -> None:
+        """The host answered but does not have the file: not its fault, but worth knowing."""
+        h = self.health(host)
+        with self._lock:
+            h.misses += 1
+            self._dirty = True
+
+    def probe_targets(self) -> list[tuple[str, str]]:
+        """(host, url) pairs a probe requests: each category's probe file on its mirrors
+        and on the host it comes from. Categories with no known probe file are skipped."""
+        targets = []
+        for cat in MIRROR_CATEGORIES:
+            url = self._probe_urls.get(cat)
+            if not self.mirrors[cat] or not url:
+                continue
+            path = url[len(_origin(url)):]
+            targets += [(base, base + path) for base in self.mirrors[cat]]
+            targets.append((_origin(url), url))
+        return targets
+
+    def probe(self, session, hosts: list[str] | None = None) -> dict:
+        """Time the first byte of a small artifact from each host (all of them by default),
+        fetched like a real download, and feed the result into its health record.
+        Returns host -> latency in seconds, or None if it failed or lacks the file."""
+        results = {}
+        for host, url in self.probe_targets():
+            if hosts is not None and host not in hosts:
+                continue
+            start = time.monotonic()
+            try:
+                with session.get(url, stream=True, timeout=PROBE_TIMEOUT, headers={"Range": "bytes=0-0"}) as r:
+                    status = r.status_code
+            except (OSError, OfflineError):
+                status = None
+            if status in (200, 206):
+                latency = time.monotonic() - start
+                h = self.health(host)
+                with self._lock:
+                    h.latency = _ewma(h.latency, latency)
+                    self._dirty = True
+                results[host] = latency
+            elif status in (403, 404, 410):
+                self.record_miss(host)
+                results[host] = None
+            else:
+                self.record_failure(host)
+                results[host] = None
+        return results
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            data = {"hosts": {host: h.to_dict() for host, h in self._health.items()},
+                    "probe_urls": dict(self._probe_urls)}
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class _HostMiss(DownloadError):
+    """The host is up but does not serve the file."""
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class _Flight:
+    """A download in progress that other callers of the same path wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class DownloadEngine:
+    def __init__(self, workers: int = DEFAULT_WORKERS, metadata: MetadataCache | None = None,
+                 mirrors: MirrorSet | None = None, store=None):
+        self.workers = clamp_workers(workers)
+        self.metadata = metadata
+        self.mirrors = mirrors if mirrors else None
+        self.store = store
+        self._http = None
+        self._executor = None
+        self._inflight = {}
+        self._fetched = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self.mirrors is not None:
+            self.mirrors.save()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def session(self):
+        """Shared requests session; one keep-alive pool of `workers` connections per host."""
+        with self._lock:
+            if self._http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(total=RETRIES, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=self.workers, max_retries=retry)
+                s = requests.Session()
+                s.headers["User-Agent"] = USER_AGENT
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                self._http = s
+            return self._http
+
+    def get_json(self, url: str):
+        """GET a JSON document through the metadata cache, if the engine has one.
+        A cached copy is also returned when the server cannot be reached, and
+        under offline_guard() no request is attempted at all."""
+        with span("get_json", "metadata", url=url):
+            cache = self.metadata
+            entry = cache.load(url) if cache is not None else None
+            if entry is not None and cache.fresh(entry):
+                return entry["body"]
+
+            if getattr(_offline, "depth", 0):
+                # Offline: a stale copy is good enough, and without one there is nothing to try
+                if entry is not None:
+                    return entry["body"]
+                raise OfflineError(f"not cached: {url}")
+            headers = cache.validators(entry) if entry is not None else {}
+            try:
+                r = self.session().get(url, timeout=TIMEOUT, headers=headers)
+            except (OSError, OfflineError):
+                if entry is not None:
+                    return entry["body"]
+                raise
+            if r.status_code == 304 and entry is not None:
+                cache.store(url, entry["body"], entry.get("etag"), entry.get("last_modified"))
+                return entry["body"]
+            if r.status_code != 200:
+                raise DownloadError(f"HTTP {r.status_code}: {url}")
+            body = r.json()
+            if cache is not None:
+                cache.store(url, body, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+            return body
+
+    def fetch(self, art: Artifact, on_bytes=None, verify: bool = False) -> int:
+        """Download one artifact, retrying on network or checksum errors. Returns bytes written.
+        With mirrors, each attempt goes to the best host not yet tried for this file.
+        on_bytes(delta) is called from the worker thread as bytes land on disk.
+        verify (used when repairing) hashes shared store objects before linking them,
+        and does not trust files this engine placed earlier."""
+        on_bytes = on_bytes or _empty
+        with self._lock:
+            if not verify and self._already_fetched(art):
+                on_bytes(art.size or 0)
+                return 0
+            flight = self._inflight.get(art.path)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[art.path] = _Flight()
+        if not leader:
+            # Someone else is downloading this very file: wait for their result
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            on_bytes(art.size or 0)
+            return 0
+
+        try:
+            with span("download", "download", file=os.path.basename(art.path), kind=art.kind) as s:
+                if self.store is not None and art.sha1:
+                    written = self._fetch_shared(art, on_bytes, flight, verify)
+                else:
+                    written = self._download(art, on_bytes, flight)
+                s.set(bytes=written)
+            with self._lock:
+                self._fetched[art.path] = (art.sha1, os.stat(art.path).st_mtime_ns)
+            return written
+        except BaseException as e:
+            # Whatever failed (store, stat, decompressor), followers must not count the file as fetched
+            flight.error = flight.error or e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[art.path]
+            flight.done.set()
+
+    def _fetch_shared(self, art: Artifact, on_bytes, flight: _Flight, verify: bool = False) -> int:
+        """Take art from the shared store, or download it and add it to the store while
+        holding the object's lock, so other users wait for it instead of downloading it too.
+        With verify a corrupt object is evicted (or, in a read-only store, bypassed)."""
+        store = self.store
+        if store.link(art.sha1, art.path, art.size, art.executable, verify):
+            on_bytes(art.size or 0)
+            return 0
+        claim = store.claim(art.sha1)
+        if claim is None:
+            # Read-only store, or another process has just added the object
+            if store.link(art.sha1, art.path, art.size, art.executable, verify):
+                on_bytes(art.size or 0)
+                return 0
+            return self._download(art, on_bytes, flight)
+        try:
+            written = self._download(art, on_bytes, flight)
+            if store.publish(art.sha1, art.path, art.executable):
+                store.link(art.sha1, art.path, art.size, art.executable)
+            return written
+        finally:
+            store.release(claim)
+
+    def _download(self, art: Artifact, on_bytes, flight: _Flight) -> int:
+        reported = [0]
+
+        def count(n: int) -> None:
+            reported[0] += n
+            on_bytes(n)
+
+        candidates = self.mirrors.candidates(art) if self.mirrors is not None else [(None, art.url)]
+        tried = set()
+        last_err = None
+        for _ in range(RETRIES + len(candidates) - 1):
+            # Each attempt re-reports what is on disk, so take back the previous one
+            on_bytes(-reported[0])
+            reported[0] = 0
+            if len(tried) == len(candidates):
+                tried.clear()
+            host, url = next(c for c in candidates if c[1] not in tried)
+            try:
+                return self._fetch_once(art, url, host, count)
+            except OfflineError as e:
+                flight.error = e
+                raise
+            except (DownloadError, OSError) as e:
+                last_err = e
+                tried.add(url)
+                if host is not None:
+                    if isinstance(e, _HostMiss):
+                        self.mirrors.record_miss(host)
+                    else:
+                        self.mirrors.record_failure(host)
+                    # Health may have changed mid-install: re-rank before the next attempt
+                    candidates = self.mirrors.candidates(art)
+        flight.error = DownloadError(f"{art.url}: {last_err}")
+        raise flight.error
+
+    def _already_fetched(self, art: Artifact) -> bool:
+        """True if this engine already downloaded art and nothing has touched it since."""
+        entry = self._fetched.get(art.path)
+        if entry is None or entry[0] != art.sha1:
+            return False
+        try:
+            return os.stat(art.path).st_mtime_ns == entry[1]
+        except OSError:
+            return False
+
+    @staticmethod
+    def _resume_state(art: Artifact, part: str) -> tuple[int, "hashlib._Hash"]:
+        """Bytes already in the .part file and the SHA-1 state covering them."""
+        sha1 = hashlib.sha1()
+        # lzma bodies are decompressed on the fly, so their offsets can't be resumed
+        if art.lzma or not os.path.isfile(part):
+            return 0, sha1
+        offset = os.path.getsize(part)
+        if art.size is not None and offset > art.size:
+            return 0, sha1
+        with open(part, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha1.update(chunk)
+        return offset, sha1
+
+    def _fetch_once(self, art: Artifact, url: str, host: str | None, on_bytes) -> int:
+        os.makedirs(os.path.dirname(art.path), exist_ok=True)
+        part = art.path + PART_SUFFIX
+        offset, sha1 = self._resume_state(art, part)
+        written = offset
+        on_bytes(offset)
+
+        if art.size is None or offset < art.size:
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            decomp = lzma.LZMADecompressor() if art.lzma else None
+            start = time.monotonic()
+            # A dead mirror should not hold a download up for the full read timeout
+            timeout = (PROBE_TIMEOUT, TIMEOUT) if host is not None else TIMEOUT
+            with self.session().get(url, stream=True, timeout=timeout, headers=headers) as r:
+                if r.status_code == 416:
+                    os.remove(part)
+                    raise _HostMiss("range not satisfiable, restarting")
+                if r.status_code in (403, 404, 410):
+                    raise _HostMiss(f"HTTP {r.status_code}")
+                if r.status_code not in (200, 206):
+                    raise DownloadError(f"HTTP {r.status_code}")
+                if r.status_code == 200 and offset:
+                    # Server ignored the Range header: start over
+                    on_bytes(-offset)
+                    offset = written = 0
+                    sha1 = hashlib.sha1()
+                length = r.headers.get("Content-Length")
+                expected = None
+                if length and decomp is None and not r.headers.get("Content-Encoding"):
+                    expected = offset + int(length)
+
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        if decomp is not None:
+                            try:
+                                chunk = decomp.decompress(chunk)
+                            except lzma.LZMAError as e:
+                                # A corrupt body is a bad response: retry / fail over like any other
+                                raise DownloadError(f"corrupt lzma body: {e}") from e
+                        sha1.update(chunk)
+                        f.write(chunk)
+                        written += len(chunk)
+                        on_bytes(len(chunk))
+                if expected is not None and written != expected:
+                    raise DownloadError(f"connection closed early ({written}/{expected} bytes)")
+            sample = (r.elapsed.total_seconds(), written - offset, time.monotonic() - start)
+        else:
+            sample = None
+
+        digest = sha1.hexdigest()
+        if (art.sha1 and digest != art.sha1) or (art.size is not None and written != art.size):
+            os.remove(part)
+            raise DownloadError(f"checksum mismatch ({digest}, {written} bytes)")
+        if host is not None and sample is not None:
+            self.mirrors.record_success(host, *sample)
+            self.mirrors.remember_probe(art)
+
+        os.replace(part, art.path)
+        if art.executable and os.name != "nt":
+            os.chmod(art.path, os.stat(art.path).st_mode | 0o111)
+        return written
+
+    def fetch_all(self, artifacts: list[Artifact], callback: dict | None = None, on_done=None,
+                  verify: bool = False) -> int:
+        """Download all artifacts on the worker pool, reporting through a _make_callback dict.
+        Besides setStatus/setProgress/setMax (file counts) the dict may hold
+        setBytes(done, total), called about four times a second with byte counts.
+        on_done(artifact) is called from the calling thread as each one completes.
+        verify is passed on to fetch()."""
+        callback = callback or {}
+        set_status   = callback.get("setStatus", _empty)
+        set_progress = callback.get("setProgress", _empty)
+        set_max      = callback.get("setMax", _empty)
+        set_bytes    = callback.get("setBytes", _empty)
+
+        set_max(len(artifacts))
+        if not artifacts:
+            return 0
+
+        expected_bytes = sum(a.size or 0 for a in artifacts)
+        received = [0]
+        lock = threading.Lock()
+
+        def on_bytes(n: int) -> None:
+            with lock:
+                received[0] += n
+
+        done = 0
+        total_bytes = 0
+        pool = self._pool()
+        fetch = carry_offline(self.fetch)
+        futures = {pool.submit(fetch, a, on_bytes, verify): a for a in artifacts}
+        pending = set(futures)
+        try:
+            while pending:
+                finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    total_bytes += fut.result()
+                    done += 1
+                    if on_done is not None:
+                        on_done(futures[fut])
+                    set_status(os.path.basename(futures[fut].path))
+                    set_progress(done)
+                set_bytes(received[0], max(expected_bytes, received[0]))
+        finally:
+            # The pool may be shared with other installs: only drop our own queued work
+            for fut in pending:
+                fut.cancel()
+            wait(pending)
+        return total_bytes
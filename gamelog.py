@@ -0,0 +1,213 @@
+"""
+Game output capture for RCA Launcher
+One reader thread per stream (stdout, stderr) drains the game's pipes as fast
+as it writes, so a chatty game never blocks on a full pipe. Lines go into a
+fixed-size ring buffer for the running menu's tail view and onto a queue for
+a writer thread that appends them to a per-session log, rotated by size into
+gzip segments. Readers never touch the disk: if the writer falls behind, the
+queue is bounded and lines are dropped from the file (counted, and marked
+in the log where they are missing), never from the ring.
+"""
+
+import collections
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+
+RING_LINES     = 2000         # lines kept in memory per game
+MAX_LINE       = 4096         # longer lines are split (bounds the ring's memory)
+QUEUE_LINES    = 20000        # lines waiting for the disk writer before dropping
+ROTATE_BYTES   = 8 << 20      # size of a log segment before it is compressed
+KEEP_SEGMENTS  = 30           # compressed segments kept in the log folder
+LOG_SUFFIX     = ".log"
+GZIP_SUFFIX    = ".log.gz"
+DROPPED_MARKER = "[{n} lines dropped]\n"
+
+_CLOSE = object()
+
+
+def _compress(path: str) -> None:
+    with open(path, "rb") as src, gzip.open(path[:-len(LOG_SUFFIX)] + GZIP_SUFFIX, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+
+
+def prune_logs(log_dir: str, keep: int = KEEP_SEGMENTS) -> None:
+    """Delete the oldest compressed segments beyond keep."""
+    try:
+        names = [n for n in os.listdir(log_dir) if n.endswith(GZIP_SUFFIX)]
+    except OSError:
+        return
+    paths = sorted((os.path.join(log_dir, n) for n in names), key=os.path.getmtime)
+    for path in paths[:max(len(paths) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class OutputCapture:
+    """Capture of a game's stdout and stderr (both opened with subprocess.PIPE).
+    Listeners are called on the reader threads with (stream, line) for every line,
+    close listeners once, with no arguments, when both streams have ended."""
+
+    def __init__(self, proc, log_dir: str, name: str, ring_lines: int = RING_LINES):
+        self.proc = proc
+        self.log_dir = str(log_dir)
+        self.base = os.path.join(self.log_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{proc.pid}")
+        self.path = self.base + LOG_SUFFIX
+        self.dropped = 0
+        self._gap = 0                 # lines dropped since the last one queued
+        self._ring = collections.deque(maxlen=ring_lines)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._queue = queue.Queue(QUEUE_LINES)
+        self._listeners = []
+        self._close_listeners = []
+        self._readers = []
+        self._open = 0
+        self._writer = None
+
+    def add_listener(self, fn) -> None:
+        self._listeners.append(fn)
+
+    def add_close_listener(self, fn) -> None:
+        self._close_listeners.append(fn)
+
+    def start(self) -> "OutputCapture":
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._writer = threading.Thread(target=self._write, daemon=True, name="game-log-writer")
+        self._writer.start()
+        self._readers = [threading.Thread(target=self._read, args=(stream_name, stream), daemon=True,
+                                          name=f"game-{stream_name}")
+                         for stream_name, stream in (("stdout", self.proc.stdout), ("stderr", self.proc.stderr))
+                         if stream is not None]
+        self._open = len(self._readers)
+        if not self._readers:
+            self._closed()
+        for reader in self._readers:
+            reader.start()
+        return self
+
+    # -- Readers -----------------------------------------------------------
+
+    def _read(self, stream_name: str, stream) -> None:
+        try:
+            while True:
+                raw = stream.readline(MAX_LINE)
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                with self._cond:
+                    self._seq += 1
+                    self._ring.append((self._seq, stream_name, line))
+                    self._cond.notify_all()
+                with self._cond:
+                    gap, self._gap = self._gap, 0
+                try:
+                    # The writer marks the gap in front of the next line it gets
+                    self._queue.put_nowait((stream_name, line, gap))
+                except queue.Full:
+                    with self._cond:
+                        self._gap += gap + 1
+                        self.dropped += 1
+                for fn in self._listeners:
+                    try:
+                        fn(stream_name, line)
+                    except Exception:
+                        pass
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+            with self._cond:
+                self._open -= 1
+                last = not self._open
+                self._cond.notify_all()
+            if last:
+                self._closed()
+
+    def _closed(self) -> None:
+        self._queue.put(_CLOSE)
+        for fn in self._close_listeners:
+            try:
+                fn()
+            except Exception:
+                pass
+
+    # -- Writer ------------------------------------------------------------
+
+    def _write(self) -> None:
+        segment = 0
+        try:
+            f = open(self.path, "w", encoding="utf-8")
+        except OSError:
+            f = None
+        # Always drain the queue to the end, even once the log can no longer be written
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            if f is None:
+                continue
+            stream_name, line, gap = item
+            try:
+                if gap:
+                    f.write(DROPPED_MARKER.format(n=gap))
+                f.write(f"[stderr] {line}\n" if stream_name == "stderr" else line + "\n")
+                if self._queue.empty():
+                    f.flush()
+                if f.tell() >= ROTATE_BYTES:
+                    f.close()
+                    segment += 1
+                    rotated = f"{self.base}.{segment}{LOG_SUFFIX}"
+                    os.replace(self.path, rotated)
+                    _compress(rotated)
+                    prune_logs(self.log_dir)
+                    f = open(self.path, "w", encoding="utf-8")
+            except OSError:
+                f.close()
+                f = None
+        if f is None:
+            return
+        # The session is over: mark lines dropped at the very end, and compress what is left too
+        try:
+            if self._gap:
+                f.write(DROPPED_MARKER.format(n=self._gap))
+        except OSError:
+            pass
+        f.close()
+        try:
+            _compress(self.path)
+            prune_logs(self.log_dir)
+        except OSError:
+            pass
+
+    # -- Views -------------------------------------------------------------
+
+    def tail(self, n: int) -> list[tuple[int, str, str]]:
+        """The last n lines as (sequence, stream, line)."""
+        with self._cond:
+            return list(self._ring)[-n:]
+
+    def since(self, seq: int, timeout: float) -> list[tuple[int, str, str]]:
+        """Lines after sequence number seq, waiting up to timeout for the first one."""
+        with self._cond:
+            if self._seq <= seq and self._open:
+                self._cond.wait(timeout)
+            return [entry for entry in self._ring if entry[0] > seq]
+
+    def finished(self) -> bool:
+        """Both streams have reached EOF (the game has exited)."""
+        with self._cond:
+            return not self._open
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for the readers and for the log to be written and compressed."""
+        for reader in self._readers:
+            reader.join(timeout)
+        if self._writer is not None:
+            self._writer.join(timeout)
@@ -0,0 +1,1120 @@
+"""
+Install pipeline for RCA Launcher
+Turns version JSONs and the Java runtime manifest into lists of artifacts
+and downloads the missing ones through the DownloadEngine.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import shutil
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from minecraft_launcher_lib.natives import extract_natives_file, get_natives
+
+from downloader import PART_SUFFIX, Artifact, DownloadEngine, DownloadError, carry_offline, format_bytes
+from spans import span
+
+VERSION_MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+JVM_MANIFEST_URL     = "https://launchermeta.mojang.com/v1/products/java-runtime/2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json"
+ASSETS_URL           = "https://resources.download.minecraft.net"
+LIBRARIES_URL        = "https://libraries.minecraft.net"
+
+# Assets the game can start without: they are fetched after the JVM is spawned
+DEFERRED_ASSET_PREFIXES = ("minecraft/sounds/", "minecraft/lang/", "minecraft/resourcepacks/")
+BASE_LANGUAGE           = "en_us"
+
+
+class InstallError(Exception):
+    pass
+
+
+def sha1_file(path: str) -> str:
+    h = hashlib.sha1()
+    with span("sha1", "hash", file=os.path.basename(path)), open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_json(path: str):
+    with span("parse_json", "json", file=os.path.basename(path)), open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _set_status(callback: dict | None, msg: str) -> None:
+    (callback or {}).get("setStatus", lambda _: None)(msg)
+
+
+# ---------------------------------------------------------------------------
+# Hash index
+# ---------------------------------------------------------------------------
+# Maps a file to its known SHA-1 as long as its (size, mtime_ns, inode)
+# signature is unchanged, so verification only re-hashes files that moved.
+
+HASH_INDEX_FORMAT = 1
+
+
+class HashIndex:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            entries = {}
+            try:
+                raw = _read_json(self.path)
+                if raw.get("format") == HASH_INDEX_FORMAT:
+                    entries = raw.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def lookup(self, path: str, st: os.stat_result | None = None) -> str | None:
+        """Known SHA-1 for path if its stat signature still matches, else None."""
+        with self._lock:
+            entry = self._load().get(os.path.abspath(path))
+        if entry is None:
+            return None
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+        return entry[3] if entry[:3] == self._signature(st) else None
+
+    def paths(self) -> list[str]:
+        """Absolute paths of every file whose hash is known."""
+        with self._lock:
+            return list(self._load())
+
+    def sha1(self, path: str, st: os.stat_result | None = None) -> str:
+        """SHA-1 of path, hashing only when the stat signature changed."""
+        if st is None:
+            st = os.stat(path)
+        digest = self.lookup(path, st)
+        if digest is None:
+            digest = sha1_file(path)
+            self._put(path, st, digest)
+        return digest
+
+    def record(self, path: str, sha1: str) -> None:
+        """Remember a hash that was computed elsewhere (e.g. while downloading)."""
+        try:
+            self._put(path, os.stat(path), sha1)
+        except OSError:
+            pass
+
+    def _put(self, path: str, st: os.stat_result, sha1: str) -> None:
+        with self._lock:
+            self._load()[os.path.abspath(path)] = self._signature(st) + [sha1]
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"format": HASH_INDEX_FORMAT, "entries": self._entries}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+
+# ---------------------------------------------------------------------------
+# Install journal
+# ---------------------------------------------------------------------------
+# Write-ahead log of artifacts an unfinished install has already completed:
+# one JSON line per verified file, appended as soon as it is in place. An
+# interrupted install picks up from here without re-hashing what it fetched.
+
+class InstallJournal:
+    def __init__(self, path: str, root: str):
+        self.path = str(path)
+        self.root = str(root)
+        self._file = None
+        self._entries = None
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            rel, size, mtime_ns, sha1 = json.loads(line)
+                        except ValueError:
+                            break  # torn last line from a crash
+                        entries[rel] = (size, mtime_ns, sha1)
+            except OSError:
+                pass
+            self._entries = entries
+        return self._entries
+
+    def completed(self, art: Artifact) -> bool:
+        """True if the journal recorded art and the file is still exactly as it was written."""
+        entry = self._load().get(os.path.relpath(art.path, self.root))
+        if entry is None or entry[2] != art.sha1:
+            return False
+        try:
+            st = os.stat(art.path)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == entry[:2]
+
+    def record(self, art: Artifact) -> None:
+        st = os.stat(art.path)
+        rel = os.path.relpath(art.path, self.root)
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps([rel, st.st_size, st.st_mtime_ns, art.sha1]) + "\n")
+        self._file.flush()
+        self._load()[rel] = (st.st_size, st.st_mtime_ns, art.sha1)
+
+    def close(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Drop the journal once the install it describes has finished."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def journal_path(mc_dir: str, version_id: str) -> str:
+    return os.path.join(mc_dir, "versions", version_id, f"{version_id}.journal")
+
+
+# ---------------------------------------------------------------------------
+# Version JSON
+# ---------------------------------------------------------------------------
+
+def version_json_path(mc_dir: str, version_id: str) -> str:
+    return os.path.join(mc_dir, "versions", version_id, f"{version_id}.json")
+
+
+def fetch_version_json(version_id: str, mc_dir: str, engine: DownloadEngine, download: bool = True) -> dict:
+    """Return the raw version JSON, downloading it from the manifest if missing.
+    With download=False a missing JSON is read through the engine's metadata cache
+    instead and nothing is written to mc_dir."""
+    path = version_json_path(mc_dir, version_id)
+    if not os.path.isfile(path):
+        manifest = engine.get_json(VERSION_MANIFEST_URL)
+        entry = next((v for v in manifest["versions"] if v["id"] == version_id), None)
+        if entry is None:
+            raise InstallError(f"Version not found: {version_id}")
+        if not download:
+            return engine.get_json(entry["url"])
+        engine.fetch(Artifact(entry["url"], path, entry.get("sha1"), kind="version"))
+    return _read_json(path)
+
+
+def inherit_version(data: dict, parent: dict) -> dict:
+    """Merge a child version JSON (e.g. a mod loader) into the parent it inheritsFrom.
+    Libraries the child lists win over the parent's of the same name minus its last
+    part (the version, or the classifier of a native entry); other lists
+    are prepended, nested lists (arguments) appended, and scalar keys overridden."""
+    merged = dict(parent)
+    own = {lib["name"].rsplit(":", 1)[0] for lib in data.get("libraries", [])}
+    merged["libraries"] = list(data.get("libraries", [])) + \
+        [lib for lib in parent.get("libraries", []) if lib["name"].rsplit(":", 1)[0] not in own]
+    for key, value in data.items():
+        if key == "libraries":
+            continue
+        base = parent.get(key)
+        if isinstance(value, list) and isinstance(base, list):
+            merged[key] = value + base
+        elif isinstance(value, dict) and isinstance(base, dict):
+            merged[key] = {**base, **{k: base[k] + v for k, v in value.items()
+                                      if isinstance(v, list) and isinstance(base.get(k), list)}}
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_version_data(version_id: str, mc_dir: str, engine: DownloadEngine, download: bool = True) -> dict:
+    data = fetch_version_json(version_id, mc_dir, engine, download)
+    if "inheritsFrom" in data:
+        data = inherit_version(data, fetch_version_json(data["inheritsFrom"], mc_dir, engine, download))
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+# Library rules of a version JSON, evaluated the way the official launcher does
+# for a player with no optional features (demo, custom resolution, quick play).
+
+_OS_NAMES = {"Windows": "windows", "Darwin": "osx", "Linux": "linux"}
+
+
+def _os_version() -> str:
+    """What Java reports as os.version."""
+    if platform.system() == "Windows":
+        ver = sys.getwindowsversion()
+        return f"{ver.major}.{ver.minor}"
+    if platform.system() == "Darwin":
+        return platform.mac_ver()[0]
+    return platform.release()
+
+
+def _rule_matches(rule: dict) -> bool:
+    for key, value in rule.get("os", {}).items():
+        if key == "name" and value != _OS_NAMES.get(platform.system()):
+            return False
+        if key == "arch" and value == "x86" and platform.architecture()[0] != "32bit":
+            return False
+        if key == "version" and not re.match(value, _os_version()):
+            return False
+    # Feature rules only ever enable extras this launcher does not use
+    return not rule.get("features")
+
+
+def rules_allow(rules: list[dict]) -> bool:
+    """True if every rule lets the entry through on this system."""
+    for rule in rules:
+        allow = rule.get("action") == "allow"
+        if _rule_matches(rule) != allow:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Artifacts
+# ---------------------------------------------------------------------------
+
+def _maven_path(name: str) -> str:
+    group, artifact, version = name.split(":")[0:3]
+    ext = "jar"
+    if "@" in version:
+        version, ext = version.split("@")
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}.{ext}"])
+
+
+def library_artifacts(data: dict, mc_dir: str) -> tuple[list[Artifact], list[tuple[str, dict]]]:
+    """Libraries allowed on this system, plus (native jar, extract rules) pairs to unpack."""
+    lib_dir = os.path.join(mc_dir, "libraries")
+    artifacts = []
+    natives = []
+
+    for lib in data.get("libraries", []):
+        if "rules" in lib and not rules_allow(lib["rules"]):
+            continue
+        downloads = lib.get("downloads")
+
+        if downloads is None:
+            # Maven-style entry (no hashes), e.g. mod loaders
+            try:
+                rel = _maven_path(lib["name"])
+            except ValueError:
+                continue
+            base = lib.get("url", LIBRARIES_URL).rstrip("/")
+            artifacts.append(Artifact(f"{base}/{rel}", os.path.join(lib_dir, rel), kind="library"))
+            continue
+
+        art = downloads.get("artifact")
+        if art and art.get("url") and "path" in art:
+            artifacts.append(Artifact(art["url"], os.path.join(lib_dir, art["path"]),
+                                      art.get("sha1"), art.get("size"), kind="library"))
+
+        native = get_natives(lib)
+        classifier = downloads.get("classifiers", {}).get(native) if native else None
+        if classifier:
+            rel = classifier.get("path") or _maven_path(lib["name"]).replace(".jar", f"-{native}.jar")
+            path = os.path.join(lib_dir, rel)
+            artifacts.append(Artifact(classifier["url"], path, classifier.get("sha1"),
+                                      classifier.get("size"), kind="native"))
+            natives.append((path, lib.get("extract", {"exclude": []})))
+
+    return artifacts, natives
+
+
+def game_language(mc_dir: str) -> str:
+    """Language selected in the game's options.txt (en_us if unset)."""
+    try:
+        with open(os.path.join(mc_dir, "options.txt"), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("lang:"):
+                    return line[5:].strip().lower() or BASE_LANGUAGE
+    except OSError:
+        pass
+    return BASE_LANGUAGE
+
+
+def is_deferred_asset(name: str, languages: set[str]) -> bool:
+    """Sounds, music, optional resource packs and languages other than `languages`."""
+    if not name.startswith(DEFERRED_ASSET_PREFIXES):
+        return False
+    if name.startswith("minecraft/lang/"):
+        return os.path.splitext(os.path.basename(name))[0] not in languages
+    return True
+
+
+def asset_artifacts(data: dict, mc_dir: str, engine: DownloadEngine, index: HashIndex | None = None,
+                    languages: set[str] = frozenset(), download: bool = True) -> list[Artifact]:
+    """Asset index plus every object it references (the index is fetched if missing,
+    or with download=False read through the engine's metadata cache).
+    Objects only needed after the title screen are marked deferred."""
+    if "assetIndex" not in data:
+        return []
+    idx = data["assetIndex"]
+    index_path = os.path.join(mc_dir, "assets", "indexes", f"{data['assets']}.json")
+    index_art = Artifact(idx["url"], index_path, idx.get("sha1"), idx.get("size"), kind="index")
+    if not _needs_download(index_art, index):
+        asset_index = _read_json(index_path)
+    elif download:
+        engine.fetch(index_art)
+        asset_index = _read_json(index_path)
+    else:
+        asset_index = engine.get_json(idx["url"])
+
+    languages = {BASE_LANGUAGE, *languages}
+    objects_dir = os.path.join(mc_dir, "assets", "objects")
+    objects = {}
+    for name, obj in asset_index["objects"].items():
+        h = obj["hash"]
+        deferred = is_deferred_asset(name, languages)
+        if h in objects:
+            # Same object under a critical name: fetch it up front
+            objects[h].deferred = objects[h].deferred and deferred
+            continue
+        objects[h] = Artifact(f"{ASSETS_URL}/{h[:2]}/{h}", os.path.join(objects_dir, h[:2], h),
+                              h, obj.get("size"), kind="asset", deferred=deferred)
+    return [index_art] + list(objects.values())
+
+
+def client_artifacts(data: dict, mc_dir: str) -> list[Artifact]:
+    artifacts = []
+    if "downloads" in data and "client" in data["downloads"]:
+        c = data["downloads"]["client"]
+        path = os.path.join(mc_dir, "versions", data["id"], f"{data['id']}.jar")
+        artifacts.append(Artifact(c["url"], path, c.get("sha1"), c.get("size"), kind="client"))
+    logging_cfg = data.get("logging", {}).get("client", {}).get("file")
+    if logging_cfg:
+        path = os.path.join(mc_dir, "assets", "log_configs", logging_cfg["id"])
+        artifacts.append(Artifact(logging_cfg["url"], path, logging_cfg.get("sha1"),
+                                  logging_cfg.get("size"), kind="logging"))
+    return artifacts
+
+
+def _needs_download(art: Artifact, index: HashIndex | None = None) -> bool:
+    try:
+        st = os.stat(art.path)
+    except OSError:
+        return True
+    if art.size is not None and st.st_size != art.size:
+        return True
+    if art.sha1 is None:
+        return False
+    digest = index.sha1(art.path, st) if index is not None else sha1_file(art.path)
+    return digest != art.sha1
+
+
+def dedupe(artifacts: list[Artifact]) -> list[Artifact]:
+    seen = {}
+    for a in artifacts:
+        seen.setdefault(a.path, a)
+    return list(seen.values())
+
+
+def missing_artifacts(artifacts: list[Artifact], workers: int, index: HashIndex | None = None) -> list[Artifact]:
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        flags = list(pool.map(lambda a: _needs_download(a, index), artifacts))
+    return [a for a, missing in zip(artifacts, flags) if missing]
+
+
+def _fetch_missing(artifacts: list[Artifact], engine: DownloadEngine, callback: dict | None,
+                   index: HashIndex | None, journal: InstallJournal | None = None, assessed: bool = False) -> None:
+    """Fetch the artifacts that are not on disk intact. With assessed=True they were just
+    classified by assess_plan and are all fetched without being checked again."""
+    pending = []
+    for a in artifacts:
+        if assessed:
+            # Unless another install has put it in place since (a stat-only check)
+            if index is None or not a.sha1 or index.lookup(a.path) != a.sha1:
+                pending.append(a)
+        elif journal is not None and journal.completed(a):
+            if index is not None and a.sha1:
+                index.record(a.path, a.sha1)
+        else:
+            pending.append(a)
+
+    def done(a: Artifact) -> None:
+        if journal is not None:
+            journal.record(a)
+        if index is not None and a.sha1:
+            index.record(a.path, a.sha1)
+
+    missing = pending if assessed else missing_artifacts(pending, engine.workers, index)
+    engine.fetch_all(missing, callback, on_done=done)
+
+
+# ---------------------------------------------------------------------------
+# Install
+# ---------------------------------------------------------------------------
+# An install is planned first, then run in two stages: the critical set
+# (client, libraries, natives, textures, base language) that the game needs
+# to start, and the deferred assets that can stream in while it runs.
+
+@dataclass
+class InstallPlan:
+    version_id: str
+    mc_dir: str
+    data: dict
+    artifacts: list[Artifact]
+    natives: list[tuple[str, dict]]
+    # Missing or stale artifacts found by assess_plan; None until it has run
+    pending: list[Artifact] | None = None
+    # Set by extract_natives when the cache folder was busy and a new one was used
+    natives_folder: str | None = None
+
+    def critical(self) -> list[Artifact]:
+        return [a for a in self.artifacts if not a.deferred]
+
+    def deferred(self) -> list[Artifact]:
+        return [a for a in self.artifacts if a.deferred]
+
+    def natives_dir(self) -> str:
+        return self.natives_folder or natives_cache_dir(self.mc_dir, self.artifacts)
+
+
+def plan_version(version_id: str, mc_dir: str, engine: DownloadEngine, index: HashIndex | None = None,
+                 languages: set[str] = frozenset(), download: bool = True) -> InstallPlan:
+    """Every artifact a version uses, classified critical / deferred. The version JSON and
+    asset index come from mc_dir when they are there; otherwise they are downloaded, or
+    with download=False (a dry run) read through the metadata cache."""
+    with span("plan", version=version_id):
+        data = load_version_data(version_id, mc_dir, engine, download)
+        libs, natives = library_artifacts(data, mc_dir)
+        assets = asset_artifacts(data, mc_dir, engine, index, languages, download)
+        artifacts = dedupe(libs + client_artifacts(data, mc_dir) + assets)
+    return InstallPlan(version_id, mc_dir, data, artifacts, natives)
+
+
+def _fetch_stage(plan: InstallPlan, artifacts: list[Artifact], engine: DownloadEngine,
+                 callback: dict | None, index: HashIndex | None) -> InstallJournal:
+    journal = InstallJournal(journal_path(plan.mc_dir, plan.version_id), plan.mc_dir)
+    if plan.pending is not None:
+        # Already classified against the disk: fetch what assess_plan found, hash nothing twice
+        pending = {a.path for a in plan.pending}
+        artifacts = [a for a in artifacts if a.path in pending]
+    try:
+        with span("fetch", version=plan.version_id, files=len(artifacts)):
+            _fetch_missing(artifacts, engine, callback, index, journal, assessed=plan.pending is not None)
+    finally:
+        journal.close()
+        if index is not None:
+            index.save()
+    return journal
+
+
+def install_critical(plan: InstallPlan, engine: DownloadEngine, callback: dict | None = None,
+                     index: HashIndex | None = None) -> None:
+    """Fetch / verify what the game needs to start and unpack the natives."""
+    _set_status(callback, "Verify")
+    drop_receipt(plan.version_id, plan.mc_dir)
+    _fetch_stage(plan, plan.critical(), engine, callback, index)
+    with span("natives"):
+        extract_natives(plan)
+
+
+def install_deferred(plan: InstallPlan, engine: DownloadEngine, callback: dict | None = None,
+                     index: HashIndex | None = None) -> None:
+    """Fetch the remaining assets and write the receipt that completes the install."""
+    journal = _fetch_stage(plan, plan.deferred(), engine, callback, index)
+
+    _write_plan_receipt(plan)
+    journal.discard()
+    _set_status(callback, "Installation complete")
+
+
+def _write_plan_receipt(plan: InstallPlan) -> None:
+    mc_dir = plan.mc_dir
+    natives_dir = plan.natives_dir()
+    json_paths = [version_json_path(mc_dir, plan.version_id)]
+    if plan.data.get("inheritsFrom"):
+        json_paths.append(version_json_path(mc_dir, plan.data["inheritsFrom"]))
+    # The natives folder may be shared with other versions: only its marker is tracked
+    write_receipt(plan.version_id, mc_dir, plan.artifacts,
+                  json_paths + [os.path.join(natives_dir, NATIVES_COMPLETE)], natives_dir)
+
+
+# ---------------------------------------------------------------------------
+# Natives cache
+# ---------------------------------------------------------------------------
+# Native libraries are unpacked once into <mc_dir>/natives/<key>, where the key
+# is derived from the hashes of the native jars a version uses. Versions built
+# on the same LWJGL share the folder, the launch command points
+# -Djava.library.path (and LWJGL's own extract path) at it, and a repeat launch
+# does no extraction at all.
+
+NATIVES_CACHE    = "natives"
+NATIVES_COMPLETE = ".complete"
+
+
+def _is_native_jar(art: Artifact) -> bool:
+    # Old versions list natives as classifiers we unpack; 1.19+ ship them as
+    # *-natives-<os>.jar libraries that LWJGL unpacks itself at startup
+    return art.kind == "native" or "-natives-" in os.path.basename(art.path)
+
+
+def natives_key(artifacts: list[Artifact]) -> str:
+    jars = sorted(a.sha1 or f"{os.path.basename(a.path)}:{a.size}" for a in artifacts if _is_native_jar(a))
+    return hashlib.sha1("\n".join(jars).encode("utf-8")).hexdigest()[:20]
+
+
+def natives_cache_dir(mc_dir: str, artifacts: list[Artifact]) -> str:
+    return os.path.join(mc_dir, NATIVES_CACHE, natives_key(artifacts))
+
+
+def extract_natives(plan: InstallPlan, force: bool = False) -> str:
+    """Unpack the plan's native jars into the shared cache folder, unless another
+    install already did (force=True unpacks them again). Returns the folder."""
+    target = plan.natives_dir()
+    marker = os.path.join(target, NATIVES_COMPLETE)
+    if os.path.isfile(marker) and not force:
+        return target
+
+    # Always unpack next to it and rename, so a running game never sees half a folder
+    base = f"{target}.{os.getpid()}.{threading.get_ident()}"
+    tmp = base + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for jar, extract in plan.natives:
+        extract_natives_file(jar, tmp, extract)
+    open(os.path.join(tmp, NATIVES_COMPLETE), "w").close()
+    try:
+        os.rename(tmp, target)
+        return target
+    except OSError:
+        if not os.path.isdir(target):
+            raise
+    if os.path.isfile(marker) and not force:
+        # Someone else finished first
+        shutil.rmtree(tmp, ignore_errors=True)
+        return target
+
+    # Swap out the stale or incomplete folder
+    old = base + ".old.tmp"
+    try:
+        os.rename(target, old)
+    except OSError:
+        # Busy (a running game has its libraries loaded, on Windows): stop trusting it and use a new folder
+        try:
+            os.remove(marker)
+        except OSError:
+            pass
+        n = 1
+        while os.path.lexists(f"{target}-{n}"):
+            n += 1
+        target = f"{target}-{n}"
+        os.rename(tmp, target)
+        plan.natives_folder = target
+        return target
+    os.rename(tmp, target)
+    shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def install_version(version_id: str, mc_dir: str, engine: DownloadEngine, callback: dict | None = None,
+                    index: HashIndex | None = None) -> list[Artifact]:
+    """Install or repair a version and write its receipt. Returns every artifact the version uses."""
+    _set_status(callback, version_id)
+    plan = plan_version(version_id, mc_dir, engine, index)
+    check_disk_space(assess_plan(plan, engine.workers, index))
+    install_critical(plan, engine, callback, index)
+    install_deferred(plan, engine, callback, index)
+    return plan.artifacts
+
+
+# ---------------------------------------------------------------------------
+# Install queue
+# ---------------------------------------------------------------------------
+# Runs several version installs at once on one DownloadEngine. Their
+# downloads share the engine's worker pool, and a library or asset needed by
+# more than one version is fetched once (see DownloadEngine.fetch).
+
+class InstallQueue:
+    def __init__(self, mc_dir: str, engine: DownloadEngine, index: HashIndex | None = None, jobs: int = 4):
+        self.mc_dir = mc_dir
+        self.engine = engine
+        self.index = index
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="install")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, version_id: str, callback: dict | None = None):
+        """Queue an install; submitting a version that is already queued returns its future."""
+        with self._lock:
+            fut = self._jobs.get(version_id)
+            if fut is None:
+                fut = self._pool.submit(carry_offline(install_version), version_id, self.mc_dir, self.engine, callback, self.index)
+                self._jobs[version_id] = fut
+            return fut
+
+    def submit_runtime(self, component: str, callback: dict | None = None):
+        """Queue a Java runtime install; several versions needing it share one job."""
+        with self._lock:
+            key = f"runtime:{component}"
+            fut = self._jobs.get(key)
+            if fut is None:
+                fut = self._pool.submit(carry_offline(install_runtime), component, self.mc_dir, self.engine, callback, self.index)
+                self._jobs[key] = fut
+            return fut
+
+    def results(self) -> dict[str, Exception | None]:
+        """Wait for every queued install: version (or "runtime:<component>") -> None on success,
+        else the exception."""
+        with self._lock:
+            jobs = dict(self._jobs)
+        return {version_id: fut.exception() for version_id, fut in jobs.items()}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Dry run
+# ---------------------------------------------------------------------------
+# Classifies a plan's artifacts against the disk without downloading
+# anything: the version JSON and asset index are read from disk when present.
+
+@dataclass
+class PlanReport:
+    version_id: str
+    missing: list[Artifact]
+    stale: list[Artifact]
+    present: list[Artifact]
+    download_bytes: int     # declared bytes still to fetch (minus resumable .part data)
+    unknown_sizes: int      # artifacts to fetch that declare no size
+    disk_free: int
+
+    @property
+    def to_fetch(self) -> list[Artifact]:
+        return self.missing + self.stale
+
+    @property
+    def disk_needed(self) -> int:
+        # A stale file is only replaced once its .part verifies, so both coexist
+        return self.download_bytes
+
+    def fits(self) -> bool:
+        return self.disk_needed <= self.disk_free
+
+    def to_dict(self) -> dict:
+        kinds = {}
+        for state in ("missing", "stale", "present"):
+            for a in getattr(self, state):
+                entry = kinds.setdefault(a.kind, {"missing": 0, "stale": 0, "present": 0, "bytes": 0})
+                entry[state] += 1
+                if state != "present":
+                    entry["bytes"] += a.size or 0
+        return {
+            "version": self.version_id,
+            "missing": len(self.missing),
+            "stale": len(self.stale),
+            "present": len(self.present),
+            "download_bytes": self.download_bytes,
+            "deferred_bytes": sum(a.size or 0 for a in self.to_fetch if a.deferred),
+            "unknown_sizes": self.unknown_sizes,
+            "disk_needed": self.disk_needed,
+            "disk_free": self.disk_free,
+            "fits": self.fits(),
+            "kinds": kinds,
+        }
+
+
+def _artifact_state(art: Artifact, index: HashIndex | None, journal: InstallJournal | None) -> str:
+    if journal is not None and journal.completed(art):
+        if index is not None and art.sha1:
+            index.record(art.path, art.sha1)
+        return "present"
+    if not os.path.exists(art.path):
+        return "missing"
+    return "stale" if _needs_download(art, index) else "present"
+
+
+def _partial_bytes(art: Artifact) -> int:
+    if art.lzma:
+        return 0
+    try:
+        return min(os.path.getsize(art.path + PART_SUFFIX), art.size or 0)
+    except OSError:
+        return 0
+
+
+def assess_plan(plan: InstallPlan, workers: int, index: HashIndex | None = None) -> PlanReport:
+    """Missing / stale / present artifacts of a plan and the bytes and disk space they need.
+    The plan remembers what is to fetch, so installing it does not check every file again."""
+    journal = InstallJournal(journal_path(plan.mc_dir, plan.version_id), plan.mc_dir)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        states = list(pool.map(lambda a: _artifact_state(a, index, journal), plan.artifacts))
+
+    groups = {"missing": [], "stale": [], "present": []}
+    for art, state in zip(plan.artifacts, states):
+        groups[state].append(art)
+    to_fetch = groups["missing"] + groups["stale"]
+    plan.pending = to_fetch
+
+    os.makedirs(plan.mc_dir, exist_ok=True)
+    return PlanReport(
+        plan.version_id, groups["missing"], groups["stale"], groups["present"],
+        download_bytes=sum((a.size or 0) - _partial_bytes(a) for a in to_fetch),
+        unknown_sizes=sum(1 for a in to_fetch if a.size is None),
+        disk_free=shutil.disk_usage(plan.mc_dir).free,
+    )
+
+
+def check_disk_space(report: PlanReport) -> None:
+    if not report.fits():
+        raise InstallError(f"Not enough disk space: {format_bytes(report.disk_needed)} needed, "
+                           f"{format_bytes(report.disk_free)} free")
+
+
+# ---------------------------------------------------------------------------
+# Verify & repair
+# ---------------------------------------------------------------------------
+# A full check that trusts no cache: every file of a version and of its Java
+# runtime is hashed again on a pool of processes (one per core), then only the
+# missing or corrupt files are downloaded. Workers are spawned rather than
+# forked because the launcher may have download threads running.
+
+VERIFY_CATEGORIES = {
+    "library": "libraries", "native": "libraries",
+    "asset": "assets", "index": "assets",
+    "client": "client", "logging": "client",
+    "runtime": "runtime",
+}
+
+
+def _verify_file(item: tuple[str, str | None, int | None]) -> str:
+    """"ok", "missing" or "corrupt" (runs in a worker process)."""
+    path, sha1, size = item
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    if size is not None and st.st_size != size:
+        return "corrupt"
+    if sha1 is None:
+        return "ok"
+    try:
+        return "ok" if sha1_file(path) == sha1 else "corrupt"
+    except OSError:
+        return "missing"
+
+
+def verify_files(artifacts: list[Artifact], processes: int | None = None, callback: dict | None = None) -> list[str]:
+    """State of each artifact ("ok" / "missing" / "corrupt"), hashed on `processes` workers."""
+    if not artifacts:
+        return []
+    processes = processes or os.cpu_count() or 1
+    cb = callback or {}
+    cb.get("setMax", lambda _: None)(len(artifacts))
+    items = [(a.path, a.sha1, a.size) for a in artifacts]
+    # Small chunks keep the cores evenly busy; big enough ones keep the pickling cheap
+    chunksize = max(1, len(items) // (processes * 16))
+    states = []
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for state in pool.map(_verify_file, items, chunksize=chunksize):
+            states.append(state)
+            if len(states) % chunksize == 0 or len(states) == len(items):
+                cb.get("setProgress", lambda _: None)(len(states))
+    return states
+
+
+@dataclass
+class VerifyReport:
+    version_id: str
+    categories: dict[str, dict[str, int]]
+    broken: list[Artifact]
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """True if every file is intact now (after the repair, if there was one)."""
+        return not self.error and all(c["missing"] + c["corrupt"] == c["repaired"] for c in self.categories.values())
+
+    def to_dict(self) -> dict:
+        return {"version": self.version_id, "ok": self.ok, "categories": self.categories,
+                "broken": [a.path for a in self.broken],
+                "error": self.error}
+
+
+def verify_version(version_id: str, mc_dir: str, engine: DownloadEngine, index: HashIndex | None = None,
+                   repair: bool = True, processes: int | None = None, callback: dict | None = None) -> VerifyReport:
+    """Hash every library, asset, client file and runtime file of an installed version.
+    With repair=True the broken ones are downloaded again, natives are re-extracted
+    and the receipt is rewritten. A check-only run (repair=False) writes nothing: a missing
+    version JSON or asset index is read through the metadata cache."""
+    _set_status(callback, "Verify")
+    plan = plan_version(version_id, mc_dir, engine, download=repair)
+    artifacts = list(plan.artifacts)
+
+    component = (plan.data.get("javaVersion") or {}).get("component")
+    base = runtime_base(mc_dir, component) if component else None
+    runtime_arts, runtime_links = [], []
+    if base and os.path.isfile(os.path.join(base, ".version")):
+        manifest, _ = runtime_manifest(component, engine)
+        runtime_arts, runtime_links = runtime_artifacts(manifest, os.path.join(base, component))
+        artifacts += runtime_arts
+
+    states = verify_files(artifacts, processes, callback)
+    categories = {c: {"checked": 0, "ok": 0, "missing": 0, "corrupt": 0, "repaired": 0}
+                  for c in dict.fromkeys(VERIFY_CATEGORIES.values())}
+    broken = []
+    for art, state in zip(artifacts, states):
+        counts = categories[VERIFY_CATEGORIES.get(art.kind, "client")]
+        counts["checked"] += 1
+        counts[state] += 1
+        if state != "ok":
+            broken.append(art)
+        elif index is not None and art.sha1:
+            index.record(art.path, art.sha1)
+    report = VerifyReport(version_id, categories, broken)
+    if not repair:
+        return report
+
+    def done(art: Artifact) -> None:
+        # Only a file whose hash now matches counts as repaired
+        if art.sha1:
+            try:
+                if sha1_file(art.path) != art.sha1:
+                    return
+            except OSError:
+                return
+        categories[VERIFY_CATEGORIES.get(art.kind, "client")]["repaired"] += 1
+        if index is not None and art.sha1:
+            index.record(art.path, art.sha1)
+
+    drop_receipt(version_id, mc_dir)
+    try:
+        # The broken file may be a hardlink to a shared store object, so store objects are checked too
+        engine.fetch_all(broken, callback, on_done=done, verify=True)
+    except (DownloadError, OSError) as e:
+        report.error = str(e)
+        return report
+    finally:
+        if index is not None:
+            index.save()
+
+    # Natives are not in any manifest, so they are unpacked again rather than checked
+    extract_natives(plan, force=True)
+    _write_plan_receipt(plan)
+    if runtime_arts:
+        for path, target in runtime_links:
+            if not os.path.lexists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    os.symlink(target, path)
+                except OSError:
+                    pass
+        if any(a.kind == "runtime" for a in broken):
+            _write_runtime_sha1(base, component, runtime_arts)
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Install receipts
+# ---------------------------------------------------------------------------
+# Written after a successful install so the next launch of the same version
+# can skip the full verification with a stat-only check.
+
+RECEIPT_FORMAT = 1
+
+
+def receipt_path(mc_dir: str, version_id: str) -> str:
+    return os.path.join(mc_dir, "versions", version_id, f"{version_id}.receipt.json")
+
+
+def _walk_files(root: str) -> list[str]:
+    found = []
+    for dirpath, _, files in os.walk(root):
+        found.extend(os.path.join(dirpath, f) for f in files)
+    return found
+
+
+def write_receipt(version_id: str, mc_dir: str, artifacts: list[Artifact], extra_paths: list[str] = (),
+                  natives_dir: str | None = None) -> None:
+    """Record path, size, mtime and hash of every file the version needs, and its natives folder."""
+    write_receipt_entries(version_id, mc_dir, [(a.path, a.sha1) for a in artifacts] + [(p, None) for p in extra_paths],
+                          natives_dir)
+
+
+def write_receipt_entries(version_id: str, mc_dir: str, entries: list[tuple[str, str | None]],
+                          natives_dir: str | None = None) -> None:
+    """Receipt from (path, sha1 or None) pairs, stat-ing each file as it is now."""
+    files = []
+    for path, sha1 in entries:
+        st = os.stat(path)
+        files.append([os.path.relpath(path, mc_dir), st.st_size, st.st_mtime_ns, sha1])
+
+    receipt = {"format": RECEIPT_FORMAT, "version": version_id, "files": files}
+    if natives_dir is not None:
+        receipt["natives"] = os.path.relpath(natives_dir, mc_dir).replace(os.sep, "/")
+    path = receipt_path(mc_dir, version_id)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(receipt, f)
+    os.replace(tmp, path)
+
+
+def drop_receipt(version_id: str, mc_dir: str) -> None:
+    try:
+        os.remove(receipt_path(mc_dir, version_id))
+    except OSError:
+        pass
+
+
+def receipt_files(version_id: str, mc_dir: str) -> list[list] | None:
+    """[relpath, size, mtime_ns, sha1 | None] entries of a version's receipt, or None."""
+    try:
+        receipt = _read_json(receipt_path(mc_dir, version_id))
+    except (OSError, ValueError):
+        return None
+    if receipt.get("format") != RECEIPT_FORMAT or receipt.get("version") != version_id:
+        return None
+    return receipt.get("files", [])
+
+
+def receipt_natives(version_id: str, mc_dir: str) -> str | None:
+    """Natives folder recorded in a version's receipt; None for receipts written before
+    the natives cache (the game then uses versions/<id>/natives)."""
+    try:
+        receipt = _read_json(receipt_path(mc_dir, version_id))
+    except (OSError, ValueError):
+        return None
+    rel = receipt.get("natives") if receipt.get("version") == version_id else None
+    return os.path.join(mc_dir, *rel.split("/")) if rel else None
+
+
+def check_receipt(version_id: str, mc_dir: str) -> bool:
+    """True if a receipt exists and every recorded file still has the same size and mtime."""
+    files = receipt_files(version_id, mc_dir)
+    if files is None:
+        return False
+
+    for rel, size, mtime_ns, _ in files:
+        try:
+            st = os.stat(os.path.join(mc_dir, rel))
+        except OSError:
+            return False
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Java runtime
+# ---------------------------------------------------------------------------
+
+def jvm_platform() -> str:
+    """Platform name of the Java runtime manifest (and of the runtime folder layout)."""
+    system = platform.system()
+    bits32 = platform.architecture()[0] == "32bit"
+    if system == "Windows":
+        return "windows-x86" if bits32 else "windows-x64"
+    if system == "Linux":
+        return "linux-i386" if bits32 else "linux"
+    if system == "Darwin":
+        return "mac-os-arm64" if platform.machine() == "arm64" else "mac-os"
+    return "gamecore"
+
+
+def runtime_base(mc_dir: str, component: str) -> str:
+    return os.path.join(mc_dir, "runtime", component, jvm_platform())
+
+
+def runtime_manifest(component: str, engine: DownloadEngine) -> tuple[dict, str]:
+    """Return (platform file manifest, runtime version name) for a runtime component."""
+    platform_string = jvm_platform()
+    entries = engine.get_json(JVM_MANIFEST_URL).get(platform_string, {}).get(component)
+    if not entries:
+        raise InstallError(f"Java runtime not available: {component} ({platform_string})")
+    return engine.get_json(entries[0]["manifest"]["url"]), entries[0]["version"]["name"]
+
+
+def install_runtime(component: str, mc_dir: str, engine: DownloadEngine, callback: dict | None = None,
+                    index: HashIndex | None = None) -> None:
+    """Install a Mojang Java runtime with the same layout minecraft-launcher-lib produces."""
+    manifest, version_name = runtime_manifest(component, engine)
+    base = runtime_base(mc_dir, component)
+    home = os.path.join(base, component)
+    artifacts, links = runtime_artifacts(manifest, home, make_dirs=True)
+
+    journal = InstallJournal(os.path.join(base, "install.journal"), home)
+    try:
+        _fetch_missing(artifacts, engine, callback, index, journal)
+    finally:
+        journal.close()
+        if index is not None:
+            index.save()
+
+    for path, target in links:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.lexists(path):
+            try:
+                os.symlink(target, path)
+            except OSError:
+                pass
+
+    with open(os.path.join(base, ".version"), "w", encoding="utf-8") as f:
+        f.write(version_name)
+    _write_runtime_sha1(base, component, artifacts)
+    journal.discard()
+
+
+def runtime_artifacts(manifest: dict, home: str, make_dirs: bool = False) -> tuple[list[Artifact], list[tuple[str, str]]]:
+    """Files of a runtime manifest as artifacts, plus (path, target) symlinks."""
+    artifacts = []
+    links = []
+    for rel, entry in manifest["files"].items():
+        path = os.path.join(home, rel)
+        if entry["type"] == "directory":
+            if make_dirs:
+                os.makedirs(path, exist_ok=True)
+        elif entry["type"] == "link":
+            links.append((path, entry["target"]))
+        elif entry["type"] == "file":
+            raw = entry["downloads"]["raw"]
+            packed = entry["downloads"].get("lzma")
+            artifacts.append(Artifact((packed or raw)["url"], path, raw["sha1"], raw.get("size"),
+                                      kind="runtime", lzma=packed is not None,
+                                      executable=entry.get("executable", False)))
+    return artifacts, links
+
+
+def _write_runtime_sha1(base: str, component: str, artifacts: list[Artifact]) -> None:
+    # Same format as the official launcher: {path} /#// {sha1} {ctime in ns}
+    home = os.path.join(base, component)
+    with open(os.path.join(base, f"{component}.sha1"), "w", encoding="utf-8") as f:
+        for art in artifacts:
+            rel = os.path.relpath(art.path, home).replace(os.sep, "/")
+            f.write(f"{rel} /#// {art.sha1} {os.stat(art.path).st_ctime_ns}\n")
@@ -0,0 +1,298 @@
+"""
+Java runtime resolution for RCA Launcher
+Persisted index of version -> runtime component -> java executable, so a
+launch does not have to re-read version JSONs or probe runtime folders.
+"""
+
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+from installer import runtime_base, version_json_path
+
+RUNTIME_INDEX_FORMAT = 2
+
+JAVA_CANDIDATES = [
+    os.path.join("bin", "java"),
+    os.path.join("bin", "java.exe"),
+    os.path.join("jre.bundle", "Contents", "Home", "bin", "java"),
+]
+
+
+def _stat_sig(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def find_java(home: str) -> str | None:
+    for rel in JAVA_CANDIDATES:
+        path = os.path.join(home, rel)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def java_version_output(java: str) -> str:
+    """First line of `java -version` (printed on stderr), or "" if it cannot run."""
+    try:
+        r = subprocess.run([java, "-version"], capture_output=True, text=True, timeout=15)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    out = (r.stderr or r.stdout).strip()
+    return out.splitlines()[0] if out else ""
+
+
+# ---------------------------------------------------------------------------
+# System JDK discovery
+# ---------------------------------------------------------------------------
+
+def jdk_search_roots() -> list[str]:
+    home = Path.home()
+    roots = [home / ".sdkman" / "candidates" / "java", home / ".jdks"]
+    if os.name == "nt":
+        pf = Path(os.environ.get("ProgramFiles", r"C:\Program Files"))
+        roots += [pf / "Java", pf / "Eclipse Adoptium", pf / "Microsoft", pf / "Zulu", pf / "BellSoft"]
+    elif platform.system() == "Darwin":
+        roots += [Path("/Library/Java/JavaVirtualMachines"), home / "Library" / "Java" / "JavaVirtualMachines"]
+    else:
+        roots += [Path("/usr/lib/jvm"), Path("/usr/java"), Path("/opt/java"), Path("/opt/jdk")]
+    return [str(r) for r in roots]
+
+
+def _candidate_homes() -> list[str]:
+    homes = []
+    if os.environ.get("JAVA_HOME"):
+        homes.append(os.environ["JAVA_HOME"])
+    which = shutil.which("java")
+    if which:
+        homes.append(os.path.dirname(os.path.dirname(os.path.realpath(which))))
+    for root in jdk_search_roots():
+        try:
+            names = sorted(os.listdir(root))
+        except OSError:
+            continue
+        for name in names:
+            home = os.path.join(root, name)
+            mac_home = os.path.join(home, "Contents", "Home")
+            homes.append(mac_home if os.path.isdir(mac_home) else home)
+    return homes
+
+
+def _catalogue_sig() -> list:
+    return [os.environ.get("JAVA_HOME", ""), os.environ.get("PATH", "")] + \
+           [_stat_sig(r) for r in jdk_search_roots()]
+
+
+def parse_major(version: str) -> int | None:
+    """'1.8.0_392' -> 8, '17.0.9' -> 17, '21' -> 21"""
+    m = re.match(r"(\d+)(?:\.(\d+))?", version or "")
+    if not m:
+        return None
+    major = int(m.group(1))
+    if major == 1 and m.group(2):
+        major = int(m.group(2))
+    return major
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    """'17.0.10+7' -> (17, 0, 10, 7), so versions compare numerically."""
+    return tuple(int(p) for p in re.findall(r"\d+", version or ""))
+
+
+def _read_release(home: str) -> dict:
+    info = {}
+    try:
+        with open(os.path.join(home, "release"), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep:
+                    info[key.strip()] = value.strip().strip('"')
+    except OSError:
+        pass
+    return info
+
+
+def _normalize_arch(arch: str) -> str:
+    arch = arch.lower()
+    return {"amd64": "x86_64", "x64": "x86_64", "arm64": "aarch64"}.get(arch, arch)
+
+
+def describe_jdk(home: str) -> dict | None:
+    """{"home", "java", "major", "version", "vendor", "arch"} or None if home has no usable java."""
+    java = find_java(home)
+    if java is None:
+        return None
+    release = _read_release(home)
+    version = release.get("JAVA_VERSION", "")
+    if not version:
+        m = re.search(r'version "([^"]+)"', java_version_output(java))
+        version = m.group(1) if m else ""
+    major = parse_major(version)
+    if major is None:
+        return None
+    return {
+        "home": home,
+        "java": java,
+        "major": major,
+        "version": version,
+        "vendor": release.get("IMPLEMENTOR", ""),
+        "arch": _normalize_arch(release.get("OS_ARCH", "")),
+    }
+
+
+def scan_system_jdks() -> list[dict]:
+    machine = _normalize_arch(platform.machine())
+    seen = set()
+    jdks = []
+    for home in _candidate_homes():
+        real = os.path.realpath(home)
+        if real in seen or not os.path.isdir(real):
+            continue
+        seen.add(real)
+        jdk = describe_jdk(real)
+        if jdk is not None and (not jdk["arch"] or jdk["arch"] == machine):
+            jdks.append(jdk)
+    return sorted(jdks, key=lambda j: (j["major"], version_key(j["version"])))
+
+
+def pick_compatible(jdks: list[dict], major: int) -> dict | None:
+    """Newest build of the exact major if available; for Java 17+ versions, otherwise
+    the newest build of the closest newer major."""
+    # Catalogues cached before version_key existed are not in numeric order
+    jdks = sorted(jdks, key=lambda j: (j["major"], version_key(j["version"])))
+    exact = [j for j in jdks if j["major"] == major]
+    if exact:
+        return exact[-1]
+    if major >= 17:
+        newer = [j for j in jdks if j["major"] > major]
+        if newer:
+            return max((j for j in newer if j["major"] == newer[0]["major"]),
+                       key=lambda j: version_key(j["version"]))
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Runtime index
+# ---------------------------------------------------------------------------
+
+class RuntimeIndex:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._data = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def _read(self) -> dict:
+        data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if data.get("format") != RUNTIME_INDEX_FORMAT:
+            data = {"format": RUNTIME_INDEX_FORMAT, "versions": {}, "runtimes": {}, "system": {}}
+        return data
+
+    def version_runtime(self, version_id: str, mc_dir: str) -> dict | None:
+        """{"component", "major"} required by a version; None if the JSON is missing or has no javaVersion."""
+        data = self._load()
+        path = version_json_path(mc_dir, version_id)
+        sig = _stat_sig(path)
+        entry = data["versions"].get(version_id)
+        if entry is not None and entry["sig"] == sig:
+            return entry["runtime"]
+        if sig is None:
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            vj = json.load(f)
+        if "javaVersion" not in vj and "inheritsFrom" in vj:
+            try:
+                with open(version_json_path(mc_dir, vj["inheritsFrom"]), "r", encoding="utf-8") as f:
+                    vj = json.load(f)
+            except (OSError, ValueError):
+                pass
+        jv = vj.get("javaVersion")
+        runtime = {"component": jv["component"], "major": jv["majorVersion"]} if jv else None
+
+        with self._lock:
+            data["versions"][version_id] = {"sig": sig, "runtime": runtime}
+            self._dirty = True
+        return runtime
+
+    def java_for(self, component: str, mc_dir: str) -> dict | None:
+        """{"java", "java_version"} of an installed Mojang runtime; None if not installed.
+        The entry is refreshed only when the runtime's .version marker changes."""
+        data = self._load()
+        base = runtime_base(mc_dir, component)
+        sig = _stat_sig(os.path.join(base, ".version"))
+        if sig is None:
+            return None
+        entry = data["runtimes"].get(component)
+        if entry is not None and entry["sig"] == sig and entry["mc_dir"] == mc_dir:
+            return entry["java"]
+
+        java = find_java(os.path.join(base, component))
+        info = {"java": java, "java_version": java_version_output(java)} if java else None
+        with self._lock:
+            data["runtimes"][component] = {"sig": sig, "mc_dir": mc_dir, "java": info}
+            self._dirty = True
+        return info
+
+    def system_jdks(self, refresh: bool = False) -> list[dict]:
+        """Cached catalogue of system JDKs, rescanned when JAVA_HOME, PATH or a search root changes."""
+        data = self._load()
+        sig = _catalogue_sig()
+        cached = data["system"]
+        if not refresh and cached.get("sig") == sig:
+            return cached["jdks"]
+        jdks = scan_system_jdks()
+        with self._lock:
+            data["system"] = {"sig": sig, "jdks": jdks}
+            self._dirty = True
+        return jdks
+
+    def pick_java(self, policy: str, component: str, major: int, mc_dir: str) -> tuple[dict | None, str]:
+        """Apply the Java policy. Returns (java info, "bundled" | "system"); (None, "") means
+        the bundled runtime has to be downloaded."""
+        def system():
+            jdk = pick_compatible(self.system_jdks(), major)
+            if jdk and os.path.isfile(jdk["java"]):
+                return {"java": jdk["java"], "java_version": f"{jdk['vendor']} {jdk['version']}".strip()}
+            return None
+
+        order = {
+            "prefer-system":  [("system", system), ("bundled", lambda: self.java_for(component, mc_dir))],
+            "bundled-only":   [("bundled", lambda: self.java_for(component, mc_dir))],
+        }.get(policy, [("bundled", lambda: self.java_for(component, mc_dir)), ("system", system)])
+
+        for source, resolve in order:
+            info = resolve()
+            if info is not None:
+                return info, source
+        return None, ""
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp, self.path)
+            self._dirty = False
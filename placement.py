@@ -0,0 +1,351 @@
+"""
+Process placement for RCA Launcher
+A JVM profile can pin the game to some CPUs, lower its CPU and I/O priority
+and, on cgroup v2, cap its memory and CPU time. The command is wrapped so
+everything is in place before the JVM starts and every thread it starts
+inherits it: a small sh shim joins the cgroup, then taskset, nice and ionice
+exec the game. Nothing runs in the child between fork and exec (the launcher
+has threads, so only exec is safe there); whatever has no tool installed is
+applied from the launcher to each of the game's threads right after spawn.
+systemd-run is a fallback for the limits when the cgroup tree is not
+writable by this user.
+"""
+
+import ctypes
+import os
+import platform
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+
+CGROUP_ROOT   = "/sys/fs/cgroup"
+CGROUP_PREFIX = "rca-"
+CPU_PERIOD    = 100000        # cpu.max period in microseconds
+
+IOPRIO_CLASSES     = {"none": 0, "realtime": 1, "best-effort": 2, "idle": 3}
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+
+# Joins the cgroup whose cgroup.procs is $0, then runs the rest of the command
+CGROUP_SHIM = 'echo $$ > "$0" 2>/dev/null; exec "$@"'
+
+# (ioprio_set, ioprio_get) syscall numbers; there is no libc wrapper
+IOPRIO_SYSCALLS = {
+    "x86_64":  (251, 252),
+    "aarch64": (30, 31),
+    "riscv64": (30, 31),
+    "i686":    (289, 290),
+    "i386":    (289, 290),
+    "armv7l":  (314, 315),
+    "ppc64le": (273, 274),
+    "s390x":   (282, 283),
+}
+
+_libc = None
+_systemd_ok = None
+_counter = 0
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    return _libc
+
+
+def _syscall(number: int, *args: int) -> int:
+    return _load_libc().syscall(number, *args)
+
+
+def parse_cpus(spec) -> list[int]:
+    """CPU list from "0-3,6" or [0, 1, 2, 3, 6]."""
+    if isinstance(spec, (list, tuple)):
+        return sorted({int(c) for c in spec})
+    cpus = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpus(cpus) -> str:
+    """[0, 1, 2, 3, 6] -> "0-3,6"."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(lo) if lo == hi else f"{lo}-{hi}" for lo, hi in ranges)
+
+
+def parse_size(value) -> int:
+    """Bytes from 6442450944, "6G", "512M" or "1024K"."""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().upper().rstrip("B")
+    for suffix, shift in (("K", 10), ("M", 20), ("G", 30), ("T", 40)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * (1 << shift))
+    return int(text)
+
+
+def parse_ionice(value) -> tuple[int, int]:
+    """(class, level) from "idle", "best-effort" or "best-effort:6"."""
+    name, _, level = str(value).partition(":")
+    if name not in IOPRIO_CLASSES:
+        raise ValueError(f"unknown I/O class {name!r}")
+    return IOPRIO_CLASSES[name], int(level or 4)
+
+
+# ---------------------------------------------------------------------------
+# cgroup v2
+# ---------------------------------------------------------------------------
+
+def cgroup_of(pid: int | str = "self") -> str | None:
+    """cgroup v2 path of a process, relative to CGROUP_ROOT ("/user.slice/...")."""
+    try:
+        with open(f"/proc/{pid}/cgroup", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _write(path: str, value: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(value)
+
+
+def _prune_cgroups(base: str) -> None:
+    """Remove the launcher's cgroups whose game has exited (rmdir fails on busy ones)."""
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(CGROUP_PREFIX):
+            try:
+                os.rmdir(os.path.join(base, name))
+            except OSError:
+                pass
+
+
+def create_cgroup(memory_max: int | None, cpu_max: float | None) -> str:
+    """A new cgroup next to the launcher's own, with the given limits. The launcher's own
+    cgroup holds processes, so (outside the root) children cannot get controllers there.
+    Raises OSError when the tree is not writable or lacks the controllers."""
+    global _counter
+    own = cgroup_of()
+    if own is None or not os.path.isfile(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        raise OSError("cgroup v2 is not mounted")
+    base = CGROUP_ROOT + (own if own == "/" else os.path.dirname(own))
+    base = base.rstrip("/") or CGROUP_ROOT
+
+    wanted = [c for c, limit in (("memory", memory_max), ("cpu", cpu_max)) if limit]
+    enabled = _read(os.path.join(base, "cgroup.subtree_control")).split()
+    for controller in wanted:
+        if controller not in enabled:
+            _write(os.path.join(base, "cgroup.subtree_control"), f"+{controller}")
+    if not os.access(os.path.join(base, "cgroup.procs"), os.W_OK):
+        raise OSError(f"{base} is not writable")
+
+    _prune_cgroups(base)
+    _counter += 1
+    path = os.path.join(base, f"{CGROUP_PREFIX}{os.getpid()}-{_counter}")
+    os.mkdir(path)
+    try:
+        if memory_max:
+            _write(os.path.join(path, "memory.max"), str(memory_max))
+        if cpu_max:
+            _write(os.path.join(path, "cpu.max"), f"{int(cpu_max * CPU_PERIOD)} {CPU_PERIOD}")
+    except OSError:
+        os.rmdir(path)
+        raise
+    return path
+
+
+def systemd_scope_available() -> bool:
+    """True if `systemd-run --user --scope` works (a user manager is running)."""
+    global _systemd_ok
+    if _systemd_ok is None:
+        exe = shutil.which("systemd-run")
+        try:
+            _systemd_ok = bool(exe) and subprocess.run(
+                [exe, "--user", "--scope", "--quiet", "--collect", "true"],
+                capture_output=True, timeout=10).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            _systemd_ok = False
+    return _systemd_ok
+
+
+def systemd_scope(memory_max: int | None, cpu_max: float | None) -> list[str]:
+    cmd = ["systemd-run", "--user", "--scope", "--quiet", "--collect"]
+    if memory_max:
+        cmd += ["-p", f"MemoryMax={memory_max}"]
+    if cpu_max:
+        cmd += ["-p", f"CPUQuota={int(cpu_max * 100)}%"]
+    return cmd + ["--"]
+
+
+# ---------------------------------------------------------------------------
+# Placement
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Placement:
+    affinity: list[int] | None = None
+    nice: int | None = None
+    ionice: tuple[int, int] | None = None
+    memory_max: int | None = None
+    cpu_max: float | None = None
+    cgroup: str | None = None
+    wrapper: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    # Settings no wrapper tool covers: apply() sets them from the launcher after spawn
+    late: list[str] = field(default_factory=list)
+
+    def command(self, cmd: list[str]) -> list[str]:
+        return self.wrapper + cmd
+
+    def apply(self, pid: int) -> None:
+        """Set what the wrapper could not on every thread of the spawned process. Failures
+        are ignored: effective_placement() shows what actually took."""
+        if not self.late:
+            return
+        try:
+            tids = [int(t) for t in os.listdir(f"/proc/{pid}/task")]
+        except OSError:
+            tids = [pid]
+        for tid in tids:
+            try:
+                if "affinity" in self.late:
+                    os.sched_setaffinity(tid, self.affinity)
+                if "nice" in self.late:
+                    os.setpriority(os.PRIO_PROCESS, tid, self.nice)
+            except OSError:
+                pass
+            if "ionice" in self.late:
+                _syscall(IOPRIO_SYSCALLS[platform.machine()][0], IOPRIO_WHO_PROCESS, tid,
+                         self.ionice[0] << IOPRIO_CLASS_SHIFT | self.ionice[1])
+
+
+def _wrap(placement: Placement) -> None:
+    """Prefix the command with the cgroup shim and taskset / nice / ionice where they are
+    installed; the rest is left to Placement.apply()."""
+    if placement.cgroup:
+        placement.wrapper += ["sh", "-c", CGROUP_SHIM, os.path.join(placement.cgroup, "cgroup.procs")]
+    if placement.affinity:
+        if shutil.which("taskset"):
+            placement.wrapper += ["taskset", "-c", format_cpus(placement.affinity)]
+        else:
+            placement.late.append("affinity")
+    if placement.nice is not None:
+        if shutil.which("nice"):
+            # nice takes an increment to the launcher's own level
+            placement.wrapper += ["nice", "-n", str(placement.nice - os.getpriority(os.PRIO_PROCESS, 0))]
+        else:
+            placement.late.append("nice")
+    if placement.ionice is not None:
+        if shutil.which("ionice"):
+            cls, level = placement.ionice
+            placement.wrapper += ["ionice", "-c", str(cls)] + (["-n", str(level)] if cls in (1, 2) else [])
+        else:
+            placement.late.append("ionice")
+
+
+def build_placement(settings: dict) -> Placement:
+    """Placement from a profile's "affinity", "nice", "ionice", "memory_max" and "cpu_max".
+    Whatever this system cannot do is left out and explained in .warnings."""
+    placement = Placement()
+    linux = platform.system() == "Linux"
+    try:
+        if settings.get("affinity") not in (None, "", []):
+            cpus = parse_cpus(settings["affinity"])
+            if not hasattr(os, "sched_setaffinity"):
+                placement.warnings.append("affinity: not supported on this system")
+            else:
+                usable = os.sched_getaffinity(0)
+                placement.affinity = [c for c in cpus if c in usable] or None
+                if placement.affinity is None:
+                    placement.warnings.append(f"affinity: none of CPUs {format_cpus(cpus)} are available")
+        if settings.get("nice") is not None:
+            if hasattr(os, "setpriority"):
+                placement.nice = int(settings["nice"])
+            else:
+                placement.warnings.append("nice: not supported on this system")
+        if settings.get("ionice"):
+            if linux and platform.machine() in IOPRIO_SYSCALLS:
+                placement.ionice = parse_ionice(settings["ionice"])
+            else:
+                placement.warnings.append("ionice: not supported on this system")
+        if settings.get("memory_max"):
+            placement.memory_max = parse_size(settings["memory_max"])
+        if settings.get("cpu_max"):
+            placement.cpu_max = float(settings["cpu_max"])
+    except (TypeError, ValueError) as e:
+        placement.warnings.append(str(e))
+
+    if placement.memory_max or placement.cpu_max:
+        if not linux:
+            placement.warnings.append("cgroup limits: Linux only")
+        else:
+            try:
+                placement.cgroup = create_cgroup(placement.memory_max, placement.cpu_max)
+            except OSError as e:
+                if systemd_scope_available():
+                    placement.wrapper = systemd_scope(placement.memory_max, placement.cpu_max)
+                else:
+                    placement.warnings.append(f"cgroup limits: {e}")
+    _wrap(placement)
+    return placement
+
+
+def effective_placement(pid: int) -> dict:
+    """What the running process actually got: {"cpus", "cpu_count", "nice", "ionice",
+    "cgroup", "memory_max", "cpu_max"}; keys this system cannot report are missing."""
+    info = {}
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            info["cpus"] = format_cpus(os.sched_getaffinity(pid))
+            info["cpu_count"] = os.cpu_count()
+        except OSError:
+            pass
+    if hasattr(os, "getpriority"):
+        try:
+            info["nice"] = os.getpriority(os.PRIO_PROCESS, pid)
+        except OSError:
+            pass
+    if platform.system() == "Linux" and platform.machine() in IOPRIO_SYSCALLS:
+        value = _syscall(IOPRIO_SYSCALLS[platform.machine()][1], IOPRIO_WHO_PROCESS, pid)
+        if value >= 0:
+            names = {v: k for k, v in IOPRIO_CLASSES.items()}
+            cls, level = value >> IOPRIO_CLASS_SHIFT, value & ((1 << IOPRIO_CLASS_SHIFT) - 1)
+            info["ionice"] = names.get(cls, str(cls)) if cls in (0, 3) else f"{names.get(cls, cls)}:{level}"
+
+    path = cgroup_of(pid)
+    if path is not None:
+        info["cgroup"] = path
+        folder = CGROUP_ROOT + path
+        try:
+            memory = _read(os.path.join(folder, "memory.max"))
+            info["memory_max"] = None if memory == "max" else int(memory)
+        except (OSError, ValueError):
+            pass
+        try:
+            quota, period = _read(os.path.join(folder, "cpu.max")).split()
+            info["cpu_max"] = None if quota == "max" else int(quota) / int(period)
+        except (OSError, ValueError):
+            pass
+    return info
@@ -0,0 +1,214 @@
+"""
+JVM launch profiles for RCA Launcher
+A profile names the garbage collectors it prefers, how much of the machine's
+memory the heap may take and any extra JVM options. The heap is sized at
+every launch from total and available RAM and the Minecraft instances that
+are already running, so a second instance does not push the first into swap.
+Profiles are stored in prefs ("jvm_profiles" adds or overrides the built-in
+ones) and chosen per version ("version_profiles", else "jvm_profile"). They
+can also place the process (CPUs, priorities, cgroup limits; see placement.py).
+"""
+
+import ctypes
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+
+from placement import parse_size
+
+DEFAULT_PROFILE = "throughput"
+OS_RESERVE_MB   = 1536        # left to the OS and to the game's native memory (LWJGL, code cache)
+HEAP_STEP_MB    = 256
+
+BUILTIN_PROFILES = {
+    "low-latency": {
+        "gc": ["zgc", "shenandoah", "g1"],
+        "heap_share": 0.5, "min_heap_mb": 2048, "max_heap_mb": 8192,
+        "args": ["-XX:+AlwaysPreTouch", "-XX:+DisableExplicitGC"],
+    },
+    "throughput": {
+        "gc": ["g1"],
+        "heap_share": 0.5, "min_heap_mb": 1024, "max_heap_mb": 6144,
+        "args": ["-XX:MaxGCPauseMillis=200", "-XX:+ParallelRefProcEnabled", "-XX:+DisableExplicitGC"],
+    },
+    "low-memory": {
+        "gc": ["serial"],
+        "heap_share": 0.25, "min_heap_mb": 512, "max_heap_mb": 2048,
+        "args": ["-XX:MinHeapFreeRatio=10", "-XX:MaxHeapFreeRatio=30"],
+    },
+}
+
+# Optional profile keys handed to placement.build_placement
+PLACEMENT_KEYS = ("affinity", "nice", "ionice", "memory_max", "cpu_max")
+
+# collector -> (first Java major where it is production ready, options)
+GC_OPTIONS = {
+    "g1":         (8,  ["-XX:+UseG1GC"]),
+    "zgc":        (15, ["-XX:+UseZGC"]),
+    "shenandoah": (12, ["-XX:+UseShenandoahGC"]),
+    "parallel":   (8,  ["-XX:+UseParallelGC"]),
+    "serial":     (8,  ["-XX:+UseSerialGC"]),
+}
+
+# Left out of some vendor builds (Oracle's): ask the JVM before using it
+PROBED_GCS = {"shenandoah"}
+
+# Every vanilla and modded client gets these game arguments (on a java process)
+INSTANCE_MARKERS = (b"--gameDir", b"--assetsDir")
+
+_probed = {}
+_majors = {}
+
+
+# ---------------------------------------------------------------------------
+# Machine
+# ---------------------------------------------------------------------------
+
+def memory_info() -> tuple[int, int]:
+    """(total, available) RAM in MiB. Where the available amount cannot be read it is
+    estimated as half of the total."""
+    if os.path.isfile("/proc/meminfo"):
+        info = {}
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0]) // 1024
+        return info["MemTotal"], info.get("MemAvailable", info.get("MemFree", info["MemTotal"] // 2))
+
+    if os.name == "nt":
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(status)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullTotalPhys >> 20, status.ullAvailPhys >> 20
+
+    total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") >> 20
+    return total, total // 2
+
+
+def running_instances() -> int:
+    """Minecraft clients running on this machine (read from /proc; 0 where it does not exist)."""
+    count = 0
+    try:
+        pids = [p for p in os.listdir("/proc") if p.isdigit()]
+    except OSError:
+        return 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        exe = os.path.basename(cmdline.split(b"\0", 1)[0])
+        if exe.startswith(b"java") and all(marker in cmdline for marker in INSTANCE_MARKERS):
+            count += 1
+    return count
+
+
+def binary_major(java: str, fallback=None):
+    """Major version of the java binary that will actually run (with prefer-system it can
+    be newer than the version asks for), from `java -version`; fallback if it cannot be read."""
+    key = os.path.realpath(shutil.which(java) or java)
+    if key not in _majors:
+        try:
+            r = subprocess.run([java, "-version"], capture_output=True, text=True, timeout=15)
+            m = re.search(r'version "(?:1\.)?(\d+)', r.stderr or r.stdout)
+            _majors[key] = int(m.group(1)) if m else None
+        except (OSError, subprocess.SubprocessError):
+            _majors[key] = None
+    return _majors[key] if _majors[key] is not None else fallback
+
+
+def gc_available(java: str, gc: str, java_major) -> bool:
+    min_major, options = GC_OPTIONS[gc]
+    major = java_major if isinstance(java_major, int) else 8
+    if major < min_major:
+        return False
+    if gc not in PROBED_GCS:
+        return True
+    key = (os.path.realpath(java), gc)
+    if key not in _probed:
+        try:
+            r = subprocess.run([java, *options, "-version"], capture_output=True, timeout=15)
+            _probed[key] = r.returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            _probed[key] = False
+    return _probed[key]
+
+
+def gc_options(gc: str, java_major) -> list[str]:
+    options = list(GC_OPTIONS[gc][1])
+    # Generational ZGC is opt-in on Java 21-22 and the only mode from 23
+    if gc == "zgc" and isinstance(java_major, int) and 21 <= java_major < 23:
+        options.append("-XX:+ZGenerational")
+    return options
+
+
+# ---------------------------------------------------------------------------
+# Profiles
+# ---------------------------------------------------------------------------
+
+def load_profiles(prefs: dict) -> dict:
+    """Built-in profiles updated with prefs["jvm_profiles"]; a new name starts from the default profile."""
+    profiles = {name: dict(p) for name, p in BUILTIN_PROFILES.items()}
+    for name, custom in (prefs.get("jvm_profiles") or {}).items():
+        profiles[name] = {**profiles.get(name, BUILTIN_PROFILES[DEFAULT_PROFILE]), **custom}
+    return profiles
+
+
+def profile_name(prefs: dict, version_id: str) -> str:
+    profiles = load_profiles(prefs)
+    name = (prefs.get("version_profiles") or {}).get(version_id) or prefs.get("jvm_profile", DEFAULT_PROFILE)
+    return name if name in profiles else DEFAULT_PROFILE
+
+
+def heap_size(profile: dict, total_mb: int, available_mb: int, instances: int) -> int:
+    """Heap in MiB: the profile's share of the RAM split between this and the running
+    instances, no more than what is free after OS_RESERVE_MB, within the profile's bounds."""
+    share = total_mb * profile["heap_share"] / (instances + 1)
+    heap = min(share, available_mb - OS_RESERVE_MB, profile["max_heap_mb"])
+    heap = max(heap, profile["min_heap_mb"])
+    return int(heap) // HEAP_STEP_MB * HEAP_STEP_MB or HEAP_STEP_MB
+
+
+@dataclass
+class LaunchProfile:
+    name: str
+    gc: str
+    heap_mb: int
+    min_heap_mb: int
+    total_mb: int
+    available_mb: int
+    instances: int
+    options: list[str] = field(default_factory=list)
+    placement: dict = field(default_factory=dict)
+
+    def jvm_args(self) -> list[str]:
+        return [f"-Xms{self.min_heap_mb}M", f"-Xmx{self.heap_mb}M", *self.options]
+
+
+def resolve_profile(prefs: dict, version_id: str, java: str, java_major) -> LaunchProfile:
+    """The profile chosen for version_id, sized for this machine right now. Collectors are
+    gated on the major of the java binary; java_major (the version's requirement) is only
+    the fallback when it cannot be asked."""
+    name = profile_name(prefs, version_id)
+    profile = load_profiles(prefs)[name]
+    java_major = binary_major(java, java_major)
+    gc = next((g for g in profile["gc"] if g in GC_OPTIONS and gc_available(java, g, java_major)), "g1")
+    total_mb, available_mb = memory_info()
+    instances = running_instances()
+    heap = heap_size(profile, total_mb, available_mb, instances)
+    placement = {k: profile[k] for k in PLACEMENT_KEYS if profile.get(k) not in (None, "", [])}
+    if "memory_max" in placement:
+        # The cgroup limit covers the whole process: keep a quarter of it for non-heap memory
+        limit_mb = parse_size(placement["memory_max"]) >> 20
+        heap = max(HEAP_STEP_MB, min(heap, int(limit_mb * 0.75) // HEAP_STEP_MB * HEAP_STEP_MB))
+    return LaunchProfile(name, gc, heap, min(profile["min_heap_mb"], heap), total_mb, available_mb, instances,
+                         gc_options(gc, java_major) + list(profile.get("args", [])), placement)
@@ -0,0 +1,159 @@
+"""
+Phase timing for RCA Launcher
+span("name") marks one step of the launcher: a launch phase, a download, a
+hash, a JSON parse. While a trace is running every span is kept as a Chrome
+trace event (a complete "X" event on the track of the thread that ran it)
+and the trace can be saved as JSON for chrome://tracing or ui.perfetto.dev.
+A trace keeps the latest MAX_EVENTS events, so a long session neither grows
+without bound nor makes each save slower than the last.
+With no trace running span() returns one shared do-nothing context manager,
+so an instrumented call costs a global read and a function call.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+TRACE_PREFIX = "session-"
+TRACE_SUFFIX = ".trace.json"
+KEEP_TRACES  = 20             # session traces kept in the trace folder
+MAX_EVENTS   = 50000          # events kept per trace, oldest dropped first
+
+_trace = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "name", "cat", "args", "start")
+
+    def __init__(self, trace: "Trace", name: str, cat: str, args: dict):
+        self.trace = trace
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, *exc) -> bool:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.trace.add(self.name, self.cat, self.start, end, self.args)
+        return False
+
+    def set(self, **args) -> None:
+        """Attach values known only once the step has run (bytes written, a result)."""
+        self.args.update(args)
+
+
+class Trace:
+    """Spans recorded since the trace was started (the latest max_events of them), as
+    Chrome trace events."""
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self.origin = time.perf_counter_ns()
+        self.started_at = time.time()
+        self.events = collections.deque(maxlen=max_events)
+        self.dropped = 0
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict) -> None:
+        tid = threading.get_ident()
+        event = {"name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": tid,
+                 "ts": (start_ns - self.origin) / 1000, "dur": (end_ns - start_ns) / 1000}
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    def spans(self, cat: str | None = None, since_us: float = 0) -> list[dict]:
+        """Recorded events, optionally only those of category cat starting after since_us."""
+        with self._lock:
+            return [e for e in self.events if (cat is None or e["cat"] == cat) and e["ts"] >= since_us]
+
+    def to_json(self) -> dict:
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+        meta = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+                 "args": {"name": "RCA Launcher"}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms",
+                "otherData": {"started_at": int(self.started_at), "dropped_events": dropped}}
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f)
+        os.replace(tmp, path)
+
+
+def start(max_events: int = MAX_EVENTS) -> Trace:
+    """Start recording spans (a new trace replaces a running one)."""
+    global _trace
+    _trace = Trace(max_events)
+    return _trace
+
+
+def stop() -> Trace | None:
+    global _trace
+    trace, _trace = _trace, None
+    return trace
+
+
+def active() -> Trace | None:
+    return _trace
+
+
+def span(name: str, cat: str = "launcher", **args):
+    """Context manager timing the enclosed block as one span."""
+    trace = _trace
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name, cat, args)
+
+
+def session_path(trace_dir: str, trace: Trace) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(trace.started_at))
+    return os.path.join(str(trace_dir), f"{TRACE_PREFIX}{stamp}-{os.getpid()}{TRACE_SUFFIX}")
+
+
+def prune_traces(trace_dir: str, keep: int = KEEP_TRACES) -> None:
+    """Delete the oldest session traces beyond keep."""
+    try:
+        names = [n for n in os.listdir(trace_dir) if n.startswith(TRACE_PREFIX) and n.endswith(TRACE_SUFFIX)]
+    except OSError:
+        return
+    paths = sorted((os.path.join(trace_dir, n) for n in names), key=os.path.getmtime)
+    for path in paths[:max(len(paths) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
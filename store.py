@@ -0,0 +1,162 @@
+"""
+Shared read-only content store for RCA Launcher
+A machine-wide or NFS-mounted directory of objects named by SHA-1, shared by
+every user. Each user's game directory stays their own overlay: files found in
+the store are hardlinked (or symlinked) into it instead of downloaded, and
+anything else is a regular per-user file. Users with write access add what
+they download, holding a lock file per object so concurrent installs never
+fetch or write the same object twice.
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import time
+
+LINK_MODES = ("auto", "hardlink", "symlink", "copy")
+LOCK_SUFFIX = ".lock"
+LOCK_WAIT   = 60              # seconds to wait for another process populating an object
+LOCK_POLL   = 0.5
+LOCK_STALE  = 600             # a lock older than this belongs to a process that died
+
+
+class SharedStore:
+    def __init__(self, root: str, link_mode: str = "auto"):
+        self.root = str(root)
+        self.link_mode = link_mode if link_mode in LINK_MODES else "auto"
+        self._writable = None
+
+    def available(self) -> bool:
+        return os.path.isdir(os.path.join(self.root, "objects"))
+
+    def writable(self) -> bool:
+        if self._writable is None:
+            self._writable = os.access(os.path.join(self.root, "objects"), os.W_OK | os.X_OK)
+        return self._writable
+
+    def object_path(self, sha1: str) -> str:
+        return os.path.join(self.root, "objects", sha1[:2], sha1)
+
+    def link(self, sha1: str, dst: str, size: int | None = None, executable: bool = False,
+             verify: bool = False) -> bool:
+        """Put the object at dst, replacing whatever is there. False if the store does not
+        have it (with the right size and mode) or it cannot be placed. With verify the
+        object is hashed first, and evicted if it does not match."""
+        obj = self.object_path(sha1)
+        try:
+            st = os.stat(obj)
+        except OSError:
+            return False
+        if (size is not None and st.st_size != size) or (executable and not st.st_mode & 0o111):
+            return False
+        if verify and not self.check(sha1):
+            return False
+
+        tmp = dst + ".link"
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+            if not self._place(obj, tmp):
+                return False
+            os.replace(tmp, dst)
+        except OSError:
+            return False
+        return True
+
+    def check(self, sha1: str) -> bool:
+        """Hash the object. One that does not match (e.g. written through a hardlink in
+        someone's game folder) is removed so the next install downloads it again."""
+        obj = self.object_path(sha1)
+        h = hashlib.sha1()
+        try:
+            with open(obj, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+        except OSError:
+            return False
+        if h.hexdigest() == sha1:
+            return True
+        try:
+            os.remove(obj)
+        except OSError:
+            pass
+        return False
+
+    def _place(self, obj: str, tmp: str) -> bool:
+        # Hardlinks need the same filesystem (and, with protected_hardlinks, often
+        # ownership of the object); symlinks work across NFS; copying always works
+        if self.link_mode in ("auto", "hardlink"):
+            try:
+                os.link(obj, tmp)
+                return True
+            except OSError:
+                pass
+        if self.link_mode in ("auto", "symlink"):
+            try:
+                os.symlink(obj, tmp)
+                return True
+            except OSError:
+                pass
+        shutil.copyfile(obj, tmp)
+        return True
+
+    # -- Population --------------------------------------------------------
+
+    def claim(self, sha1: str) -> str | None:
+        """Take the lock for adding an object. Waits while another process holds it.
+        None if the store is read-only, the object has appeared, or waiting timed out."""
+        if not self.writable():
+            return None
+        obj = self.object_path(sha1)
+        lock = obj + LOCK_SUFFIX
+        deadline = time.monotonic() + LOCK_WAIT
+        while not os.path.isfile(obj):
+            try:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self._stale(lock):
+                    self.release(lock)
+                    continue
+                if time.monotonic() > deadline:
+                    return None
+                time.sleep(LOCK_POLL)
+                continue
+            except OSError:
+                return None
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{platform.node()} {os.getpid()}\n")
+            return lock
+        return None
+
+    @staticmethod
+    def _stale(lock: str) -> bool:
+        try:
+            return time.time() - os.stat(lock).st_mtime > LOCK_STALE
+        except OSError:
+            return False
+
+    @staticmethod
+    def release(lock: str) -> None:
+        try:
+            os.remove(lock)
+        except OSError:
+            pass
+
+    def publish(self, sha1: str, path: str, executable: bool = False) -> bool:
+        """Copy a verified file into the store as a read-only object."""
+        obj = self.object_path(sha1)
+        tmp = f"{obj}.{platform.node()}.{os.getpid()}.tmp"
+        try:
+            shutil.copyfile(path, tmp)
+            os.chmod(tmp, 0o555 if executable else 0o444)
+            os.replace(tmp, obj)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        return True
@@ -0,0 +1,47 @@
+import json
+import threading
+
+import pytest
+
+import installer
+import Launcher
+from downloader import DownloadEngine
+
+VERSION = {"id": "1.0", "assets": "1", "libraries": [], "mainClass": "net.minecraft.client.main.Main",
+           "javaVersion": {"component": "java-runtime-gamma", "majorVersion": 17},
+           "assetIndex": {"url": "https://meta.invalid/index.json"},
+           "downloads": {"client": {"url": "https://meta.invalid/client.jar"}}}
+
+
+class _NoJavaIndex:
+    def version_runtime(self, version_id, mc_dir):
+        return {"component": "java-runtime-gamma", "major": 17}
+
+    def pick_java(self, policy, component, major, mc_dir):
+        return None, ""
+
+    def save(self):
+        pass
+
+
+def test_cancel_during_runtime_install_stops_the_job(tmp_path, monkeypatch):
+    version = tmp_path / "versions" / "1.0"
+    version.mkdir(parents=True)
+    (version / "1.0.json").write_text(json.dumps(VERSION), encoding="utf-8")
+    monkeypatch.setattr(Launcher, "get_runtime_index", lambda: _NoJavaIndex())
+    monkeypatch.setattr(Launcher, "new_engine", lambda prefs: DownloadEngine(1))
+    versions_checked = []
+    monkeypatch.setattr(installer, "check_receipt", lambda *args: versions_checked.append(args) or True)
+
+    job = {"cancel": threading.Event()}
+    callback = Launcher._make_job_callback(job)
+
+    def install_runtime(component, mc_dir, engine, callback=None, index=None):
+        job["cancel"].set()
+        callback["setMax"](10)
+
+    monkeypatch.setattr(installer, "install_runtime", install_runtime)
+    with pytest.raises(Launcher._JobCancelled):
+        Launcher.prepare_version("1.0", str(tmp_path), {}, callback, quiet=True, defer=True, cat="background")
+    # The cancel is not mistaken for a broken runtime: the version step never runs
+    assert versions_checked == []
@@ -0,0 +1,29 @@
+import os
+
+import bundle
+import installer
+
+
+def _install(mc_dir) -> str:
+    jar = mc_dir / "versions" / "1.0" / "1.0.jar"
+    jar.parent.mkdir(parents=True)
+    jar.write_bytes(b"client jar")
+    installer.write_receipt_entries("1.0", str(mc_dir), [(str(jar), installer.sha1_file(str(jar)))])
+    return str(jar)
+
+
+def test_export_and_import_never_share_inodes(tmp_path):
+    source, target, bundle_dir = tmp_path / "source", tmp_path / "target", tmp_path / "bundle"
+    jar = _install(source)
+
+    summary = bundle.export_bundle(str(bundle_dir), str(source), ["1.0"], [])
+    obj = bundle._object_path(str(bundle_dir), installer.sha1_file(jar))
+    assert summary["added"] == 1
+    assert not os.path.samefile(obj, jar)
+
+    result = bundle.import_bundle(str(bundle_dir), str(target), 2)
+    imported = target / "versions" / "1.0" / "1.0.jar"
+    assert result["copied"] == 1 and result["linked"] == 0
+    assert imported.read_bytes() == b"client jar"
+    assert not os.path.samefile(obj, imported)
+    assert installer.check_receipt("1.0", str(target))
@@ -0,0 +1,88 @@
+import json
+import os
+
+from cleanup import ReferenceIndex
+from installer import NATIVES_CACHE, write_receipt_entries
+
+
+def _write(path, body: bytes = b"x") -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+    return str(path)
+
+
+def _version(mc_dir, version_id: str, libraries: list[str]) -> None:
+    data = {"id": version_id, "libraries": [{"name": f"x:{os.path.basename(p)}:1", "downloads": {"artifact": {"path": p}}}
+                                            for p in libraries]}
+    _write(os.path.join(mc_dir, "versions", version_id, f"{version_id}.json"), json.dumps(data).encode())
+
+
+def _index(tmp_path) -> tuple[ReferenceIndex, str]:
+    mc_dir = str(tmp_path / "mc")
+    os.makedirs(mc_dir)
+    return ReferenceIndex(str(tmp_path / "references.json"), mc_dir), mc_dir
+
+
+def test_unreferenced_files_of_installed_versions_are_collected(tmp_path):
+    index, mc_dir = _index(tmp_path)
+    kept = _write(os.path.join(mc_dir, "libraries", "a", "a.jar"))
+    dropped = _write(os.path.join(mc_dir, "libraries", "b", "b.jar"))
+    _version(mc_dir, "1.0", ["a/a.jar", "b/b.jar"])
+    write_receipt_entries("1.0", mc_dir, [(kept, None), (dropped, None)])
+    index.refresh()
+    index.seed()
+    assert index.collect(dry_run=True)["paths"] == []
+
+    # The new JSON stops using b.jar, which the receipt shows this launcher installed
+    _version(mc_dir, "1.0", ["a/a.jar"])
+    os.utime(os.path.join(mc_dir, "versions", "1.0", "1.0.json"), ns=(1, 1))
+    index.refresh()
+    report = index.collect(dry_run=True)
+    assert report["paths"] == ["libraries/b/b.jar"]
+    assert report["categories"]["libraries"] == {"files": 1, "bytes": 1}
+    assert os.path.exists(dropped)
+
+    index.collect(dry_run=False)
+    assert not os.path.exists(dropped)
+    assert not os.path.exists(os.path.dirname(dropped))
+    assert os.path.exists(kept)
+
+
+def test_files_from_other_launchers_are_only_reported(tmp_path):
+    index, mc_dir = _index(tmp_path)
+    ours = _write(os.path.join(mc_dir, "libraries", "ours", "old.jar"))
+    hashed = _write(os.path.join(mc_dir, "assets", "objects", "ab", "ab12"), b"asset")
+    foreign = _write(os.path.join(mc_dir, "libraries", "net", "forge", "forge.jar"), b"forge")
+    foreign_natives = os.path.join(mc_dir, NATIVES_CACHE, "other")
+    _write(os.path.join(foreign_natives, "lib.so"))
+    _write(os.path.join(mc_dir, "versions", "gone", "gone.journal"),
+           (json.dumps(["libraries/ours/old.jar", 1, 0, None]) + "\n").encode())
+
+    index.refresh()
+    index.seed([hashed])
+    report = index.collect(dry_run=True)
+    assert sorted(report["paths"]) == ["assets/objects/ab/ab12", "libraries/ours/old.jar"]
+    assert report["unknown"] == {"files": 2, "bytes": 6}
+
+    report = index.collect(dry_run=False)
+    assert report["unknown"] == {"files": 0, "bytes": 0}
+    assert not os.path.exists(ours) and not os.path.exists(hashed)
+    assert os.path.exists(foreign) and os.path.isdir(foreign_natives)
+
+
+def test_index_survives_reload(tmp_path):
+    index, mc_dir = _index(tmp_path)
+    lib = _write(os.path.join(mc_dir, "libraries", "a", "a.jar"))
+    _version(mc_dir, "1.0", ["a/a.jar"])
+    write_receipt_entries("1.0", mc_dir, [(lib, None)])
+    index.refresh()
+    index.seed()
+    index.save()
+
+    # Deleting the version leaves its library behind; a fresh index still knows it was ours
+    os.remove(os.path.join(mc_dir, "versions", "1.0", "1.0.json"))
+    reloaded = ReferenceIndex(index.path, mc_dir)
+    assert reloaded.seeded
+    reloaded.refresh()
+    assert reloaded.collect(dry_run=True)["paths"] == ["libraries/a/a.jar"]
@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+import Launcher
+
+
+def test_interrupted_save_keeps_the_previous_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Launcher, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(Launcher, "COMMAND_CACHE_FILE", tmp_path / "cache" / "commands.json")
+    Launcher._save_command_cache({"1.0|java": {"command": ["java"]}})
+    assert Launcher._load_command_cache() == {"1.0|java": {"command": ["java"]}}
+
+    def torn(obj, f, **kwargs):
+        f.write('{"1.1|java": {"comm')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(json, "dump", torn)
+    with pytest.raises(KeyboardInterrupt):
+        Launcher._save_command_cache({"1.1|java": {"command": ["java"]}})
+    assert Launcher._load_command_cache() == {"1.0|java": {"command": ["java"]}}
@@ -0,0 +1,73 @@
+import gzip
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import gamelog
+from gamelog import OutputCapture
+
+
+def _spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def _log_lines(capture: OutputCapture) -> list[str]:
+    with gzip.open(capture.base + gamelog.GZIP_SUFFIX, "rt", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_captures_both_streams_to_ring_and_log(tmp_path):
+    proc = _spawn("import sys; print('one'); print('two', file=sys.stderr); print('three')")
+    capture = OutputCapture(proc, tmp_path, "1.0")
+    seen = []
+    closed = threading.Event()
+    capture.add_listener(lambda stream, line: seen.append((stream, line)))
+    capture.add_close_listener(closed.set)
+    capture.start()
+    proc.wait()
+    capture.wait(5)
+
+    assert closed.is_set() and capture.finished()
+    lines = [(stream, line) for _, stream, line in capture.tail(10)]
+    assert sorted(lines) == sorted(seen) == [("stderr", "two"), ("stdout", "one"), ("stdout", "three")]
+    assert [seq for seq, _, _ in capture.tail(10)] == [1, 2, 3]
+    assert capture.since(2, 0) == capture.tail(1)
+    assert sorted(_log_lines(capture)) == ["[stderr] two", "one", "three"]
+    assert not os.path.exists(capture.path)
+
+
+def test_ring_keeps_only_the_last_lines(tmp_path):
+    proc = _spawn("for i in range(50): print(i)")
+    capture = OutputCapture(proc, tmp_path, "1.0", ring_lines=10).start()
+    proc.wait()
+    capture.wait(5)
+    assert [line for _, _, line in capture.tail(100)] == [str(i) for i in range(40, 50)]
+    assert [line for _, _, line in capture.tail(3)] == ["47", "48", "49"]
+
+
+def test_dropped_lines_are_marked_in_the_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(gamelog, "QUEUE_LINES", 5)
+    release = threading.Event()
+    opened = open
+
+    def slow_open(path, *args, **kwargs):
+        # Hold the writer back until the game has written everything
+        if str(path).endswith(gamelog.LOG_SUFFIX):
+            release.wait(10)
+        return opened(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", slow_open)
+    proc = _spawn("for i in range(20): print(i)")
+    capture = OutputCapture(proc, tmp_path, "1.0").start()
+    proc.wait()
+    deadline = time.monotonic() + 5
+    while capture.dropped < 15 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    capture.wait(5)
+
+    assert capture.dropped == 15
+    assert [line for _, _, line in capture.tail(100)] == [str(i) for i in range(20)]
+    assert _log_lines(capture) == ["0", "1", "2", "3", "4", "[15 lines dropped]"]
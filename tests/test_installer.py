@@ -0,0 +1,202 @@
+import os
+import platform
+import zipfile
+
+import installer
+
+
+def test_inherit_version_merges_child_into_parent():
+    parent = {"id": "1.20", "mainClass": "Main", "assets": "5",
+              "libraries": [{"name": "a:b:1"}, {"name": "c:d:2"}, {"name": "c:d:2:natives-linux"}],
+              "arguments": {"game": ["--parent"], "jvm": ["-Dparent"]}}
+    child = {"id": "loader", "inheritsFrom": "1.20", "mainClass": "Loader",
+             "libraries": [{"name": "a:b:3"}, {"name": "f:g:1"}],
+             "arguments": {"game": ["--child"]}}
+
+    merged = installer.inherit_version(child, parent)
+
+    assert [lib["name"] for lib in merged["libraries"]] == ["a:b:3", "f:g:1", "c:d:2", "c:d:2:natives-linux"]
+    assert merged["arguments"] == {"game": ["--parent", "--child"], "jvm": ["-Dparent"]}
+    assert merged["mainClass"] == "Loader"
+    assert merged["assets"] == "5"
+    assert parent["libraries"][0]["name"] == "a:b:1"
+
+
+def test_rules_allow_follows_os_rules():
+    here = installer._OS_NAMES.get(platform.system(), "other")
+    elsewhere = "osx" if here != "osx" else "windows"
+
+    assert installer.rules_allow([])
+    assert installer.rules_allow([{"action": "allow"}])
+    assert installer.rules_allow([{"action": "allow", "os": {"name": here}}])
+    assert not installer.rules_allow([{"action": "allow", "os": {"name": elsewhere}}])
+    assert not installer.rules_allow([{"action": "allow"}, {"action": "disallow", "os": {"name": here}}])
+    assert installer.rules_allow([{"action": "allow"}, {"action": "disallow", "os": {"name": elsewhere}}])
+    assert not installer.rules_allow([{"action": "allow", "features": {"is_demo_user": True}}])
+
+
+def _artifact(tmp_path, name: str, body: bytes) -> installer.Artifact:
+    path = tmp_path / "libraries" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    return installer.Artifact(f"https://example.invalid/{name}", str(path), installer.sha1_file(str(path)), len(body))
+
+
+def test_install_journal_survives_reopen(tmp_path):
+    art = _artifact(tmp_path, "a.jar", b"library")
+    journal_file = tmp_path / "v.journal"
+
+    journal = installer.InstallJournal(str(journal_file), str(tmp_path))
+    assert not journal.completed(art)
+    journal.record(art)
+    journal.close()
+
+    assert installer.InstallJournal(str(journal_file), str(tmp_path)).completed(art)
+
+
+def test_install_journal_rejects_changed_files_and_other_hashes(tmp_path):
+    art = _artifact(tmp_path, "a.jar", b"library")
+    journal = installer.InstallJournal(str(tmp_path / "v.journal"), str(tmp_path))
+    journal.record(art)
+    journal.close()
+
+    other = installer.Artifact(art.url, art.path, "0" * 40, art.size)
+    assert not journal.completed(other)
+
+    with open(art.path, "ab") as f:
+        f.write(b"!")
+    assert not installer.InstallJournal(str(tmp_path / "v.journal"), str(tmp_path)).completed(art)
+
+
+def test_install_journal_ignores_torn_last_line(tmp_path):
+    art = _artifact(tmp_path, "a.jar", b"library")
+    journal_file = tmp_path / "v.journal"
+    journal = installer.InstallJournal(str(journal_file), str(tmp_path))
+    journal.record(art)
+    journal.close()
+    with open(journal_file, "a", encoding="utf-8") as f:
+        f.write('["libraries/b.jar", 3')
+
+    reopened = installer.InstallJournal(str(journal_file), str(tmp_path))
+    assert reopened.completed(art)
+    reopened.discard()
+    assert not journal_file.exists()
+
+
+class _MetadataOnlyEngine:
+    """Serves JSON documents; any download fails the test."""
+    workers = 2
+
+    def __init__(self, documents: dict):
+        self.documents = documents
+        self.fetched = []
+
+    def get_json(self, url: str):
+        return self.documents[url]
+
+    def fetch(self, art, on_bytes=None):
+        raise AssertionError(f"unexpected download of {art.url}")
+
+    def fetch_all(self, artifacts, callback=None, on_done=None):
+        self.fetched += artifacts
+        return 0
+
+
+def _version_documents(client_sha1: str, client_size: int) -> dict:
+    return {
+        installer.VERSION_MANIFEST_URL: {"versions": [{"id": "1.0", "url": "https://meta.invalid/1.0.json"}]},
+        "https://meta.invalid/1.0.json": {
+            "id": "1.0", "assets": "1", "libraries": [],
+            "assetIndex": {"url": "https://meta.invalid/index.json", "sha1": "1" * 40, "size": 10},
+            "downloads": {"client": {"url": "https://meta.invalid/client.jar", "sha1": client_sha1,
+                                     "size": client_size}},
+        },
+        "https://meta.invalid/index.json": {"objects": {"icons/icon.png": {"hash": "ab" + "0" * 38, "size": 5}}},
+    }
+
+
+def test_dry_run_plan_reads_metadata_without_writing(tmp_path):
+    engine = _MetadataOnlyEngine(_version_documents("2" * 40, 7))
+
+    plan = installer.plan_version("1.0", str(tmp_path), engine, download=False)
+    report = installer.assess_plan(plan, engine.workers)
+
+    assert sorted(a.kind for a in report.missing) == ["asset", "client", "index"]
+    assert report.download_bytes == 22
+    assert not (tmp_path / "versions").exists()
+    assert not (tmp_path / "assets").exists()
+
+
+def test_check_only_verify_writes_nothing(tmp_path):
+    engine = _MetadataOnlyEngine(_version_documents("2" * 40, 7))
+
+    report = installer.verify_version("1.0", str(tmp_path), engine, repair=False, processes=1)
+
+    assert sum(c["missing"] for c in report.categories.values()) == 3
+    assert engine.fetched == []
+    assert not (tmp_path / "versions").exists()
+    assert not (tmp_path / "assets").exists()
+
+
+def test_assessed_plan_is_not_hashed_again(tmp_path, monkeypatch):
+    client = tmp_path / "versions" / "1.0" / "1.0.jar"
+    client.parent.mkdir(parents=True)
+    client.write_bytes(b"client!")
+    engine = _MetadataOnlyEngine(_version_documents(installer.sha1_file(str(client)), 7))
+    plan = installer.plan_version("1.0", str(tmp_path), engine, download=False)
+
+    hashed = []
+    real = installer.sha1_file
+    monkeypatch.setattr(installer, "sha1_file", lambda path: hashed.append(path) or real(path))
+    installer.assess_plan(plan, engine.workers)
+    assert hashed == [str(client)]
+
+    hashed.clear()
+    installer._fetch_stage(plan, plan.artifacts, engine, None, None)
+    assert hashed == []
+    assert sorted(a.kind for a in engine.fetched) == ["asset", "index"]
+
+
+def _natives_plan(tmp_path, body: bytes = b"native") -> installer.InstallPlan:
+    jar = tmp_path / "lwjgl-natives.jar"
+    with zipfile.ZipFile(jar, "w") as zf:
+        zf.writestr("liblwjgl.so", body)
+        zf.writestr("META-INF/MANIFEST.MF", "")
+    return installer.InstallPlan("1.0", str(tmp_path / "mc"), {}, [], [(str(jar), {"exclude": ["META-INF/"]})])
+
+
+def test_natives_are_replaced_whole(tmp_path):
+    plan = _natives_plan(tmp_path)
+    target = installer.extract_natives(plan)
+    assert sorted(os.listdir(target)) == [installer.NATIVES_COMPLETE, "liblwjgl.so"]
+
+    # An incomplete folder (no marker) and a forced repair are both swapped, never unpacked into
+    os.remove(os.path.join(target, installer.NATIVES_COMPLETE))
+    with open(os.path.join(target, "liblwjgl.so"), "wb") as f:
+        f.write(b"torn")
+    assert installer.extract_natives(plan) == target
+    with open(os.path.join(target, "liblwjgl.so"), "rb") as f:
+        assert f.read() == b"native"
+
+    with open(os.path.join(target, "stale.so"), "wb") as f:
+        f.write(b"old")
+    assert installer.extract_natives(plan, force=True) == target
+    assert sorted(os.listdir(target)) == [installer.NATIVES_COMPLETE, "liblwjgl.so"]
+    assert os.listdir(os.path.dirname(target)) == [os.path.basename(target)]
+
+
+def test_busy_natives_folder_moves_to_a_new_one(tmp_path, monkeypatch):
+    plan = _natives_plan(tmp_path)
+    target = installer.extract_natives(plan)
+    rename = os.rename
+
+    def busy(src, dst):
+        if src == target:
+            raise PermissionError(src)
+        rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", busy)
+    moved = installer.extract_natives(plan, force=True)
+    assert moved == f"{target}-1" == plan.natives_dir()
+    assert os.path.isfile(os.path.join(moved, installer.NATIVES_COMPLETE))
+    assert not os.path.exists(os.path.join(target, installer.NATIVES_COMPLETE))
@@ -0,0 +1,35 @@
+import jvm
+
+
+def _jdk(version: str) -> dict:
+    return {"home": f"/jdk/{version}", "java": f"/jdk/{version}/bin/java", "major": jvm.parse_major(version),
+            "version": version, "vendor": "", "arch": ""}
+
+
+def test_version_key_is_numeric():
+    assert jvm.version_key("17.0.10") > jvm.version_key("17.0.9")
+    assert jvm.version_key("1.8.0_392") > jvm.version_key("1.8.0_41")
+    assert jvm.version_key("") == ()
+
+
+def test_parse_major():
+    assert jvm.parse_major("1.8.0_392") == 8
+    assert jvm.parse_major("17.0.9") == 17
+    assert jvm.parse_major("21") == 21
+    assert jvm.parse_major("") is None
+
+
+def test_pick_compatible_prefers_newest_exact_build():
+    jdks = [_jdk("17.0.10"), _jdk("17.0.9"), _jdk("21.0.2")]
+    assert jvm.pick_compatible(jdks, 17)["version"] == "17.0.10"
+
+
+def test_pick_compatible_falls_back_to_closest_newer_major():
+    jdks = [_jdk("8.0.392"), _jdk("22.0.1"), _jdk("21.0.10"), _jdk("21.0.9")]
+    assert jvm.pick_compatible(jdks, 17)["version"] == "21.0.10"
+
+
+def test_pick_compatible_never_substitutes_for_old_versions():
+    assert jvm.pick_compatible([_jdk("11.0.2"), _jdk("17.0.9")], 8) is None
+    assert jvm.pick_compatible([_jdk("11.0.2")], 17) is None
+    assert jvm.pick_compatible([], 21) is None
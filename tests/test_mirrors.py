@@ -0,0 +1,116 @@
+import hashlib
+import lzma
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from downloader import Artifact, DownloadEngine, MirrorSet
+
+BODY = b"library bytes " * 100
+ORIGIN_URL = "https://libraries.minecraft.net/com/example/lib/1.0/lib-1.0.jar"
+PATH = "/libraries/com/example/lib/1.0/lib-1.0.jar"
+
+
+def _serve(files: dict | None, fallback: bytes | None = None):
+    """Local stand-in for a mirror: serves files by path, fallback (if set) for anything else."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = (files or {}).get(self.path, fallback)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def hosts():
+    good, good_url = _serve({PATH: BODY})
+    corrupt, corrupt_url = _serve(None, fallback=b"not the library")
+    empty, empty_url = _serve({})
+    yield {"good": good_url, "corrupt": corrupt_url, "empty": empty_url}
+    for server in (good, corrupt, empty):
+        server.shutdown()
+        server.server_close()
+
+
+def _artifact(tmp_path, name: str = "lib.jar") -> Artifact:
+    return Artifact(ORIGIN_URL, str(tmp_path / name), hashlib.sha1(BODY).hexdigest(), len(BODY), kind="library")
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_failover_skips_corrupt_and_missing_mirrors(tmp_path, hosts):
+    mirrors = MirrorSet({"libraries": [hosts["corrupt"] + "/libraries", hosts["empty"] + "/libraries",
+                                       hosts["good"] + "/libraries"]})
+    corrupt, empty, good = (mirrors.health(hosts[n] + "/libraries") for n in ("corrupt", "empty", "good"))
+
+    with DownloadEngine(2, mirrors=mirrors) as engine:
+        engine.fetch(_artifact(tmp_path))
+
+    assert (tmp_path / "lib.jar").read_bytes() == BODY
+    assert corrupt.failures == 1 and corrupt.latency is None
+    assert empty.misses == 1 and empty.failures == 0
+    assert good.failures == 0 and good.latency is not None
+
+    # A second bad download puts the corrupt mirror on cooldown, behind even the origin
+    with DownloadEngine(2, mirrors=mirrors) as engine:
+        engine.fetch(_artifact(tmp_path, "again.jar"))
+    assert corrupt.down()
+    order = [host for host, _ in mirrors.candidates(_artifact(tmp_path))]
+    assert order == [hosts["empty"] + "/libraries", hosts["good"] + "/libraries",
+                     "https://libraries.minecraft.net", hosts["corrupt"] + "/libraries"]
+
+
+def test_probe_requests_an_artifact_and_scores_hosts(tmp_path, hosts):
+    dead = _closed_port_url()
+    bases = [hosts["good"] + "/libraries", hosts["empty"] + "/libraries", dead + "/libraries"]
+    mirrors = MirrorSet({"libraries": bases}, tmp_path / "mirrors.json")
+    # A successful download teaches the set what to probe
+    mirrors.remember_probe(_artifact(tmp_path))
+
+    results = mirrors.probe(requests.Session(), hosts=bases)
+
+    assert results[bases[0]] is not None
+    assert results[bases[1]] is None and mirrors.health(bases[1]).misses == 1
+    assert results[bases[2]] is None and mirrors.health(bases[2]).failures == 1
+    assert mirrors.health(bases[0]).score() is not None
+
+    mirrors.save()
+    reloaded = MirrorSet({"libraries": bases}, tmp_path / "mirrors.json")
+    assert reloaded.health(bases[0]).latency == mirrors.health(bases[0]).latency
+    assert (bases[0], bases[0] + PATH[len("/libraries"):]) in reloaded.probe_targets()
+
+
+def test_corrupt_lzma_body_fails_over(tmp_path):
+    path = "/libraries/com/example/lib/1.0/lib-1.0.jar.lzma"
+    corrupt, corrupt_url = _serve({path: b"\xfd7zXZ\x00 not really xz"})
+    good, good_url = _serve({path: lzma.compress(BODY)})
+    try:
+        mirrors = MirrorSet({"libraries": [corrupt_url + "/libraries", good_url + "/libraries"]})
+        art = Artifact(ORIGIN_URL + ".lzma", str(tmp_path / "lib.jar"), hashlib.sha1(BODY).hexdigest(),
+                       len(BODY), kind="library", lzma=True)
+        with DownloadEngine(1, mirrors=mirrors) as engine:
+            engine.fetch(art)
+        assert (tmp_path / "lib.jar").read_bytes() == BODY
+        assert mirrors.health(corrupt_url + "/libraries").failures == 1
+    finally:
+        for server in (corrupt, good):
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,101 @@
+import json
+import socket
+import time
+
+import pytest
+
+import downloader
+import installer
+import jvm
+import Launcher
+from downloader import DownloadEngine, MetadataCache, OfflineError, offline_guard
+
+MANIFEST = {"versions": [{"id": "1.0", "url": "https://meta.invalid/1.0.json"}]}
+VERSION = {
+    "id": "1.0", "assets": "1", "libraries": [], "mainClass": "net.minecraft.client.main.Main",
+    "javaVersion": {"component": "java-runtime-gamma", "majorVersion": 17},
+    "assetIndex": {"url": "https://meta.invalid/index.json"},
+    "downloads": {"client": {"url": "https://meta.invalid/client.jar"}},
+}
+
+
+@pytest.fixture
+def network_calls(monkeypatch):
+    """Counts every connect and DNS lookup, including the ones the guard blocks."""
+    downloader._install_socket_guard()
+    calls = []
+
+    def counting(name, real):
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return real(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(socket.socket, "connect", counting("connect", socket.socket.connect))
+    monkeypatch.setattr(socket, "getaddrinfo", counting("getaddrinfo", socket.getaddrinfo))
+    return calls
+
+
+@pytest.fixture
+def mc_dir(tmp_path):
+    root = tmp_path / "minecraft"
+    version = root / "versions" / "1.0"
+    version.mkdir(parents=True)
+    (version / "1.0.json").write_text(json.dumps(VERSION), encoding="utf-8")
+    (version / "1.0.jar").write_bytes(b"client")
+    indexes = root / "assets" / "indexes"
+    indexes.mkdir(parents=True)
+    (indexes / "1.json").write_text(json.dumps({"objects": {}}), encoding="utf-8")
+    plan = installer.plan_version("1.0", str(root), None)
+    installer.write_receipt("1.0", str(root), plan.artifacts, [installer.version_json_path(str(root), "1.0")])
+    return str(root)
+
+
+def test_cached_metadata_is_served_without_network(tmp_path, network_calls):
+    cache = MetadataCache(str(tmp_path / "http"), ttl=60)
+    cache.store(installer.VERSION_MANIFEST_URL, MANIFEST)
+    # Long expired: offline it is still used rather than revalidated
+    stale = "https://meta.invalid/stale.json"
+    cache.store(stale, {"stale": True})
+    entry = cache.load(stale)
+    entry["fetched"] = time.time() - 3600
+    with open(cache._path(stale), "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+    with DownloadEngine(2, metadata=cache) as engine, offline_guard():
+        assert engine.get_json(installer.VERSION_MANIFEST_URL) == MANIFEST
+        assert engine.get_json(stale) == {"stale": True}
+        with pytest.raises(OfflineError):
+            engine.get_json("https://meta.invalid/uncached.json")
+
+    assert network_calls == []
+
+
+def test_uncached_download_raises_offline_error(tmp_path, network_calls):
+    art = downloader.Artifact("https://meta.invalid/client.jar", str(tmp_path / "client.jar"))
+    with DownloadEngine(2) as engine, offline_guard():
+        with pytest.raises(OfflineError):
+            engine.fetch(art)
+    assert not (tmp_path / "client.jar").exists()
+
+
+def test_receipt_and_launch_command_path_opens_no_socket(mc_dir, tmp_path, monkeypatch, network_calls):
+    monkeypatch.setattr(Launcher, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(Launcher, "COMMAND_CACHE_FILE", tmp_path / "cache" / "commands.json")
+    options = {"executablePath": "java", "nativesDirectory": str(tmp_path / "natives")}
+    template = ["java", "-cp", "client.jar", VERSION["mainClass"], "--username", "{username}",
+                "--uuid", "{uuid}", "--accessToken", "{token}"]
+    Launcher._save_command_cache({"1.0|java": {"fingerprint": Launcher._command_fingerprint("1.0", mc_dir, options),
+                                               "command": template}})
+    auth = {"name": "Steve", "uuid": "0000", "access_token": "token"}
+
+    with offline_guard():
+        assert installer.check_receipt("1.0", mc_dir)
+        runtime = jvm.RuntimeIndex(str(tmp_path / "runtimes.json")).version_runtime("1.0", mc_dir)
+        plan = installer.plan_version("1.0", mc_dir, DownloadEngine(2))
+        cmd = Launcher.get_launch_command("1.0", mc_dir, options, auth)
+
+    assert runtime == {"component": "java-runtime-gamma", "major": 17}
+    assert [a.kind for a in plan.artifacts] == ["client", "index"]
+    assert cmd[-5:] == ["Steve", "--uuid", "0000", "--accessToken", "token"]
+    assert network_calls == []
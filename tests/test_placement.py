@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import placement
+
+
+def test_parse_and_format_cpus():
+    assert placement.parse_cpus("0-3,6") == [0, 1, 2, 3, 6]
+    assert placement.parse_cpus(" 2, 0 ,1,") == [0, 1, 2]
+    assert placement.parse_cpus([3, 1, 1]) == [1, 3]
+    assert placement.format_cpus([6, 0, 1, 2, 3]) == "0-3,6"
+    assert placement.format_cpus([1, 3, 4]) == "1,3-4"
+    assert placement.parse_cpus(placement.format_cpus([0, 2, 3, 4, 9])) == [0, 2, 3, 4, 9]
+
+
+def test_parse_size():
+    assert placement.parse_size(6442450944) == 6 << 30
+    assert placement.parse_size("6G") == 6 << 30
+    assert placement.parse_size("512m") == 512 << 20
+    assert placement.parse_size("1.5GB") == 3 << 29
+    assert placement.parse_size("1024K") == 1 << 20
+    assert placement.parse_size("4096") == 4096
+    with pytest.raises(ValueError):
+        placement.parse_size("lots")
+
+
+def test_parse_ionice():
+    assert placement.parse_ionice("idle") == (3, 4)
+    assert placement.parse_ionice("best-effort:6") == (2, 6)
+    with pytest.raises(ValueError):
+        placement.parse_ionice("fast")
+
+
+def test_cgroup_shim_joins_before_exec(tmp_path):
+    spawn = placement.Placement(cgroup=str(tmp_path))
+    placement._wrap(spawn)
+    cmd = spawn.command([sys.executable, "-c", "import os; print(os.getpid())"])
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    # The shim execs the game, so the pid written to cgroup.procs is the game's own
+    assert (tmp_path / "cgroup.procs").read_text().strip() == out.strip()
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+def test_wrapped_command_starts_placed():
+    spawn = placement.build_placement({"affinity": [0], "nice": os.getpriority(os.PRIO_PROCESS, 0) + 3})
+    probe = "import os; print(sorted(os.sched_getaffinity(0)), os.getpriority(os.PRIO_PROCESS, 0))"
+    out = subprocess.run(spawn.command([sys.executable, "-c", probe]), capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["[0]", str(spawn.nice)]
+
+    # Without the tools the launcher applies the same settings to the running process
+    late = placement.Placement(affinity=[0], nice=spawn.nice, late=["affinity", "nice"])
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        late.apply(proc.pid)
+        assert os.sched_getaffinity(proc.pid) == {0}
+        assert os.getpriority(os.PRIO_PROCESS, proc.pid) == spawn.nice
+    finally:
+        proc.kill()
+        proc.wait()
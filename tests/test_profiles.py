@@ -0,0 +1,31 @@
+import os
+
+import profiles
+
+
+def _fake_java(tmp_path, version: str) -> str:
+    java = tmp_path / version / "java"
+    java.parent.mkdir()
+    java.write_text(f"#!/bin/sh\necho 'openjdk version \"{version}\" 2024-01-16' >&2\n")
+    os.chmod(java, 0o755)
+    return str(java)
+
+
+def test_binary_major_reads_the_java_that_runs(tmp_path):
+    assert profiles.binary_major(_fake_java(tmp_path, "21.0.2"), 17) == 21
+    assert profiles.binary_major(_fake_java(tmp_path, "1.8.0_392"), 17) == 8
+    assert profiles.binary_major(str(tmp_path / "missing"), 17) == 17
+
+
+def test_gc_gated_on_binary_not_requirement(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, "memory_info", lambda: (16384, 8192))
+    monkeypatch.setattr(profiles, "running_instances", lambda: 0)
+    prefs = {"jvm_profile": "low-latency"}
+
+    # A version that asks for Java 17 launched on a system JDK 21 gets generational ZGC
+    profile = profiles.resolve_profile(prefs, "1.20", _fake_java(tmp_path, "21.0.2"), 17)
+    assert profile.gc == "zgc"
+    assert "-XX:+ZGenerational" in profile.options
+    # ...and one on an older JDK than the requirement claims does not get ZGC at all
+    profile = profiles.resolve_profile(prefs, "1.20", _fake_java(tmp_path, "11.0.22"), 17)
+    assert profile.gc != "zgc"
@@ -0,0 +1,24 @@
+import spans
+
+
+def test_no_trace_means_shared_no_op():
+    assert spans.active() is None
+    with spans.span("x") as s:
+        s.set(bytes=1)
+    assert spans.span("x") is spans.span("y")
+
+
+def test_trace_keeps_the_latest_events():
+    trace = spans.start(max_events=3)
+    try:
+        for i in range(5):
+            with spans.span(f"step{i}", "launch" if i % 2 else "background", i=i):
+                pass
+    finally:
+        assert spans.stop() is trace
+    assert [e["name"] for e in trace.spans()] == ["step2", "step3", "step4"]
+    assert [e["name"] for e in trace.spans("background")] == ["step2", "step4"]
+    assert trace.dropped == 2
+    data = trace.to_json()
+    assert data["otherData"]["dropped_events"] == 2
+    assert [e["name"] for e in data["traceEvents"] if e["ph"] == "X"] == ["step2", "step3", "step4"]
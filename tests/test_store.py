@@ -0,0 +1,162 @@
+import hashlib
+import os
+import threading
+import time
+
+import store
+from downloader import Artifact, DownloadEngine
+from store import SharedStore
+
+SHA1 = "ab" + "1" * 38
+
+
+def _store(tmp_path, link_mode: str = "auto") -> SharedStore:
+    (tmp_path / "store" / "objects").mkdir(parents=True)
+    return SharedStore(str(tmp_path / "store"), link_mode)
+
+
+def _publish(shared: SharedStore, tmp_path, body: bytes = b"object", executable: bool = False,
+             sha1: str = SHA1) -> None:
+    src = tmp_path / "downloaded"
+    src.write_bytes(body)
+    lock = shared.claim(sha1)
+    assert lock is not None
+    try:
+        assert shared.publish(sha1, str(src), executable)
+    finally:
+        shared.release(lock)
+
+
+def test_unavailable_without_objects_folder(tmp_path):
+    assert not SharedStore(str(tmp_path / "missing")).available()
+    assert _store(tmp_path).available()
+
+
+def test_link_places_published_object(tmp_path):
+    shared = _store(tmp_path)
+    dst = tmp_path / "mc" / "libraries" / "a.jar"
+    assert not shared.link(SHA1, str(dst))
+
+    _publish(shared, tmp_path)
+    assert shared.link(SHA1, str(dst), size=6)
+    assert dst.read_bytes() == b"object"
+    assert os.path.samefile(dst, shared.object_path(SHA1))
+    assert os.stat(shared.object_path(SHA1)).st_mode & 0o222 == 0
+    assert not os.path.exists(str(dst) + ".link")
+
+
+def test_link_rejects_wrong_size_and_mode(tmp_path):
+    shared = _store(tmp_path)
+    _publish(shared, tmp_path)
+    dst = tmp_path / "mc" / "a.jar"
+    assert not shared.link(SHA1, str(dst), size=7)
+    assert not shared.link(SHA1, str(dst), executable=True)
+    assert not dst.exists()
+
+
+def test_copy_mode_never_shares_the_inode(tmp_path):
+    shared = _store(tmp_path, "copy")
+    _publish(shared, tmp_path)
+    dst = tmp_path / "mc" / "a.jar"
+    assert shared.link(SHA1, str(dst))
+    assert not os.path.samefile(dst, shared.object_path(SHA1))
+
+
+def test_claim_waits_for_holder_and_breaks_stale_locks(tmp_path, monkeypatch):
+    shared = _store(tmp_path)
+    monkeypatch.setattr(store, "LOCK_WAIT", 0.2)
+    monkeypatch.setattr(store, "LOCK_POLL", 0.05)
+
+    lock = shared.claim(SHA1)
+    assert lock is not None
+    assert shared.claim(SHA1) is None
+
+    old = os.stat(lock).st_mtime - store.LOCK_STALE - 1
+    os.utime(lock, (old, old))
+    again = shared.claim(SHA1)
+    assert again == lock
+    shared.release(again)
+
+
+def test_claim_returns_none_once_object_exists(tmp_path):
+    shared = _store(tmp_path)
+    _publish(shared, tmp_path)
+    assert shared.claim(SHA1) is None
+
+
+def test_verified_link_evicts_corrupt_object(tmp_path):
+    body = b"object"
+    sha1 = hashlib.sha1(body).hexdigest()
+    shared = _store(tmp_path)
+    _publish(shared, tmp_path, body, sha1=sha1)
+    dst = tmp_path / "mc" / "a.jar"
+    assert shared.link(sha1, str(dst), verify=True)
+
+    # A write through the hardlink in the game folder corrupts the object itself
+    os.chmod(dst, 0o644)
+    dst.write_bytes(b"broken")
+    assert shared.link(sha1, str(dst), size=6)
+    assert not shared.link(sha1, str(dst), size=6, verify=True)
+    assert not os.path.exists(shared.object_path(sha1))
+
+
+def test_repair_fetch_replaces_corrupt_store_object(tmp_path, monkeypatch):
+    body = b"object"
+    sha1 = hashlib.sha1(body).hexdigest()
+    shared = _store(tmp_path)
+    obj = shared.object_path(sha1)
+    os.makedirs(os.path.dirname(obj))
+    with open(obj, "wb") as f:
+        f.write(b"broken")
+    dst = tmp_path / "mc" / "a.jar"
+    art = Artifact("https://example.invalid/a.jar", str(dst), sha1, len(body))
+
+    def download(self, art, on_bytes, flight):
+        os.makedirs(os.path.dirname(art.path), exist_ok=True)
+        with open(art.path, "wb") as f:
+            f.write(body)
+        return len(body)
+
+    monkeypatch.setattr(DownloadEngine, "_download", download)
+    with DownloadEngine(workers=1, store=shared) as engine:
+        done = []
+        engine.fetch_all([art], on_done=done.append, verify=True)
+    assert done == [art]
+    assert dst.read_bytes() == body
+    with open(obj, "rb") as f:
+        assert f.read() == body
+
+
+def test_followers_see_the_leaders_store_failure(tmp_path):
+    entered, release = threading.Event(), threading.Event()
+
+    calls = []
+
+    class BrokenStore:
+        def link(self, *args):
+            calls.append(args)
+            entered.set()
+            release.wait(5)
+            raise RuntimeError("store went away")
+
+    art = Artifact("https://example.invalid/a.jar", str(tmp_path / "a.jar"), SHA1, 6)
+    errors = []
+
+    def fetch(engine):
+        try:
+            engine.fetch(art)
+        except RuntimeError as e:
+            errors.append(e)
+
+    with DownloadEngine(workers=2, store=BrokenStore()) as engine:
+        leader = threading.Thread(target=fetch, args=(engine,))
+        leader.start()
+        assert entered.wait(5)
+        follower = threading.Thread(target=fetch, args=(engine,))
+        follower.start()
+        time.sleep(0.2)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+    # The follower waited on the leader's download and got its error instead of a silent success
+    assert len(calls) == 1 and len(errors) == 2
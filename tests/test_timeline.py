@@ -0,0 +1,57 @@
+import time
+
+import timeline
+from timeline import LaunchHistory, TimelineParser, summarize
+
+
+def _entry(version: str, title: int | None, prepare_ms: int = 0, profile: str = "throughput") -> dict:
+    milestones = {"user": 100} if title is None else {"user": 100, timeline.TITLE: title}
+    return {"version": version, "profile": profile, "prepare_ms": prepare_ms, "milestones": milestones}
+
+
+def test_parser_stamps_each_milestone_once():
+    parser = TimelineParser(time.monotonic() - 2)
+    assert parser.feed("[main/INFO]: Setting user: Steve") == "user"
+    assert parser.feed("[main/INFO]: Setting user: Alex") is None
+    assert parser.feed("[Render thread/INFO]: Backend library: LWJGL version 3.3.1") == "backend"
+    assert parser.feed("[Render thread/INFO]: Narrator library for x64 successfully loaded") is None
+    assert parser.feed("[Render thread/INFO]: Reloading ResourceManager: vanilla") == "reload"
+    assert set(parser.milestones) == {"user", "backend", "reload"}
+    assert all(1900 <= ms < 10000 for ms in parser.milestones.values())
+    assert parser.milestones["user"] <= parser.milestones["backend"] <= parser.milestones["reload"]
+
+
+def test_summary_times_run_from_spawn():
+    # The same game start behind a slow and a fast download: the preparation is its own column
+    rows = summarize([_entry("1.20", 9000, prepare_ms=60000), _entry("1.20", 9400, prepare_ms=500),
+                      _entry("1.20", 9200, prepare_ms=800)])
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row["last_ms"], row["median_ms"], row["best_ms"], row["baseline_ms"]) == (9200, 9200, 9000, 9200)
+    assert not row["regression"]
+    assert (row["prepare_ms"], row["median_prepare_ms"]) == (800, 800)
+
+
+def test_summary_flags_regressions_per_version_and_profile():
+    launches = [_entry("1.20", 10000), _entry("1.20", 10400), _entry("1.19", 5000),
+                _entry("1.20", 10200, profile="low-latency"), _entry("1.20", 12500), _entry("1.20", None)]
+    rows = {(r["version"], r["profile"]): r for r in summarize(launches)}
+    assert set(rows) == {("1.19", "throughput"), ("1.20", "low-latency"), ("1.20", "throughput")}
+    # A launch that never reached the title screen is counted but not timed
+    row = rows[("1.20", "throughput")]
+    assert row["runs"] == 4 and row["last_ms"] is None and not row["regression"]
+
+    row = summarize(launches[:2] + [launches[4]])[0]
+    assert row["baseline_ms"] == 10200 and row["last_ms"] == 12500 and row["regression"]
+    assert summarize(launches[:1] + [launches[4]])[0]["baseline_ms"] is None
+
+
+def test_history_keeps_launches_across_reloads(tmp_path):
+    path = tmp_path / "cache" / "timeline.json"
+    history = LaunchHistory(path)
+    history.record("1.20", "throughput", "g1", "off", 1200, {timeline.TITLE: 8000}, 0)
+    history.record("1.19", None, None, "shared", 300, {}, 1)
+    history.save()
+    reloaded = LaunchHistory(path)
+    assert [e["version"] for e in reloaded.launches()] == ["1.20", "1.19"]
+    assert reloaded.launches("1.20")[0]["milestones"] == {timeline.TITLE: 8000}
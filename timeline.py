@@ -0,0 +1,145 @@
+"""
+Startup timeline for RCA Launcher
+The time until Popen returns says little about how long a launch feels: the
+JVM still has to load the game, open the window and reload every resource
+pack. The client log marks each of those steps, so the captured output is
+matched line by line against a few milestones and each one is stamped with
+the time since the game was spawned. Every launch adds its timeline to a
+history file, per version and JVM profile, so a version or flag change that
+makes the game slower to reach the title screen shows up in the summary.
+The time spent preparing the launch (Java check, installs and downloads) is
+kept as its own column: it depends on the network, not on the game.
+"""
+
+import json
+import os
+import re
+import statistics
+import threading
+import time
+
+from cds import STARTUP_MARKER
+
+HISTORY_FORMAT    = 1
+HISTORY_LIMIT     = 500       # launches kept, oldest dropped first
+REGRESSION_FACTOR = 1.15      # slower than the previous runs' median by this much = regression
+BASELINE_RUNS     = 2         # previous runs needed before a regression is reported
+
+# In the order the client logs them; the last one is the title screen
+MILESTONES = [
+    ("user",    re.compile(r"Setting user: ")),
+    ("backend", re.compile(r"Backend library: ")),
+    ("reload",  re.compile(r"Reloading ResourceManager")),
+    ("sound",   re.compile(r"Sound engine started")),
+    ("title",   STARTUP_MARKER),
+]
+TITLE = "title"
+
+
+class TimelineParser:
+    """Stamps each milestone the first time one of its lines is seen. Safe to feed from
+    several reader threads; once every milestone is found lines are not matched at all."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.milestones = {}
+        self._pending = list(MILESTONES)
+        self._lock = threading.Lock()
+
+    def feed(self, line: str) -> str | None:
+        """The milestone this line marks (stamped now), or None."""
+        if not self._pending:
+            return None
+        for name, pattern in self._pending:
+            if pattern.search(line):
+                break
+        else:
+            return None
+        with self._lock:
+            if name in self.milestones:
+                return None
+            self.milestones[name] = int((time.monotonic() - self.started) * 1000)
+            self._pending = [m for m in self._pending if m[0] != name]
+        return name
+
+
+def title_ms(entry: dict) -> int | None:
+    """Time from spawning the game to the title screen, or None if it was never reached."""
+    return entry["milestones"].get(TITLE)
+
+
+class LaunchHistory:
+    """Timelines of past launches, oldest first, stored in one JSON file."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._data is None:
+            data = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if data.get("format") != HISTORY_FORMAT:
+                data = {"format": HISTORY_FORMAT, "launches": []}
+            self._data = data
+        return self._data
+
+    def record(self, version_id: str, profile: str | None, gc: str | None, cds_mode: str,
+               prepare_ms: int, milestones: dict, exit_code: int | None) -> dict:
+        entry = {"version": version_id, "profile": profile, "gc": gc, "cds": cds_mode,
+                 "at": int(time.time()), "prepare_ms": prepare_ms,
+                 "milestones": dict(milestones), "exit": exit_code}
+        with self._lock:
+            launches = self._load()["launches"]
+            launches.append(entry)
+            del launches[:-HISTORY_LIMIT]
+        return entry
+
+    def launches(self, version_id: str | None = None) -> list[dict]:
+        with self._lock:
+            return [dict(e) for e in self._load()["launches"]
+                    if version_id is None or e["version"] == version_id]
+
+    def save(self) -> None:
+        with self._lock:
+            if self._data is None:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+
+
+def summarize(launches: list[dict]) -> list[dict]:
+    """One row per (version, profile): {"version", "profile", "runs", "last", "last_ms",
+    "median_ms", "best_ms", "baseline_ms", "regression", "prepare_ms", "median_prepare_ms"}.
+    The *_ms times are from spawn to the title screen and the baseline is the median of
+    the runs before the last one; only launches that reached the title screen count.
+    prepare_ms (the last launch's) and median_prepare_ms cover the time before spawn."""
+    groups = {}
+    for entry in launches:
+        groups.setdefault((entry["version"], entry["profile"] or "-"), []).append(entry)
+    rows = []
+    for (version, profile), entries in sorted(groups.items()):
+        times = [ms for ms in map(title_ms, entries) if ms is not None]
+        previous = [ms for ms in map(title_ms, entries[:-1]) if ms is not None]
+        baseline = statistics.median(previous) if len(previous) >= BASELINE_RUNS else None
+        last_ms = title_ms(entries[-1])
+        prepares = [e["prepare_ms"] for e in entries if e.get("prepare_ms") is not None]
+        rows.append({
+            "version": version, "profile": profile, "runs": len(entries), "last": entries[-1],
+            "last_ms": last_ms,
+            "median_ms": int(statistics.median(times)) if times else None,
+            "best_ms": min(times) if times else None,
+            "baseline_ms": int(baseline) if baseline is not None else None,
+            "regression": bool(baseline and last_ms and last_ms > baseline * REGRESSION_FACTOR),
+            "prepare_ms": entries[-1].get("prepare_ms"),
+            "median_prepare_ms": int(statistics.median(prepares)) if prepares else None,
+        })
+    return rows
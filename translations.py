@@ -69,6 +69,15 @@ STRINGS = {
         "ru": "Выйти из аккаунта",
         "zh": "注销",
     },
+    "menu.last_launch": {
+        "it": "Ultimo avvio ({version}): {ms} ms",
+        "en": "Last launch ({version}) took {ms} ms",
+        "fr": "Le dernier lancement ({version}) a pris {ms} ms",
+        "es": "El último inicio ({version}) tardó {ms} ms",
+        "de": "Letzter Start ({version}) dauerte {ms} ms",
+        "ru": "Последний запуск ({version}) занял {ms} мс",
+        "zh": "上次启动 ({version}) 用时 {ms} ms",
+    },
     "menu.exit": {
         "it": "Esci",
         "en": "Exit",
@@ -118,6 +127,51 @@ STRINGS = {
         "ru": "Сменить язык",
         "zh": "更换语言",
     },
+    "settings.change_java": {
+        "it": "Criterio Java",
+        "en": "Java policy",
+        "fr": "Politique Java",
+        "es": "Política de Java",
+        "de": "Java-Richtlinie",
+        "ru": "Политика Java",
+        "zh": "Java 策略",
+    },
+    "settings.offline": {
+        "it": "Modalità offline",
+        "en": "Offline mode",
+        "fr": "Mode hors ligne",
+        "es": "Modo sin conexión",
+        "de": "Offline-Modus",
+        "ru": "Офлайн-режим",
+        "zh": "离线模式",
+    },
+    "settings.jvm_profile": {
+        "it": "Profilo JVM",
+        "en": "JVM profile",
+        "fr": "Profil JVM",
+        "es": "Perfil de JVM",
+        "de": "JVM-Profil",
+        "ru": "Профиль JVM",
+        "zh": "JVM 配置",
+    },
+    "settings.on": {
+        "it": "Attiva",
+        "en": "On",
+        "fr": "Activé",
+        "es": "Activado",
+        "de": "An",
+        "ru": "Вкл",
+        "zh": "开",
+    },
+    "settings.off": {
+        "it": "Disattiva",
+        "en": "Off",
+        "fr": "Désactivé",
+        "es": "Desactivado",
+        "de": "Aus",
+        "ru": "Выкл",
+        "zh": "关",
+    },
     "settings.current": {
         "it": "attuale",
         "en": "current",
@@ -165,6 +219,33 @@ STRINGS = {
         "ru": "Нет привязанного аккаунта",
         "zh": "未关联账户",
     },
+    "header.bg_progress": {
+        "it": "{pct}% pronto",
+        "en": "{pct}% ready",
+        "fr": "{pct}% prêt",
+        "es": "{pct}% listo",
+        "de": "{pct}% bereit",
+        "ru": "{pct}% готово",
+        "zh": "{pct}% 就绪",
+    },
+    "header.bg_ready": {
+        "it": "pronto",
+        "en": "ready",
+        "fr": "prêt",
+        "es": "listo",
+        "de": "bereit",
+        "ru": "готово",
+        "zh": "就绪",
+    },
+    "header.bg_failed": {
+        "it": "preparazione fallita",
+        "en": "preparation failed",
+        "fr": "préparation échouée",
+        "es": "preparación fallida",
+        "de": "Vorbereitung fehlgeschlagen",
+        "ru": "подготовка не удалась",
+        "zh": "准备失败",
+    },
 
     # ── Version selector ────────────────────────────────────────────────
     "version.title": {
@@ -253,6 +334,71 @@ STRINGS = {
         "zh": "语言已应用",
     },
 
+    # ── Java selector ───────────────────────────────────────────────────
+    "java.title": {
+        "it": "CRITERIO JAVA",
+        "en": "JAVA POLICY",
+        "fr": "POLITIQUE JAVA",
+        "es": "POLÍTICA DE JAVA",
+        "de": "JAVA-RICHTLINIE",
+        "ru": "ПОЛИТИКА JAVA",
+        "zh": "JAVA 策略",
+    },
+    "java.current": {
+        "it": "Criterio attuale",
+        "en": "Current policy",
+        "fr": "Politique actuelle",
+        "es": "Política actual",
+        "de": "Aktuelle Richtlinie",
+        "ru": "Текущая политика",
+        "zh": "当前策略",
+    },
+    "java.applied": {
+        "it": "Criterio applicato",
+        "en": "Policy applied",
+        "fr": "Politique appliquée",
+        "es": "Política aplicada",
+        "de": "Richtlinie angewendet",
+        "ru": "Политика применена",
+        "zh": "策略已应用",
+    },
+    "java.found": {
+        "it": "JDK di sistema trovati",
+        "en": "System JDKs found",
+        "fr": "JDK système trouvés",
+        "es": "JDK del sistema encontrados",
+        "de": "Gefundene System-JDKs",
+        "ru": "Найденные системные JDK",
+        "zh": "已找到的系统 JDK",
+    },
+    "java.policy.prefer-bundled": {
+        "it": "Preferisci runtime Mojang",
+        "en": "Prefer Mojang runtime",
+        "fr": "Préférer le runtime Mojang",
+        "es": "Preferir runtime de Mojang",
+        "de": "Mojang-Runtime bevorzugen",
+        "ru": "Предпочитать рантайм Mojang",
+        "zh": "优先 Mojang 运行时",
+    },
+    "java.policy.prefer-system": {
+        "it": "Preferisci JDK di sistema",
+        "en": "Prefer system JDK",
+        "fr": "Préférer le JDK système",
+        "es": "Preferir JDK del sistema",
+        "de": "System-JDK bevorzugen",
+        "ru": "Предпочитать системный JDK",
+        "zh": "优先系统 JDK",
+    },
+    "java.policy.bundled-only": {
+        "it": "Solo runtime Mojang",
+        "en": "Mojang runtime only",
+        "fr": "Runtime Mojang uniquement",
+        "es": "Solo runtime de Mojang",
+        "de": "Nur Mojang-Runtime",
+        "ru": "Только рантайм Mojang",
+        "zh": "仅 Mojang 运行时",
+    },
+
     # ── Account selector (launch) ───────────────────────────────────────
     "account.select_for_launch": {
         "it": "SELEZIONA ACCOUNT PER L'AVVIO",
@@ -532,6 +678,15 @@ STRINGS = {
         "ru": "присутствует",
         "zh": "已存在",
     },
+    "launch.java_system": {
+        "it": "di sistema",
+        "en": "from system",
+        "fr": "du système",
+        "es": "del sistema",
+        "de": "vom System",
+        "ru": "из системы",
+        "zh": "来自系统",
+    },
     "launch.java_fallback": {
         "it": "Runtime auto non disponibile, uso java di sistema",
         "en": "Auto runtime not available, using system java",
@@ -541,6 +696,15 @@ STRINGS = {
         "ru": "Авто-рантайм недоступен, используется системная Java",
         "zh": "自动运行时不可用，使用系统 Java",
     },
+    "launch.joining_background": {
+        "it": "Attendo l'installazione in background...",
+        "en": "Waiting for the background install...",
+        "fr": "En attente de l'installation en arrière-plan...",
+        "es": "Esperando la instalación en segundo plano...",
+        "de": "Warte auf die Hintergrundinstallation...",
+        "ru": "Ожидание фоновой установки...",
+        "zh": "正在等待后台安装...",
+    },
     "launch.installing": {
         "it": "Installazione / verifica",
         "en": "Installing / verifying",
@@ -568,6 +732,78 @@ STRINGS = {
         "ru": "готов",
         "zh": "就绪",
     },
+    "launch.plan_summary": {
+        "it": "{files} file da scaricare ({size}, {free} liberi)",
+        "en": "{files} files to download ({size}, {free} free)",
+        "fr": "{files} fichiers à télécharger ({size}, {free} libres)",
+        "es": "{files} archivos por descargar ({size}, {free} libres)",
+        "de": "{files} Dateien herunterzuladen ({size}, {free} frei)",
+        "ru": "Файлов к загрузке: {files} ({size}, свободно {free})",
+        "zh": "需下载 {files} 个文件（{size}，可用 {free}）",
+    },
+    "launch.offline_missing": {
+        "it": "Modalità offline ([O] per disattivarla): file mancanti per",
+        "en": "Offline mode ([O] to turn off): missing files for",
+        "fr": "Mode hors ligne ([O] pour le désactiver) : fichiers manquants pour",
+        "es": "Modo sin conexión ([O] para desactivarlo): faltan archivos de",
+        "de": "Offline-Modus ([O] zum Ausschalten): fehlende Dateien für",
+        "ru": "Офлайн-режим ([O] — отключить): не хватает файлов для",
+        "zh": "离线模式（按 [O] 关闭）：缺少文件：",
+    },
+    "launch.offline_deferred": {
+        "it": "Modalità offline: alcuni suoni e lingue verranno scaricati quando sarai online",
+        "en": "Offline mode: some sounds and languages will be downloaded once you are online",
+        "fr": "Mode hors ligne : certains sons et langues seront téléchargés une fois en ligne",
+        "es": "Modo sin conexión: algunos sonidos e idiomas se descargarán cuando estés en línea",
+        "de": "Offline-Modus: einige Sounds und Sprachen werden geladen, sobald du online bist",
+        "ru": "Офлайн-режим: часть звуков и языков загрузится, когда появится сеть",
+        "zh": "离线模式：部分声音和语言将在联网后下载",
+    },
+    "launch.cds_training": {
+        "it": "AppCDS: questo avvio registra le classi usate, i prossimi saranno più veloci",
+        "en": "AppCDS: this launch records the classes it loads, the next ones will start faster",
+        "fr": "AppCDS : ce lancement enregistre les classes chargées, les suivants démarreront plus vite",
+        "es": "AppCDS: este inicio registra las clases cargadas, los siguientes arrancarán más rápido",
+        "de": "AppCDS: dieser Start zeichnet die geladenen Klassen auf, die nächsten starten schneller",
+        "ru": "AppCDS: этот запуск запоминает загруженные классы, следующие будут быстрее",
+        "zh": "AppCDS：本次启动会记录加载的类，之后的启动会更快",
+    },
+    "launch.profile": {
+        "it": "Profilo {name}: GC {gc}, heap {heap} ({instances} altre istanze in esecuzione)",
+        "en": "Profile {name}: {gc} GC, {heap} heap ({instances} other instances running)",
+        "fr": "Profil {name} : GC {gc}, tas {heap} ({instances} autres instances en cours)",
+        "es": "Perfil {name}: GC {gc}, heap {heap} ({instances} otras instancias en ejecución)",
+        "de": "Profil {name}: {gc}-GC, {heap} Heap ({instances} weitere Instanzen laufen)",
+        "ru": "Профиль {name}: GC {gc}, куча {heap} (запущено других экземпляров: {instances})",
+        "zh": "配置 {name}：{gc} GC，堆 {heap}（另有 {instances} 个实例在运行）",
+    },
+    "launch.profile_failed": {
+        "it": "Profilo JVM non applicato, uso le impostazioni predefinite della JVM",
+        "en": "JVM profile not applied, using the JVM defaults",
+        "fr": "Profil JVM non appliqué, paramètres par défaut de la JVM",
+        "es": "Perfil de JVM no aplicado, se usan los valores por defecto de la JVM",
+        "de": "JVM-Profil nicht angewendet, JVM-Standardwerte werden verwendet",
+        "ru": "Профиль JVM не применён, используются настройки JVM по умолчанию",
+        "zh": "未应用 JVM 配置，使用 JVM 默认设置",
+    },
+    "launch.placement_skipped": {
+        "it": "Posizionamento del processo non applicato",
+        "en": "Process placement not applied",
+        "fr": "Placement du processus non appliqué",
+        "es": "Ubicación del proceso no aplicada",
+        "de": "Prozessplatzierung nicht angewendet",
+        "ru": "Размещение процесса не применено",
+        "zh": "未应用进程放置",
+    },
+    "launch.verified": {
+        "it": "già verificato, avvio rapido",
+        "en": "already verified, fast launch",
+        "fr": "déjà vérifié, lancement rapide",
+        "es": "ya verificado, inicio rápido",
+        "de": "bereits überprüft, Schnellstart",
+        "ru": "уже проверен, быстрый запуск",
+        "zh": "已验证，快速启动",
+    },
     "launch.starting_as": {
         "it": "Avvio come",
         "en": "Launching as",
@@ -633,6 +869,51 @@ STRINGS = {
         "ru": "запущен",
         "zh": "运行中",
     },
+    "running.startup": {
+        "it": "Avviato in {secs} s",
+        "en": "Started in {secs} s",
+        "fr": "Démarré en {secs} s",
+        "es": "Iniciado en {secs} s",
+        "de": "Gestartet in {secs} s",
+        "ru": "Запущен за {secs} с",
+        "zh": "启动耗时 {secs} 秒",
+    },
+    "running.profile": {
+        "it": "Profilo {name}: GC {gc}, heap {heap}",
+        "en": "Profile {name}: {gc} GC, {heap} heap",
+        "fr": "Profil {name} : GC {gc}, tas {heap}",
+        "es": "Perfil {name}: GC {gc}, heap {heap}",
+        "de": "Profil {name}: {gc}-GC, {heap} Heap",
+        "ru": "Профиль {name}: GC {gc}, куча {heap}",
+        "zh": "配置 {name}：{gc} GC，堆 {heap}",
+    },
+    "running.placement": {
+        "it": "Posizionamento",
+        "en": "Placement",
+        "fr": "Placement",
+        "es": "Ubicación",
+        "de": "Platzierung",
+        "ru": "Размещение",
+        "zh": "放置",
+    },
+    "running.memory_max": {
+        "it": "memoria max",
+        "en": "memory max",
+        "fr": "mémoire max",
+        "es": "memoria máx.",
+        "de": "Speicher max.",
+        "ru": "память макс.",
+        "zh": "内存上限",
+    },
+    "running.cpu_max": {
+        "it": "CPU max",
+        "en": "CPU max",
+        "fr": "CPU max",
+        "es": "CPU máx.",
+        "de": "CPU max.",
+        "ru": "CPU макс.",
+        "zh": "CPU 上限",
+    },
     "running.kill": {
         "it": "Kill Minecraft",
         "en": "Kill Minecraft",
@@ -651,6 +932,24 @@ STRINGS = {
         "ru": "Перезапустить Minecraft",
         "zh": "重启 Minecraft",
     },
+    "running.tail": {
+        "it": "Mostra output del gioco",
+        "en": "Show game output",
+        "fr": "Afficher la sortie du jeu",
+        "es": "Mostrar salida del juego",
+        "de": "Spielausgabe anzeigen",
+        "ru": "Показать вывод игры",
+        "zh": "显示游戏输出",
+    },
+    "running.log_saved": {
+        "it": "Log della sessione",
+        "en": "Session log",
+        "fr": "Journal de la session",
+        "es": "Registro de la sesión",
+        "de": "Sitzungsprotokoll",
+        "ru": "Журнал сеанса",
+        "zh": "本次会话日志",
+    },
     "running.closed": {
         "it": "Minecraft si e' chiuso",
         "en": "Minecraft has closed",
@@ -687,6 +986,773 @@ STRINGS = {
         "ru": "Перезапуск не удался",
         "zh": "重启失败",
     },
+    "running.assets_streaming": {
+        "it": "Download risorse restanti",
+        "en": "Downloading remaining assets",
+        "fr": "Téléchargement des ressources restantes",
+        "es": "Descargando recursos restantes",
+        "de": "Restliche Ressourcen werden geladen",
+        "ru": "Загрузка оставшихся ресурсов",
+        "zh": "正在下载剩余资源",
+    },
+    "running.assets_done": {
+        "it": "Tutte le risorse scaricate",
+        "en": "All assets downloaded",
+        "fr": "Toutes les ressources sont téléchargées",
+        "es": "Todos los recursos descargados",
+        "de": "Alle Ressourcen heruntergeladen",
+        "ru": "Все ресурсы загружены",
+        "zh": "所有资源已下载",
+    },
+    "running.assets_failed": {
+        "it": "Download risorse fallito",
+        "en": "Asset download failed",
+        "fr": "Échec du téléchargement des ressources",
+        "es": "Descarga de recursos fallida",
+        "de": "Ressourcen-Download fehlgeschlagen",
+        "ru": "Ошибка загрузки ресурсов",
+        "zh": "资源下载失败",
+    },
+    "running.refresh": {
+        "it": "Invio per aggiornare",
+        "en": "Enter to refresh",
+        "fr": "Entrée pour actualiser",
+        "es": "Intro para actualizar",
+        "de": "Enter zum Aktualisieren",
+        "ru": "Enter — обновить",
+        "zh": "按回车刷新",
+    },
+
+    # ── Install plan ────────────────────────────────────────────────────
+    "plan.title": {
+        "it": "Piano di installazione",
+        "en": "Install plan for",
+        "fr": "Plan d'installation de",
+        "es": "Plan de instalación de",
+        "de": "Installationsplan für",
+        "ru": "План установки",
+        "zh": "安装计划",
+    },
+    "plan.failed": {
+        "it": "Impossibile calcolare il piano",
+        "en": "Could not build the plan",
+        "fr": "Impossible de calculer le plan",
+        "es": "No se pudo calcular el plan",
+        "de": "Plan konnte nicht erstellt werden",
+        "ru": "Не удалось составить план",
+        "zh": "无法生成安装计划",
+    },
+    "plan.missing": {
+        "it": "mancanti",
+        "en": "missing",
+        "fr": "manquants",
+        "es": "faltan",
+        "de": "fehlend",
+        "ru": "нет",
+        "zh": "缺失",
+    },
+    "plan.stale": {
+        "it": "obsoleti",
+        "en": "stale",
+        "fr": "obsolètes",
+        "es": "obsoletos",
+        "de": "veraltet",
+        "ru": "устар.",
+        "zh": "过期",
+    },
+    "plan.present": {
+        "it": "presenti",
+        "en": "present",
+        "fr": "présents",
+        "es": "presentes",
+        "de": "vorhanden",
+        "ru": "есть",
+        "zh": "已有",
+    },
+    "plan.download": {
+        "it": "Da scaricare",
+        "en": "To download",
+        "fr": "À télécharger",
+        "es": "Por descargar",
+        "de": "Herunterzuladen",
+        "ru": "К загрузке",
+        "zh": "待下载",
+    },
+    "plan.files": {
+        "it": "file",
+        "en": "files",
+        "fr": "fichiers",
+        "es": "archivos",
+        "de": "Dateien",
+        "ru": "файлов",
+        "zh": "个文件",
+    },
+    "plan.deferred": {
+        "it": "in background",
+        "en": "in background",
+        "fr": "en arrière-plan",
+        "es": "en segundo plano",
+        "de": "im Hintergrund",
+        "ru": "в фоне",
+        "zh": "后台",
+    },
+    "plan.unknown_sizes": {
+        "it": "file senza dimensione dichiarata",
+        "en": "files without a declared size",
+        "fr": "fichiers sans taille déclarée",
+        "es": "archivos sin tamaño declarado",
+        "de": "Dateien ohne angegebene Größe",
+        "ru": "файлов без указанного размера",
+        "zh": "个文件未声明大小",
+    },
+    "plan.disk_free": {
+        "it": "Spazio libero",
+        "en": "Free disk space",
+        "fr": "Espace disque libre",
+        "es": "Espacio libre",
+        "de": "Freier Speicher",
+        "ru": "Свободно на диске",
+        "zh": "可用磁盘空间",
+    },
+
+    # ── Install queue ───────────────────────────────────────────────────
+    "queue.title": {
+        "it": "Installazione versioni",
+        "en": "Installing versions",
+        "fr": "Installation des versions",
+        "es": "Instalando versiones",
+        "de": "Versionen werden installiert",
+        "ru": "Установка версий",
+        "zh": "正在安装版本",
+    },
+    "queue.done": {
+        "it": "completata",
+        "en": "done",
+        "fr": "terminé",
+        "es": "completado",
+        "de": "fertig",
+        "ru": "готово",
+        "zh": "完成",
+    },
+    "queue.failed": {
+        "it": "fallita",
+        "en": "failed",
+        "fr": "échec",
+        "es": "fallido",
+        "de": "fehlgeschlagen",
+        "ru": "ошибка",
+        "zh": "失败",
+    },
+    "queue.all_done": {
+        "it": "Tutte le versioni sono pronte",
+        "en": "All versions are ready",
+        "fr": "Toutes les versions sont prêtes",
+        "es": "Todas las versiones están listas",
+        "de": "Alle Versionen sind bereit",
+        "ru": "Все версии готовы",
+        "zh": "所有版本已就绪",
+    },
+
+    # ── Provisioning & bundles ──────────────────────────────────────────
+    "provision.unknown_group": {
+        "it": "Gruppo sconosciuto",
+        "en": "Unknown group",
+        "fr": "Groupe inconnu",
+        "es": "Grupo desconocido",
+        "de": "Unbekannte Gruppe",
+        "ru": "Неизвестная группа",
+        "zh": "未知分组",
+    },
+    "bundle.exporting": {
+        "it": "Esportazione bundle in",
+        "en": "Exporting bundle to",
+        "fr": "Exportation du bundle vers",
+        "es": "Exportando paquete a",
+        "de": "Bundle wird exportiert nach",
+        "ru": "Экспорт пакета в",
+        "zh": "正在导出离线包到",
+    },
+    "bundle.importing": {
+        "it": "Importazione bundle da",
+        "en": "Importing bundle from",
+        "fr": "Importation du bundle depuis",
+        "es": "Importando paquete desde",
+        "de": "Bundle wird importiert aus",
+        "ru": "Импорт пакета из",
+        "zh": "正在导入离线包",
+    },
+    "bundle.exported": {
+        "it": "Bundle pronto: {versions} versioni, {runtimes} runtime, {objects} oggetti ({size}, {added} nuovi)",
+        "en": "Bundle ready: {versions} versions, {runtimes} runtimes, {objects} objects ({size}, {added} new)",
+        "fr": "Bundle prêt : {versions} versions, {runtimes} runtimes, {objects} objets ({size}, {added} nouveaux)",
+        "es": "Paquete listo: {versions} versiones, {runtimes} runtimes, {objects} objetos ({size}, {added} nuevos)",
+        "de": "Bundle fertig: {versions} Versionen, {runtimes} Runtimes, {objects} Objekte ({size}, {added} neu)",
+        "ru": "Пакет готов: версий {versions}, сред {runtimes}, объектов {objects} ({size}, новых {added})",
+        "zh": "离线包已就绪：{versions} 个版本，{runtimes} 个运行时，{objects} 个对象（{size}，新增 {added}）",
+    },
+    "bundle.imported": {
+        "it": "Importati {versions}: {skipped} file già presenti, {linked} collegati, {copied} copiati",
+        "en": "Imported {versions}: {skipped} files already present, {linked} linked, {copied} copied",
+        "fr": "Importé {versions} : {skipped} fichiers déjà présents, {linked} liés, {copied} copiés",
+        "es": "Importado {versions}: {skipped} archivos ya presentes, {linked} enlazados, {copied} copiados",
+        "de": "Importiert {versions}: {skipped} Dateien schon vorhanden, {linked} verlinkt, {copied} kopiert",
+        "ru": "Импортировано {versions}: уже есть {skipped}, ссылок {linked}, скопировано {copied}",
+        "zh": "已导入 {versions}：{skipped} 个文件已存在，{linked} 个硬链接，{copied} 个复制",
+    },
+    "bundle.failed": {
+        "it": "Operazione bundle fallita",
+        "en": "Bundle operation failed",
+        "fr": "Échec de l'opération sur le bundle",
+        "es": "Operación de paquete fallida",
+        "de": "Bundle-Vorgang fehlgeschlagen",
+        "ru": "Ошибка операции с пакетом",
+        "zh": "离线包操作失败",
+    },
+
+    # ── JVM profiles ────────────────────────────────────────────────────
+    "profile.title": {
+        "it": "Profilo JVM per",
+        "en": "JVM profile for",
+        "fr": "Profil JVM pour",
+        "es": "Perfil de JVM para",
+        "de": "JVM-Profil für",
+        "ru": "Профиль JVM для",
+        "zh": "JVM 配置：",
+    },
+    "profile.memory": {
+        "it": "RAM: {total} totale, {free} libera, {instances} istanze in esecuzione",
+        "en": "RAM: {total} total, {free} available, {instances} instances running",
+        "fr": "RAM : {total} au total, {free} disponible, {instances} instances en cours",
+        "es": "RAM: {total} en total, {free} libre, {instances} instancias en ejecución",
+        "de": "RAM: {total} gesamt, {free} frei, {instances} Instanzen laufen",
+        "ru": "ОЗУ: всего {total}, свободно {free}, запущено экземпляров: {instances}",
+        "zh": "内存：共 {total}，可用 {free}，正在运行 {instances} 个实例",
+    },
+    "profile.heap": {
+        "it": "heap",
+        "en": "heap",
+        "fr": "tas",
+        "es": "heap",
+        "de": "Heap",
+        "ru": "куча",
+        "zh": "堆",
+    },
+    "profile.applied": {
+        "it": "Profilo JVM di",
+        "en": "JVM profile of",
+        "fr": "Profil JVM de",
+        "es": "Perfil de JVM de",
+        "de": "JVM-Profil von",
+        "ru": "Профиль JVM для",
+        "zh": "JVM 配置已应用于",
+    },
+
+    # ── Game output ─────────────────────────────────────────────────────
+    "tail.title": {
+        "it": "Output del gioco",
+        "en": "Game output",
+        "fr": "Sortie du jeu",
+        "es": "Salida del juego",
+        "de": "Spielausgabe",
+        "ru": "Вывод игры",
+        "zh": "游戏输出",
+    },
+    "tail.back": {
+        "it": "Invio per tornare indietro",
+        "en": "Enter to go back",
+        "fr": "Entrée pour revenir",
+        "es": "Intro para volver",
+        "de": "Eingabe zum Zurückkehren",
+        "ru": "Enter — назад",
+        "zh": "按回车返回",
+    },
+    "tail.none": {
+        "it": "Nessun output catturato per questo processo",
+        "en": "No output captured for this process",
+        "fr": "Aucune sortie capturée pour ce processus",
+        "es": "No se ha capturado salida para este proceso",
+        "de": "Für diesen Prozess wurde keine Ausgabe erfasst",
+        "ru": "Для этого процесса вывод не записан",
+        "zh": "此进程没有捕获到输出",
+    },
+    "tail.dropped": {
+        "it": "{n} righe non scritte nel file di log (il disco non teneva il passo)",
+        "en": "{n} lines not written to the log file (the disk could not keep up)",
+        "fr": "{n} lignes non écrites dans le fichier journal (le disque ne suivait pas)",
+        "es": "{n} líneas no escritas en el archivo de log (el disco no daba abasto)",
+        "de": "{n} Zeilen nicht in die Logdatei geschrieben (die Festplatte kam nicht nach)",
+        "ru": "{n} строк не записано в лог (диск не успевал)",
+        "zh": "{n} 行未写入日志文件（磁盘跟不上）",
+    },
+
+    # ── Launch timeline ─────────────────────────────────────────────────
+    "timeline.menu": {
+        "it": "Cronologia avvii",
+        "en": "Launch timeline",
+        "fr": "Chronologie des lancements",
+        "es": "Cronología de inicios",
+        "de": "Startverlauf",
+        "ru": "История запусков",
+        "zh": "启动时间线",
+    },
+    "timeline.title": {
+        "it": "Tempo fino al menu principale",
+        "en": "Time to title screen",
+        "fr": "Temps jusqu'à l'écran titre",
+        "es": "Tiempo hasta la pantalla de título",
+        "de": "Zeit bis zum Titelbildschirm",
+        "ru": "Время до главного меню",
+        "zh": "进入标题画面的时间",
+    },
+    "timeline.none": {
+        "it": "Nessun avvio registrato",
+        "en": "No launches recorded yet",
+        "fr": "Aucun lancement enregistré",
+        "es": "Aún no hay inicios registrados",
+        "de": "Noch keine Starts aufgezeichnet",
+        "ru": "Запуски ещё не записаны",
+        "zh": "尚无启动记录",
+    },
+    "timeline.last": {
+        "it": "ultimo",
+        "en": "last",
+        "fr": "dernier",
+        "es": "último",
+        "de": "letzter",
+        "ru": "последний",
+        "zh": "最近",
+    },
+    "timeline.median": {
+        "it": "mediana",
+        "en": "median",
+        "fr": "médiane",
+        "es": "mediana",
+        "de": "Median",
+        "ru": "медиана",
+        "zh": "中位数",
+    },
+    "timeline.best": {
+        "it": "migliore",
+        "en": "best",
+        "fr": "meilleur",
+        "es": "mejor",
+        "de": "bester",
+        "ru": "лучший",
+        "zh": "最佳",
+    },
+    "timeline.runs": {
+        "it": "avvii",
+        "en": "launches",
+        "fr": "lancements",
+        "es": "inicios",
+        "de": "Starts",
+        "ru": "запусков",
+        "zh": "次启动",
+    },
+    "timeline.regression": {
+        "it": "{pct} rispetto alla mediana precedente ({baseline})",
+        "en": "{pct} against the previous median ({baseline})",
+        "fr": "{pct} par rapport à la médiane précédente ({baseline})",
+        "es": "{pct} respecto a la mediana anterior ({baseline})",
+        "de": "{pct} gegenüber dem bisherigen Median ({baseline})",
+        "ru": "{pct} по сравнению с прежней медианой ({baseline})",
+        "zh": "比之前的中位数 ({baseline}) {pct}",
+    },
+    "timeline.step.prepare": {
+        "it": "preparazione",
+        "en": "preparation",
+        "fr": "préparation",
+        "es": "preparación",
+        "de": "Vorbereitung",
+        "ru": "подготовка",
+        "zh": "准备",
+    },
+    "timeline.step.user": {
+        "it": "sessione",
+        "en": "session",
+        "fr": "session",
+        "es": "sesión",
+        "de": "Sitzung",
+        "ru": "сеанс",
+        "zh": "会话",
+    },
+    "timeline.step.backend": {
+        "it": "LWJGL",
+        "en": "LWJGL",
+        "fr": "LWJGL",
+        "es": "LWJGL",
+        "de": "LWJGL",
+        "ru": "LWJGL",
+        "zh": "LWJGL",
+    },
+    "timeline.step.reload": {
+        "it": "risorse",
+        "en": "resources",
+        "fr": "ressources",
+        "es": "recursos",
+        "de": "Ressourcen",
+        "ru": "ресурсы",
+        "zh": "资源",
+    },
+    "timeline.step.sound": {
+        "it": "audio",
+        "en": "sound",
+        "fr": "son",
+        "es": "sonido",
+        "de": "Sound",
+        "ru": "звук",
+        "zh": "声音",
+    },
+    "timeline.step.title": {
+        "it": "menu principale",
+        "en": "title screen",
+        "fr": "écran titre",
+        "es": "pantalla de título",
+        "de": "Titelbildschirm",
+        "ru": "главное меню",
+        "zh": "标题画面",
+    },
+
+    # ── Class data sharing ──────────────────────────────────────────────
+    "cds.title": {
+        "it": "Archivi AppCDS",
+        "en": "AppCDS archives",
+        "fr": "Archives AppCDS",
+        "es": "Archivos AppCDS",
+        "de": "AppCDS-Archive",
+        "ru": "Архивы AppCDS",
+        "zh": "AppCDS 归档",
+    },
+    "cds.disabled": {
+        "it": "AppCDS è disattivato (class_data_sharing in prefs.json)",
+        "en": "AppCDS is off (class_data_sharing in prefs.json)",
+        "fr": "AppCDS est désactivé (class_data_sharing dans prefs.json)",
+        "es": "AppCDS está desactivado (class_data_sharing en prefs.json)",
+        "de": "AppCDS ist aus (class_data_sharing in prefs.json)",
+        "ru": "AppCDS выключен (class_data_sharing в prefs.json)",
+        "zh": "AppCDS 已关闭（prefs.json 中的 class_data_sharing）",
+    },
+    "cds.none": {
+        "it": "Nessun avvio misurato finora",
+        "en": "No launches measured yet",
+        "fr": "Aucun lancement mesuré pour l'instant",
+        "es": "Aún no hay inicios medidos",
+        "de": "Noch keine Starts gemessen",
+        "ru": "Запуски ещё не измерялись",
+        "zh": "尚无已测量的启动",
+    },
+    "cds.ready": {
+        "it": "pronto",
+        "en": "ready",
+        "fr": "prêt",
+        "es": "listo",
+        "de": "bereit",
+        "ru": "готов",
+        "zh": "就绪",
+    },
+    "cds.training": {
+        "it": "in registrazione",
+        "en": "recording",
+        "fr": "enregistrement",
+        "es": "grabando",
+        "de": "wird erstellt",
+        "ru": "запись",
+        "zh": "记录中",
+    },
+    "cds.without": {
+        "it": "senza",
+        "en": "without",
+        "fr": "sans",
+        "es": "sin",
+        "de": "ohne",
+        "ru": "без",
+        "zh": "无",
+    },
+    "cds.with": {
+        "it": "con",
+        "en": "with",
+        "fr": "avec",
+        "es": "con",
+        "de": "mit",
+        "ru": "с",
+        "zh": "有",
+    },
+
+    # ── Mirrors ─────────────────────────────────────────────────────────
+    "mirrors.title": {
+        "it": "Mirror",
+        "en": "Mirrors",
+        "fr": "Miroirs",
+        "es": "Mirrors",
+        "de": "Mirrors",
+        "ru": "Зеркала",
+        "zh": "镜像",
+    },
+    "mirrors.none": {
+        "it": "Nessun mirror configurato (\"mirrors\" in prefs.json)",
+        "en": "No mirrors configured (\"mirrors\" in prefs.json)",
+        "fr": "Aucun miroir configuré (\"mirrors\" dans prefs.json)",
+        "es": "No hay mirrors configurados (\"mirrors\" en prefs.json)",
+        "de": "Keine Mirrors konfiguriert (\"mirrors\" in prefs.json)",
+        "ru": "Зеркала не настроены (\"mirrors\" в prefs.json)",
+        "zh": "未配置镜像（prefs.json 中的 \"mirrors\"）",
+    },
+    "mirrors.up": {
+        "it": "ok",
+        "en": "ok",
+        "fr": "ok",
+        "es": "ok",
+        "de": "ok",
+        "ru": "ok",
+        "zh": "正常",
+    },
+    "mirrors.down": {
+        "it": "irraggiungibile",
+        "en": "unreachable",
+        "fr": "injoignable",
+        "es": "inalcanzable",
+        "de": "nicht erreichbar",
+        "ru": "недоступно",
+        "zh": "无法访问",
+    },
+    "mirrors.cooldown": {
+        "it": "in pausa",
+        "en": "on cooldown",
+        "fr": "en pause",
+        "es": "en pausa",
+        "de": "pausiert",
+        "ru": "на паузе",
+        "zh": "暂停使用",
+    },
+    "mirrors.failures": {
+        "it": "errori",
+        "en": "failures",
+        "fr": "échecs",
+        "es": "fallos",
+        "de": "Fehler",
+        "ru": "ошибок",
+        "zh": "失败",
+    },
+
+    # ── Shared store ────────────────────────────────────────────────────
+    "store.unavailable": {
+        "it": "Archivio condiviso non disponibile, scarico normalmente",
+        "en": "Shared store not available, downloading normally",
+        "fr": "Dépôt partagé indisponible, téléchargement normal",
+        "es": "Almacén compartido no disponible, descargando normalmente",
+        "de": "Gemeinsamer Speicher nicht verfügbar, normaler Download",
+        "ru": "Общее хранилище недоступно, обычная загрузка",
+        "zh": "共享存储不可用，正常下载",
+    },
+
+    # ── Maintenance ─────────────────────────────────────────────────────
+    "tools.title": {
+        "it": "Manutenzione",
+        "en": "Maintenance",
+        "fr": "Maintenance",
+        "es": "Mantenimiento",
+        "de": "Wartung",
+        "ru": "Обслуживание",
+        "zh": "维护",
+    },
+    "verify.menu": {
+        "it": "Verifica e ripara la versione",
+        "en": "Verify & repair this version",
+        "fr": "Vérifier et réparer cette version",
+        "es": "Verificar y reparar esta versión",
+        "de": "Diese Version prüfen & reparieren",
+        "ru": "Проверить и восстановить версию",
+        "zh": "校验并修复此版本",
+    },
+    "verify.title": {
+        "it": "Verifica e riparazione",
+        "en": "Verify & repair",
+        "fr": "Vérification et réparation",
+        "es": "Verificar y reparar",
+        "de": "Prüfen & reparieren",
+        "ru": "Проверка и восстановление",
+        "zh": "校验与修复",
+    },
+    "verify.checking": {
+        "it": "Controllo di tutti i file su {cores} core...",
+        "en": "Hashing every file on {cores} cores...",
+        "fr": "Vérification de tous les fichiers sur {cores} cœurs...",
+        "es": "Comprobando todos los archivos en {cores} núcleos...",
+        "de": "Alle Dateien werden auf {cores} Kernen geprüft...",
+        "ru": "Проверка всех файлов на {cores} ядрах...",
+        "zh": "正在使用 {cores} 个核心校验所有文件...",
+    },
+    "verify.checked": {
+        "it": "controllati",
+        "en": "checked",
+        "fr": "vérifiés",
+        "es": "comprobados",
+        "de": "geprüft",
+        "ru": "проверено",
+        "zh": "已检查",
+    },
+    "verify.missing": {
+        "it": "mancanti",
+        "en": "missing",
+        "fr": "manquants",
+        "es": "faltan",
+        "de": "fehlend",
+        "ru": "отсутствует",
+        "zh": "缺失",
+    },
+    "verify.corrupt": {
+        "it": "corrotti",
+        "en": "corrupt",
+        "fr": "corrompus",
+        "es": "dañados",
+        "de": "beschädigt",
+        "ru": "повреждено",
+        "zh": "损坏",
+    },
+    "verify.repaired": {
+        "it": "riparati",
+        "en": "repaired",
+        "fr": "réparés",
+        "es": "reparados",
+        "de": "repariert",
+        "ru": "восстановлено",
+        "zh": "已修复",
+    },
+    "verify.all_ok": {
+        "it": "Tutti i file sono integri ({secs}s)",
+        "en": "All files are intact ({secs}s)",
+        "fr": "Tous les fichiers sont intacts ({secs}s)",
+        "es": "Todos los archivos están intactos ({secs}s)",
+        "de": "Alle Dateien sind intakt ({secs}s)",
+        "ru": "Все файлы в порядке ({secs}s)",
+        "zh": "所有文件完好（{secs}s）",
+    },
+    "verify.repaired_all": {
+        "it": "{files} file riparati ({secs}s)",
+        "en": "{files} files repaired ({secs}s)",
+        "fr": "{files} fichiers réparés ({secs}s)",
+        "es": "{files} archivos reparados ({secs}s)",
+        "de": "{files} Dateien repariert ({secs}s)",
+        "ru": "Восстановлено файлов: {files} ({secs}s)",
+        "zh": "已修复 {files} 个文件（{secs}s）",
+    },
+    "verify.found": {
+        "it": "{files} file mancanti o corrotti (senza --dry-run vengono riparati)",
+        "en": "{files} files missing or corrupt (run without --dry-run to repair them)",
+        "fr": "{files} fichiers manquants ou corrompus (sans --dry-run ils sont réparés)",
+        "es": "{files} archivos faltan o están dañados (sin --dry-run se reparan)",
+        "de": "{files} Dateien fehlen oder sind beschädigt (ohne --dry-run werden sie repariert)",
+        "ru": "Отсутствует или повреждено файлов: {files} (без --dry-run они будут восстановлены)",
+        "zh": "{files} 个文件缺失或损坏（去掉 --dry-run 即可修复）",
+    },
+    "verify.failed": {
+        "it": "Riparazione non riuscita",
+        "en": "Repair failed",
+        "fr": "Échec de la réparation",
+        "es": "La reparación falló",
+        "de": "Reparatur fehlgeschlagen",
+        "ru": "Восстановление не удалось",
+        "zh": "修复失败",
+    },
+    "gc.menu": {
+        "it": "Pulisci file inutilizzati",
+        "en": "Clean up unused files",
+        "fr": "Nettoyer les fichiers inutilisés",
+        "es": "Limpiar archivos sin usar",
+        "de": "Unbenutzte Dateien aufräumen",
+        "ru": "Очистить неиспользуемые файлы",
+        "zh": "清理未使用的文件",
+    },
+    "gc.title": {
+        "it": "File inutilizzati",
+        "en": "Unused files",
+        "fr": "Fichiers inutilisés",
+        "es": "Archivos sin usar",
+        "de": "Unbenutzte Dateien",
+        "ru": "Неиспользуемые файлы",
+        "zh": "未使用的文件",
+    },
+    "gc.scanning": {
+        "it": "Aggiorno l'indice delle versioni installate...",
+        "en": "Updating the index of installed versions...",
+        "fr": "Mise à jour de l'index des versions installées...",
+        "es": "Actualizando el índice de versiones instaladas...",
+        "de": "Index der installierten Versionen wird aktualisiert...",
+        "ru": "Обновление индекса установленных версий...",
+        "zh": "正在更新已安装版本的索引...",
+    },
+    "gc.nothing": {
+        "it": "Niente da pulire",
+        "en": "Nothing to clean up",
+        "fr": "Rien à nettoyer",
+        "es": "Nada que limpiar",
+        "de": "Nichts aufzuräumen",
+        "ru": "Нечего очищать",
+        "zh": "没有需要清理的文件",
+    },
+    "gc.files": {
+        "it": "file",
+        "en": "files",
+        "fr": "fichiers",
+        "es": "archivos",
+        "de": "Dateien",
+        "ru": "файлов",
+        "zh": "个文件",
+    },
+    "gc.reclaimable": {
+        "it": "Liberabili {size} ({files} file)",
+        "en": "{size} can be reclaimed ({files} files)",
+        "fr": "{size} récupérables ({files} fichiers)",
+        "es": "Se pueden liberar {size} ({files} archivos)",
+        "de": "{size} können freigegeben werden ({files} Dateien)",
+        "ru": "Можно освободить {size} ({files} файлов)",
+        "zh": "可释放 {size}（{files} 个文件）",
+    },
+    "gc.reclaimed": {
+        "it": "Liberati {size} ({files} file)",
+        "en": "{size} reclaimed ({files} files)",
+        "fr": "{size} récupérés ({files} fichiers)",
+        "es": "Liberados {size} ({files} archivos)",
+        "de": "{size} freigegeben ({files} Dateien)",
+        "ru": "Освобождено {size} ({files} файлов)",
+        "zh": "已释放 {size}（{files} 个文件）",
+    },
+    "gc.errors": {
+        "it": "file non eliminabili",
+        "en": "files could not be deleted",
+        "fr": "fichiers n'ont pas pu être supprimés",
+        "es": "archivos no se pudieron eliminar",
+        "de": "Dateien konnten nicht gelöscht werden",
+        "ru": "файлов не удалось удалить",
+        "zh": "个文件无法删除",
+    },
+    "gc.confirm": {
+        "it": "[1] Eliminali   [Invio] Indietro",
+        "en": "[1] Delete them   [Enter] Back",
+        "fr": "[1] Les supprimer   [Entrée] Retour",
+        "es": "[1] Eliminarlos   [Enter] Volver",
+        "de": "[1] Löschen   [Enter] Zurück",
+        "ru": "[1] Удалить   [Enter] Назад",
+        "zh": "[1] 删除   [Enter] 返回",
+    },
+    "gc.busy": {
+        "it": "Un'installazione è in corso in background, riprova quando finisce",
+        "en": "An install is running in the background, try again when it finishes",
+        "fr": "Une installation est en cours en arrière-plan, réessayez quand elle sera terminée",
+        "es": "Hay una instalación en segundo plano, inténtalo cuando termine",
+        "de": "Im Hintergrund läuft eine Installation, versuche es danach erneut",
+        "ru": "В фоне идёт установка, повторите после её завершения",
+        "zh": "后台正在安装，请在完成后重试",
+    },
+    "gc.unknown": {
+        "it": "{files} file non scritti da questo launcher ({size}), lasciati al loro posto",
+        "en": "{files} files not written by this launcher ({size}), left in place",
+        "fr": "{files} fichiers non écrits par ce launcher ({size}), laissés en place",
+        "es": "{files} archivos no escritos por este launcher ({size}), se dejan en su sitio",
+        "de": "{files} Dateien nicht von diesem Launcher geschrieben ({size}), bleiben erhalten",
+        "ru": "{files} файлов записаны не этим лаунчером ({size}), оставлены на месте",
+        "zh": "{files} 个文件不是由本启动器写入（{size}），保持不动",
+    },
 
     # ── Folder ──────────────────────────────────────────────────────────
     "folder.opening": {